@@ -0,0 +1,108 @@
+"""
+Render benchmark cases.
+
+Each case is a function that builds a new token tree of a representative
+shape. Trees are built before timing and rendered once each, so neither
+construction nor the render cache affects the measured render time.
+"""
+from __future__ import unicode_literals
+
+from cypher import (Collection, Create, Identifier, Limit, Map, Match, Merge,
+                    Node, OrderBy, Path, Predicate, PredicateList, Property,
+                    Query, Rel, Return, Set, Value, Where)
+from cypher import shortcuts
+
+
+def wide_map():
+    "Node with a map of 200 properties."
+    props = dict(('prop{}'.format(i), 'value {}'.format(i))
+                 for i in range(200))
+
+    return Node(props, identifier='n', labels=['Wide'])
+
+
+def long_path():
+    "Path of 500 relationships."
+    nodes = [Node({'id': i}, identifier='n{}'.format(i)) for i in range(501)]
+
+    return Path([Rel(nodes[i], 'NEXT', nodes[i + 1]) for i in range(500)],
+                identifier='p')
+
+
+def large_collection():
+    "Collection of 5000 mixed literals."
+    values = []
+
+    for i in range(2500):
+        values.extend([i, 'item {}'.format(i)])
+
+    return Collection(values, identifier='c')
+
+
+def large_text():
+    "Node with ten 8 KB text properties."
+    text = 'lorem ipsum dolor sit amet ' * 300
+
+    return Node(dict(('text{}'.format(i), text) for i in range(10)),
+                identifier='n')
+
+
+def deep_predicates():
+    "Predicate lists nested 100 levels deep."
+    preds = Predicate(Identifier('x', identifier='n'), '=', Value(0))
+
+    for i in range(1, 101):
+        pred = Predicate(Identifier('x', identifier='n'), '>', Value(i))
+        preds = PredicateList([preds, pred],
+                              operator='AND' if i % 2 else 'OR')
+
+    return Where(preds)
+
+
+def shortcut_exists():
+    "shortcuts.exists for a labeled node."
+    return shortcuts.exists(Node({'uuid': 'abc'}, labels=['User']))
+
+
+def shortcut_get():
+    "shortcuts.get for a labeled node."
+    return shortcuts.get(Node({'uuid': 'abc'}, identifier='u',
+                              labels=['User']))
+
+
+def big_query():
+    "Query composed of 50 clauses of each kind of write and read."
+    toks = []
+
+    for i in range(50):
+        ident = 'n{}'.format(i)
+        node = Node({'id': i, 'name': 'node {}'.format(i)},
+                    identifier=ident, labels=['Item'])
+
+        toks.extend([
+            Match(node),
+            Merge(Rel(ident, 'LINKS', Node({'id': i + 1}, labels=['Item']))),
+            Create(Node({'created': True}, labels=['Log'])),
+            Set(Property('seen', i, identifier=ident)),
+            Set(Map({'a': 1, 'b': [1, 2]}, identifier=ident)),
+        ])
+
+    toks.extend([
+        Return(Identifier('n0')),
+        OrderBy(Identifier('id', identifier='n0')),
+        Limit(10),
+    ])
+
+    return Query(toks)
+
+
+cases = [
+    wide_map,
+    long_path,
+    large_collection,
+    large_text,
+    deep_predicates,
+    shortcut_exists,
+    shortcut_get,
+    big_query,
+]
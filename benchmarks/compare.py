@@ -0,0 +1,55 @@
+"""
+Compares two benchmark result files and reports render time regressions.
+
+    python benchmarks/compare.py base.json head.json [--threshold 0.1]
+
+Exits with a non-zero status if any case is slower than the threshold.
+"""
+from __future__ import print_function, unicode_literals
+
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path) as fp:
+        return json.load(fp)['results']
+
+
+def compare(base, head, threshold):
+    "Returns a list of (case, base, head, change, regressed) tuples."
+    rows = []
+
+    for name in sorted(set(base) & set(head)):
+        before = base[name]['us_per_query']
+        after = head[name]['us_per_query']
+        change = (after - before) / before
+
+        rows.append((name, before, after, change, change > threshold))
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('base')
+    parser.add_argument('head')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='allowed relative slowdown, default 0.1')
+    args = parser.parse_args()
+
+    rows = compare(load(args.base), load(args.head), args.threshold)
+    regressed = False
+
+    for name, before, after, change, slower in rows:
+        regressed = regressed or slower
+
+        print('{:<20} {:>12.1f} {:>12.1f} us/query {:>+8.1%}{}'.format(
+            name, before, after, change, '  REGRESSION' if slower else ''))
+
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == '__main__':
+    main()
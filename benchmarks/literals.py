@@ -0,0 +1,75 @@
+"""
+Compares string literal encoding using `repr` with `utils.quote_string` on
+typical short values and multi-KB payloads.
+
+    python benchmarks/literals.py [--size BYTES] [--number N]
+"""
+from __future__ import print_function, unicode_literals
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from cypher.utils import quote_string  # noqa
+
+
+def repr_string(value):
+    "The previous approach used by `Value`."
+    if isinstance(value, bytes):
+        value = value.decode()
+
+    return repr(value).lstrip('u')
+
+
+def short_values():
+    "Returns named values typical of node properties."
+    return [
+        ('short', 'Alice Smith'),
+        ('short quoted', "O'Brien"),
+        ('short unicode', 'Zoë Müller'),
+        ('short bytes', b'Alice Smith'),
+    ]
+
+
+def payloads(size):
+    "Returns named payloads of roughly `size` characters."
+    words = 'lorem ipsum dolor sit amet '
+    plain = (words * (size // len(words) + 1))[:size]
+    quoted = plain[:-8] + "it's ok."
+    lines = plain.replace(' ', '\n', size // 100)
+    unicode = ('é中 ' * (size // 3 + 1))[:size]
+
+    return [
+        ('plain', plain),
+        ('quoted', quoted),
+        ('multiline', lines),
+        ('unicode', unicode),
+        ('plain bytes', plain.encode('utf8')),
+        ('unicode bytes', unicode.encode('utf8')),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--size', type=int, default=8192)
+    parser.add_argument('--number', type=int, default=2000)
+    args = parser.parse_args()
+
+    print('{:<16} {:>12} {:>12} {:>8}'.format(
+        'payload', 'repr us', 'quote us', 'speedup'))
+
+    for name, value in short_values() + payloads(args.size):
+        before = timeit.timeit(lambda: repr_string(value),
+                               number=args.number) / args.number * 1e6
+        after = timeit.timeit(lambda: quote_string(value),
+                              number=args.number) / args.number * 1e6
+
+        print('{:<16} {:>12.2f} {:>12.2f} {:>7.1f}x'.format(
+            name, before, after, before / after))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Measures the memory held by large token workloads.
+
+    python benchmarks/memory.py [--size N]
+"""
+from __future__ import print_function, unicode_literals
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from cypher import Collection, Identifier, Node, Path, Rel, Value  # noqa
+
+
+def collection(size):
+    "Collection of nodes, each with an identifier, labels and a value."
+    return Collection([
+        Node({'id': Value(i)}, identifier=Identifier('n'), labels=['Item'])
+        for i in range(size)
+    ])
+
+
+def path(size):
+    "Path of relationships chained through shared nodes."
+    nodes = [Node(identifier='n{}'.format(i)) for i in range(size + 1)]
+
+    return Path([
+        Rel(nodes[i], 'NEXT', nodes[i + 1]) for i in range(size)
+    ])
+
+
+workloads = [collection, path]
+
+
+def measure(func, size):
+    "Returns the bytes allocated and retained by the workload."
+    gc.collect()
+    tracemalloc.start()
+
+    start = tracemalloc.get_traced_memory()[0]
+    value = func(size)
+    end = tracemalloc.get_traced_memory()[0]
+
+    tracemalloc.stop()
+    del value
+
+    return end - start
+
+
+def run(size):
+    return dict((func.__name__, measure(func, size)) for func in workloads)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--size', type=int, default=100000)
+    args = parser.parse_args()
+
+    for name, used in sorted(run(args.size).items()):
+        print('{:<12} {:>12,d} bytes  {:>8.1f} bytes/item'.format(
+            name, used, used / float(args.size)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+Runs the render benchmarks and writes the results as JSON.
+
+    python benchmarks/run.py [--output results.json] [--case NAME ...]
+"""
+from __future__ import print_function, unicode_literals
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+try:
+    timer = time.perf_counter
+except AttributeError:
+    timer = time.time
+
+from benchmarks.cases import cases  # noqa
+
+import cypher  # noqa
+
+
+def commit():
+    "Returns the current git commit of the tree, if available."
+    try:
+        out = subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+                                      cwd=os.path.dirname(__file__),
+                                      stderr=subprocess.STDOUT)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return out.decode().strip()
+
+
+def peak_memory(case):
+    "Returns the peak memory allocated while rendering one tree."
+    if tracemalloc is None:
+        return None
+
+    token = case()
+    gc.collect()
+
+    tracemalloc.start()
+    str(token)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return peak
+
+
+def bench(case, min_time, batch):
+    "Renders freshly built trees until `min_time` seconds have elapsed."
+    elapsed = 0.0
+    count = 0
+
+    while elapsed < min_time:
+        tokens = [case() for _ in range(batch)]
+
+        gc.collect()
+        start = timer()
+
+        for token in tokens:
+            str(token)
+
+        elapsed += timer() - start
+        count += batch
+
+    return {
+        'iterations': count,
+        'seconds': elapsed,
+        'us_per_query': elapsed / count * 1e6,
+        'queries_per_sec': count / elapsed,
+        'peak_memory': peak_memory(case),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--output', help='path of the JSON results file')
+    parser.add_argument('--case', action='append', dest='cases',
+                        help='name of a case to run, may be repeated')
+    parser.add_argument('--min-time', type=float, default=1.0,
+                        help='minimum seconds to render each case')
+    parser.add_argument('--batch', type=int, default=10,
+                        help='number of trees built per timing batch')
+    args = parser.parse_args()
+
+    selected = [c for c in cases if not args.cases or
+                c.__name__ in args.cases]
+
+    results = {}
+
+    for case in selected:
+        result = bench(case, args.min_time, args.batch)
+        results[case.__name__] = result
+
+        print('{:<20} {:>12.1f} us/query {:>12.1f} queries/sec'.format(
+            case.__name__, result['us_per_query'],
+            result['queries_per_sec']))
+
+    data = {
+        'meta': {
+            'commit': commit(),
+            'version': cypher.__version__,
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'timestamp': time.time(),
+        },
+        'results': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w') as fp:
+            json.dump(data, fp, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
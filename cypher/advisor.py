@@ -0,0 +1,166 @@
+"""
+Suggests indexes and constraints for a workload of queries.
+
+Each query is walked for the (label, property) pairs it looks nodes up by,
+either in the props map of a `Match` or `Merge` pattern or in a `Where`
+equality predicate on a labeled node. Pairs are weighted by how often they
+are used, and statements are suggested for those not already covered:
+
+    advisor = IndexAdvisor()
+    advisor.analyze(queries)
+    advisor.advise(existing=[CreateIndex('User', 'email')])
+"""
+from __future__ import unicode_literals, absolute_import
+
+from collections import namedtuple
+
+from .syntax import (Create, CreateConstraint, CreateIndex, Identifier,
+                     Match, Merge, Node, Path, Predicate, PredicateList,
+                     Query, Rel, Statement, Where)
+
+try:
+    str = unicode
+except NameError:
+    pass
+
+
+Usage = namedtuple('Usage', ['label', 'prop', 'weight', 'merges'])
+
+
+def _nodes(pattern):
+    "Yields the nodes of a pattern."
+    if isinstance(pattern, Node):
+        yield pattern
+    elif isinstance(pattern, Rel):
+        for node in (pattern.start, pattern.end):
+            if isinstance(node, Node):
+                yield node
+    elif isinstance(pattern, Path):
+        for rel in pattern.rels:
+            for node in _nodes(rel):
+                yield node
+
+
+def _predicates(pred):
+    "Yields the predicates of a predicate or nested predicate lists."
+    if isinstance(pred, PredicateList):
+        for p in pred.preds:
+            for q in _predicates(p):
+                yield q
+    elif isinstance(pred, Predicate):
+        yield pred
+
+
+class IndexAdvisor(object):
+    """Collects the (label, property) pairs used to look up nodes by a
+    workload of queries.
+    """
+    def __init__(self):
+        self._weights = {}
+        self._merges = {}
+
+    def _use(self, labels, prop, weight, merge):
+        for label in labels:
+            key = (label, prop)
+            self._weights[key] = self._weights.get(key, 0) + weight
+
+            if merge:
+                self._merges[key] = self._merges.get(key, 0) + weight
+
+    def add(self, query, weight=1):
+        "Records the lookups of a query or statement run `weight` times."
+        tokens = query.tokens if isinstance(query, Query) else [query]
+
+        # Labels of the nodes bound to each identifier in the query
+        labels = {}
+
+        for tok in tokens:
+            if isinstance(tok, Merge):
+                patterns = [tok.expr]
+            elif isinstance(tok, (Match, Create)):
+                patterns = tok.values
+            else:
+                patterns = ()
+
+            for pattern in patterns:
+                for node in _nodes(pattern):
+                    if not node.labels:
+                        continue
+
+                    if node.identifier:
+                        labels.setdefault(node.identifier, set()).update(
+                            node.labels)
+
+                    if isinstance(node.props, dict) and not isinstance(
+                            tok, Create):
+                        # Only a single merge key suggests it is unique
+                        merge = (isinstance(tok, Merge) and
+                                 len(node.props) == 1)
+
+                        for prop in node.props:
+                            self._use(node.labels, prop, weight, merge)
+
+            if isinstance(tok, Where):
+                for value in tok.values:
+                    for pred in _predicates(value):
+                        subject = pred.subject
+
+                        if (str(pred.operator) == '=' and
+                                isinstance(subject, Identifier) and
+                                subject.identifier in labels):
+                            self._use(sorted(labels[subject.identifier]),
+                                      subject.value, weight, False)
+
+    def analyze(self, queries):
+        """Records a workload. Each item may be a query or a (query, count)
+        tuple, such as the entries of a log aggregated by fingerprint.
+        """
+        for item in queries:
+            if isinstance(item, tuple):
+                self.add(*item)
+            else:
+                self.add(item)
+
+        return self
+
+    def usages(self):
+        "Returns the recorded pairs, most used first."
+        usages = [
+            Usage(label, prop, weight, self._merges.get((label, prop), 0))
+            for (label, prop), weight in self._weights.items()
+        ]
+
+        usages.sort(key=lambda u: (-u.weight, u.label, u.prop))
+
+        return usages
+
+    def advise(self, existing=(), min_weight=1, constraints=True):
+        """Returns `CreateIndex` and `CreateConstraint` statements for pairs
+        used at least `min_weight` times, most used first.
+
+        `existing` is a list of index and constraint statements or (label,
+        prop) tuples that are already defined. If `constraints` is true,
+        pairs used as the only key of a `Merge` get a uniqueness
+        constraint, which is also backed by an index.
+        """
+        covered = set()
+
+        for item in existing:
+            if isinstance(item, Statement):
+                covered.add((item.label, item.prop))
+            else:
+                covered.add(tuple(item))
+
+        statements = []
+
+        for usage in self.usages():
+            if (usage.weight < min_weight or
+                    (usage.label, usage.prop) in covered):
+                continue
+
+            if constraints and usage.merges:
+                statements.append(CreateConstraint(usage.label, usage.prop))
+            else:
+                statements.append(CreateIndex(usage.label, usage.prop))
+
+        return statements
@@ -0,0 +1,439 @@
+"""
+asyncio client for Neo4j's HTTP transactional endpoint. Requires Python 3.
+
+Queries run concurrently by many coroutines share a bounded pool of
+keep-alive connections. Small queries submitted within a short window of
+each other are coalesced into a single multi-statement request:
+
+    async with Session('http://localhost:7474', auth=auth) as session:
+        result = await session.run(query)
+
+        async for row in session.stream(query):
+            ...
+
+Coalesced statements run in one transaction. If one of them fails, the
+others are submitted again without it, so a failure only affects its own
+caller. Set `window` to 0 to send each query in its own request.
+"""
+from __future__ import unicode_literals, absolute_import
+
+import asyncio
+import json
+import ssl as _ssl
+from http.client import RemoteDisconnected
+from urllib.parse import urlsplit
+
+from .client import (DEFAULT_PATH, ClientError, CypherError, Result,
+                     SendError, request_headers, statement)
+from .results import RESULT_DATA_CONTENTS, ResponseDecoder
+
+
+class Connection(object):
+    "A keep-alive HTTP/1.1 connection using asyncio streams."
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.closed = False
+
+        # Number of requests written
+        self.requests = 0
+
+    @classmethod
+    async def open(cls, host, port, ssl=None):
+        reader, writer = await asyncio.open_connection(host, port, ssl=ssl)
+        return cls(reader, writer)
+
+    async def request(self, method, host, path, headers, body):
+        "Sends a request and returns the status, headers and body."
+        await self.write(method, host, path, headers, body)
+        return await self.read_response()
+
+    async def send(self, method, host, path, headers, body):
+        "Sends a request and returns the status and headers of the response."
+        await self.write(method, host, path, headers, body)
+        return await self._read_head()
+
+    async def write(self, method, host, path, headers, body):
+        "Writes a request."
+        lines = ['{} {} HTTP/1.1'.format(method, path), 'Host: ' + host,
+                 'Content-Length: {}'.format(len(body))]
+        lines.extend('{}: {}'.format(k, v) for k, v in headers.items())
+
+        head = '\r\n'.join(lines) + '\r\n\r\n'
+
+        self.requests += 1
+        self.writer.write(head.encode('latin1') + body)
+        await self.writer.drain()
+
+    async def read_response(self):
+        "Reads a response and returns its status, headers and body."
+        status, headers = await self._read_head()
+        body = b''.join([chunk async for chunk in self.iter_body(headers)])
+
+        return status, headers, body
+
+    async def _read_head(self):
+        line = await self.reader.readline()
+
+        if not line:
+            raise RemoteDisconnected('connection closed by server without '
+                                     'a response')
+
+        parts = line.decode('latin1').split(None, 2)
+
+        if len(parts) < 2 or not parts[1].isdigit():
+            raise ClientError('invalid status line: {!r}'.format(line))
+
+        headers = {}
+
+        while True:
+            line = await self.reader.readline()
+
+            if line in (b'\r\n', b'\n', b''):
+                break
+
+            name, _, value = line.decode('latin1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        return int(parts[1]), headers
+
+    async def iter_body(self, headers, chunk_size=65536):
+        "Yields the body of the response in chunks as it is received."
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+
+                if size == 0:
+                    # Skip trailers
+                    while (await self.reader.readline()) not in (
+                            b'\r\n', b'\n', b''):
+                        pass
+                    break
+
+                yield await self.reader.readexactly(size)
+                await self.reader.readexactly(2)
+        elif 'content-length' in headers:
+            remaining = int(headers['content-length'])
+
+            while remaining:
+                chunk = await self.reader.read(min(remaining, chunk_size))
+
+                if not chunk:
+                    raise asyncio.IncompleteReadError(b'', remaining)
+
+                remaining -= len(chunk)
+                yield chunk
+        else:
+            # No framing, the body ends when the connection is closed
+            while True:
+                chunk = await self.reader.read(chunk_size)
+
+                if not chunk:
+                    break
+
+                yield chunk
+
+            self.close()
+
+        if headers.get('connection', '').lower() == 'close':
+            self.close()
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.writer.close()
+
+
+class ConnectionPool(object):
+    """Pool of at most `size` keep-alive connections to a single host.
+    Coroutines wait up to `timeout` seconds for a connection.
+    """
+    def __init__(self, host, port, ssl=None, size=10, timeout=30):
+        self.host = host
+        self.port = port
+        self.ssl = ssl
+        self.size = size
+        self.timeout = timeout
+
+        self._idle = []
+        self._slots = asyncio.Semaphore(size)
+
+    async def acquire(self):
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            raise ClientError('timed out waiting for a connection')
+
+        while self._idle:
+            conn = self._idle.pop()
+
+            if not conn.closed and not conn.reader.at_eof():
+                return conn
+
+            conn.close()
+
+        try:
+            return await asyncio.wait_for(
+                Connection.open(self.host, self.port, self.ssl),
+                self.timeout)
+        except (OSError, asyncio.TimeoutError) as e:
+            self._slots.release()
+            raise SendError('could not connect: {!r}'.format(e))
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, conn):
+        if not conn.closed:
+            self._idle.append(conn)
+
+        self._slots.release()
+
+    def discard(self, conn):
+        conn.close()
+        self._slots.release()
+
+    def close(self):
+        while self._idle:
+            self._idle.pop().close()
+
+
+class Session(object):
+    """Runs queries against the HTTP transactional endpoint.
+
+    Queries passed to `run` within `window` seconds of each other are sent
+    in one request of up to `max_batch` statements. `pool_size` bounds the
+    number of concurrent requests.
+    """
+    def __init__(self, url='http://localhost:7474', path=DEFAULT_PATH,
+                 auth=None, pool_size=10, timeout=30, window=0.002,
+                 max_batch=100, headers=None):
+        parts = urlsplit(url)
+        secure = parts.scheme == 'https'
+
+        self.host = parts.netloc
+        self.path = (parts.path.rstrip('/') + path) if parts.path else path
+        self.headers = request_headers(auth, headers)
+        self.window = window
+        self.max_batch = max_batch
+        self.timeout = timeout
+
+        self.pool = ConnectionPool(
+            parts.hostname, parts.port or (443 if secure else 80),
+            ssl=_ssl.create_default_context() if secure else None,
+            size=pool_size, timeout=timeout)
+
+        self._pending = []
+        self._timer = None
+        self._tasks = set()
+
+    async def request(self, body):
+        """Posts the body and returns the decoded response.
+
+        A request on a reused connection that fails while it is written, or
+        with the server closing the connection without a response, is
+        retried once on a new connection. Other failures, including
+        timeouts, are not retried since the statements may have run.
+        """
+        payload = json.dumps(body).encode('utf8')
+
+        for attempt in range(2):
+            conn = await self.pool.acquire()
+
+            # The server may have closed a kept alive connection
+            retry = conn.requests and not attempt
+
+            try:
+                await asyncio.wait_for(
+                    conn.write('POST', self.host, self.path, self.headers,
+                               payload),
+                    self.timeout)
+            except asyncio.TimeoutError as e:
+                # Part of the request may have been written
+                self.pool.discard(conn)
+                raise ClientError('request timed out: {!r}'.format(e))
+            except OSError as e:
+                self.pool.discard(conn)
+
+                if retry:
+                    continue
+
+                raise SendError('request failed: {!r}'.format(e))
+            except BaseException:
+                self.pool.discard(conn)
+                raise
+
+            try:
+                status, _, content = await asyncio.wait_for(
+                    conn.read_response(), self.timeout)
+            except asyncio.TimeoutError as e:
+                self.pool.discard(conn)
+                raise ClientError('request timed out: {!r}'.format(e))
+            except RemoteDisconnected as e:
+                self.pool.discard(conn)
+
+                if retry:
+                    continue
+
+                raise ClientError('request failed: {!r}'.format(e))
+            except (OSError, asyncio.IncompleteReadError) as e:
+                self.pool.discard(conn)
+                raise ClientError('request failed: {!r}'.format(e))
+            except BaseException:
+                self.pool.discard(conn)
+                raise
+
+            self.pool.release(conn)
+            break
+
+        if status >= 400:
+            raise ClientError('server responded with {}'.format(status))
+
+        try:
+            return json.loads(content.decode('utf8'))
+        except ValueError:
+            raise ClientError('invalid JSON response')
+
+    async def run(self, query, params=None):
+        "Runs a query, possibly coalesced with others, and returns its result."
+        entry = statement(query, params)
+
+        if not self.window:
+            results = await self._send([entry])
+            return _result(results, 0)
+
+        future = asyncio.get_event_loop().create_future()
+        self._pending.append((entry, future))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_event_loop().call_later(
+                self.window, self._flush)
+
+        return await future
+
+    def _flush(self):
+        "Sends the pending statements as one request."
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+
+        if batch:
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, entries):
+        data = await self.request({'statements': entries})
+        return data.get('results', []), data.get('errors', [])
+
+    async def _run_batch(self, batch):
+        while batch:
+            try:
+                results, errors = await self._send([e for e, _ in batch])
+            except BaseException as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+            if not errors:
+                if len(results) < len(batch):
+                    error = ClientError('response has fewer results than '
+                                        'statements')
+                else:
+                    error = None
+
+                for i, (_, future) in enumerate(batch):
+                    if future.done():
+                        continue
+
+                    if error is not None:
+                        future.set_exception(error)
+                    else:
+                        future.set_result(_result((results, errors), i))
+                return
+
+            # The statements run in order and the transaction is rolled back
+            # at the first failure. Fail that statement and resubmit the rest.
+            index = min(len(results), len(batch) - 1)
+            _, future = batch.pop(index)
+
+            if not future.done():
+                error = errors[0]
+                future.set_exception(CypherError(error.get('code'),
+                                                 error.get('message')))
+
+    async def stream(self, query, params=None):
+        """Runs a query in its own request and yields its rows as they are
+        received, decoding nodes, relationships and paths. See
+        `cypher.results`.
+        """
+        entry = statement(query, params)
+        entry['resultDataContents'] = RESULT_DATA_CONTENTS
+        payload = json.dumps({'statements': [entry]}).encode('utf8')
+
+        conn = await self.pool.acquire()
+        done = False
+
+        try:
+            try:
+                status, headers = await asyncio.wait_for(
+                    conn.send('POST', self.host, self.path, self.headers,
+                              payload),
+                    self.timeout)
+            except (OSError, asyncio.IncompleteReadError,
+                    asyncio.TimeoutError) as e:
+                raise ClientError('request failed: {!r}'.format(e))
+
+            if status >= 400:
+                raise ClientError('server responded with {}'.format(status))
+
+            decoder = ResponseDecoder()
+
+            async for chunk in conn.iter_body(headers):
+                for row in decoder.feed(chunk):
+                    yield row
+
+            for row in decoder.feed(b'', final=True):
+                yield row
+
+            done = True
+            decoder.close()
+        finally:
+            # A partially read response leaves the connection unusable
+            if done:
+                self.pool.release(conn)
+            else:
+                self.pool.discard(conn)
+
+    async def close(self):
+        "Sends pending statements and closes the connections."
+        self._flush()
+
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        self.pool.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+def _result(response, index):
+    "Returns the result at the index, raising the response error if any."
+    results, errors = response
+
+    if errors:
+        error = errors[0]
+        raise CypherError(error.get('code'), error.get('message'))
+
+    result = results[index]
+
+    return Result(result['columns'], [d['row'] for d in result['data']])
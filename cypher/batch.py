@@ -0,0 +1,216 @@
+"""
+Groups many small write queries into multi-statement transactions.
+
+Queries are compiled as they are added and accumulated into a batch, which
+is committed as one transaction when it reaches `max_statements`
+statements, `max_bytes` bytes of request payload, or is `max_delay`
+seconds old. Batches are committed in order by a background thread:
+
+    with Batcher(client.run_many) as batcher:
+        for query in queries:
+            batcher.add(query)
+
+The executor is any callable that takes a list of (statement, params)
+tuples and runs them in a single transaction, such as `Client.run_many`.
+"""
+from __future__ import unicode_literals, absolute_import
+
+import json
+import threading
+import time
+from collections import deque
+
+from .client import ClientError, CypherError, SendError, statement
+
+
+def is_transient(error):
+    """Returns true if a failed batch may succeed when retried and is safe
+    to retry. Neo4j transient errors, such as deadlocks, roll back the
+    transaction, and a `SendError` means the request was never sent. Other
+    errors, such as timeouts, may have happened after the batch committed.
+    """
+    if isinstance(error, CypherError):
+        return (error.code or '').startswith('Neo.TransientError')
+
+    return isinstance(error, SendError)
+
+
+class Batcher(object):
+    """Accumulates queries and commits them in batches using `executor`.
+
+    `add` blocks while `max_pending` batches are waiting to be committed,
+    which bounds memory when queries are produced faster than they can be
+    written. A batch that fails with an error for which `transient` returns
+    true is retried up to `retries` times with exponential `backoff`. Any
+    other failure is raised by the next call to `add`, `flush` or `close`.
+    """
+    def __init__(self, executor, max_statements=1000,
+                 max_bytes=4 * 1024 * 1024, max_delay=1.0, max_pending=2,
+                 retries=3, backoff=0.5, transient=is_transient):
+        if max_statements < 1 or max_pending < 1:
+            raise ValueError('max_statements and max_pending must be '
+                             'positive integers')
+
+        self.executor = executor
+        self.max_statements = max_statements
+        self.max_bytes = max_bytes
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.retries = retries
+        self.backoff = backoff
+        self.transient = transient
+
+        # Number of statements and batches committed
+        self.statements = 0
+        self.batches = 0
+
+        self._cond = threading.Condition()
+        self._batch = []
+        self._size = 0
+        self._started = None
+        self._ready = deque()
+        self._unfinished = 0
+        self._error = None
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def add(self, query, params=None):
+        """Adds a query, which may be a token or a string, to the current
+        batch. Blocks while too many batches are waiting to be committed.
+        """
+        entry = statement(query, params)
+        size = len(json.dumps(entry))
+
+        with self._cond:
+            self._raise()
+
+            if self._closed:
+                raise ClientError('batcher is closed')
+
+            while len(self._ready) >= self.max_pending:
+                self._cond.wait()
+                self._raise()
+
+            if self._batch and self._size + size > self.max_bytes:
+                self._seal()
+
+            self._batch.append((entry['statement'], entry['parameters']))
+            self._size += size
+
+            if len(self._batch) == 1:
+                self._started = time.time()
+                self._cond.notify_all()
+
+            if (len(self._batch) >= self.max_statements or
+                    self._size >= self.max_bytes):
+                self._seal()
+
+    def flush(self):
+        "Commits the current batch and waits for all batches to complete."
+        with self._cond:
+            if self._batch:
+                self._seal()
+
+            while self._unfinished:
+                self._cond.wait()
+
+            self._raise()
+
+    def close(self):
+        "Commits the remaining queries and stops the background thread."
+        with self._cond:
+            if self._closed:
+                return
+
+            self._closed = True
+
+            if self._batch:
+                self._seal()
+
+            self._cond.notify_all()
+
+        self._thread.join()
+
+        with self._cond:
+            self._raise()
+
+    def _raise(self):
+        "Raises the error of a failed batch, if any. Called with the lock."
+        error, self._error = self._error, None
+
+        if error is not None:
+            raise error
+
+    def _seal(self):
+        "Queues the current batch to be committed. Called with the lock."
+        self._ready.append(self._batch)
+        self._unfinished += 1
+
+        self._batch = []
+        self._size = 0
+        self._started = None
+
+        self._cond.notify_all()
+
+    def _next(self):
+        "Waits for the next batch, or returns None once closed."
+        with self._cond:
+            while not self._ready:
+                if self._batch:
+                    remaining = self._started + self.max_delay - time.time()
+
+                    if remaining <= 0 or self._closed:
+                        self._seal()
+                        break
+
+                    self._cond.wait(remaining)
+                elif self._closed:
+                    return None
+                else:
+                    self._cond.wait()
+
+            batch = self._ready.popleft()
+            self._cond.notify_all()
+
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next()
+
+            if batch is None:
+                return
+
+            try:
+                self._execute(batch)
+            except Exception as e:
+                with self._cond:
+                    if self._error is None:
+                        self._error = e
+            else:
+                with self._cond:
+                    self.statements += len(batch)
+                    self.batches += 1
+            finally:
+                with self._cond:
+                    self._unfinished -= 1
+                    self._cond.notify_all()
+
+    def _execute(self, batch):
+        for attempt in range(self.retries + 1):
+            try:
+                return self.executor(batch)
+            except Exception as e:
+                if attempt == self.retries or not self.transient(e):
+                    raise
+
+            time.sleep(self.backoff * 2 ** attempt)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
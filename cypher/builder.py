@@ -0,0 +1,206 @@
+"""
+Fluent builder for queries:
+
+    people = QueryBuilder().match(Node(identifier='n', labels=['Person']))
+    adults = people.where(Predicate(Identifier('age', identifier='n'), '>=',
+                                    Value(18)))
+    query = adults.ret(Identifier('n')).limit(10).query()
+
+Builders are immutable, each method returns a new builder sharing the
+clauses of the one it was called on, so branching is cheap. The rendered
+text of each builder is cached as long as its clauses are frozen, so
+rendering a builder after adding a clause only renders the new clause.
+Clauses built from frozen tokens and literal values are frozen
+automatically.
+"""
+from __future__ import unicode_literals, absolute_import
+
+from .syntax import (Create, Delete, Limit, Match, Merge, OnCreate, OnMatch,
+                     OptionalMatch, OrderBy, PredicateList, Query, Return,
+                     Set, Skip, Union, UnionAll, Unwind, Where, With)
+from .token import Token
+
+try:
+    str = unicode
+except NameError:
+    pass
+
+
+def _frozen(value):
+    "Returns true if the value contains no token that is not frozen."
+    if isinstance(value, Token):
+        return value.frozen
+
+    if isinstance(value, dict):
+        return all(_frozen(v) for v in value.values())
+
+    if isinstance(value, (list, tuple)):
+        return all(_frozen(v) for v in value)
+
+    return True
+
+
+def _freeze(token):
+    "Freezes a token created by the builder if its contents are frozen."
+    if _frozen(token._fields()):
+        token.freeze()
+
+    return token
+
+
+class QueryBuilder(object):
+    "Builds a query one clause at a time."
+    __slots__ = ('parent', 'clause', 'delimiter', '_text')
+
+    def __init__(self, delimiter='\n', parent=None, clause=None):
+        self.parent = parent
+        self.clause = clause
+        self.delimiter = delimiter
+        self._text = None
+
+    def then(self, clause):
+        "Returns a new builder with the clause added."
+        return QueryBuilder(self.delimiter, self, clause)
+
+    def _add(self, clause):
+        "Adds a clause created by the builder."
+        return self.then(_freeze(clause))
+
+    def clauses(self):
+        "Returns the list of clauses in order."
+        clauses = []
+        node = self
+
+        while node is not None and node.clause is not None:
+            clauses.append(node.clause)
+            node = node.parent
+
+        clauses.reverse()
+
+        return clauses
+
+    def query(self):
+        "Returns the query built so far."
+        return Query(self.clauses(), delimiter=self.delimiter)
+
+    def match(self, *patterns):
+        return self._add(Match(list(patterns)))
+
+    def optional_match(self, *patterns):
+        return self._add(OptionalMatch(list(patterns)))
+
+    def where(self, *preds, **kwargs):
+        """Adds a Where clause with the predicates joined by `operator`,
+        AND by default. Consecutive calls are combined with AND.
+        """
+        operator = kwargs.pop('operator', 'AND')
+
+        if kwargs:
+            raise TypeError('unexpected keyword arguments: {}'.format(
+                ', '.join(kwargs)))
+
+        pred = preds[0] if len(preds) == 1 else _freeze(PredicateList(
+            list(preds), operator=operator))
+
+        if isinstance(self.clause, Where) and len(self.clause.values) == 1:
+            prev = self.clause.values[0]
+
+            if (isinstance(prev, PredicateList) and
+                    str(prev.operator).upper() == 'AND'):
+                preds = list(prev.preds) + [pred]
+            else:
+                preds = [prev, pred]
+
+            return self.parent._add(Where(_freeze(PredicateList(preds))))
+
+        return self._add(Where(pred))
+
+    def with_(self, *items):
+        return self._add(With(list(items)))
+
+    def unwind(self, expr, alias):
+        return self._add(Unwind(expr, alias))
+
+    def create(self, *patterns):
+        return self._add(Create(list(patterns)))
+
+    def merge(self, pattern):
+        return self._add(Merge(pattern))
+
+    def on_create(self, *items):
+        return self._add(OnCreate(list(items)))
+
+    def on_match(self, *items):
+        return self._add(OnMatch(list(items)))
+
+    def set(self, *items):
+        return self._add(Set(list(items)))
+
+    def delete(self, *items):
+        return self._add(Delete(list(items)))
+
+    def ret(self, *items, **kwargs):
+        distinct = kwargs.pop('distinct', False)
+
+        if kwargs:
+            raise TypeError('unexpected keyword arguments: {}'.format(
+                ', '.join(kwargs)))
+
+        return self._add(Return(list(items), distinct=distinct))
+
+    def order_by(self, *items):
+        return self._add(OrderBy(list(items)))
+
+    def skip(self, value):
+        return self._add(Skip(value))
+
+    def limit(self, value):
+        return self._add(Limit(value))
+
+    def union(self, all=False):
+        return self._add(UnionAll('') if all else Union(''))
+
+    def render(self):
+        """Renders the query. The text of each builder in the chain is cached
+        if its clause and those of the builders before it are frozen.
+        """
+        # Find the closest builder with cached text
+        pending = []
+        node = self
+        text = ''
+
+        while node is not None and node.clause is not None:
+            if node._text is not None:
+                text = node._text
+                break
+
+            pending.append(node)
+            node = node.parent
+
+        cache = True
+
+        for node in reversed(pending):
+            clause = node.clause.render()
+            text = text + node.delimiter + clause if text else clause
+            cache = cache and node.clause.frozen
+
+            if cache:
+                node._text = text
+
+        return text
+
+    def compile(self, params=False):
+        "Compiles the query, see `Token.compile`."
+        if not params:
+            return self.render()
+
+        return self.query().compile(params=True)
+
+    def fingerprint(self):
+        return self.query().fingerprint()
+
+    def __str__(self):
+        return self.render()
+
+    def __repr__(self):
+        return self.render()
@@ -0,0 +1,206 @@
+"""
+Builders for writing many nodes or relationships with a few statements.
+
+Items are grouped by shape and emitted in chunks as an `UNWIND` statement
+and a `rows` parameter, for example:
+
+    UNWIND $rows AS row
+    MERGE (n:Person {id: row.key.id})
+    SET n += row.props
+
+Input is consumed lazily and only one pending chunk per shape is held in
+memory, regardless of the size of the input.
+"""
+from __future__ import unicode_literals, absolute_import
+
+from .syntax import (Node, Rel, Identifier, Param, Unwind, Match, Merge,
+                     Create, Set, Assignment, Query)
+
+ROW = 'row'
+
+
+def _names(key):
+    if key is None:
+        return ()
+
+    if not isinstance(key, (list, tuple)):
+        return (key,)
+
+    return tuple(key)
+
+
+def _row_map(names, field):
+    "Map of property references into a row field, e.g. {id: row.key.id}."
+    parent = Identifier(field, identifier=ROW)
+    return dict((k, Identifier(k, identifier=parent)) for k in names)
+
+
+def _split(props, names):
+    "Splits the props into the key values and the remaining props."
+    props = props or {}
+
+    try:
+        key = dict((k, props[k]) for k in names)
+    except KeyError as e:
+        raise ValueError('item is missing key property {}'.format(e))
+
+    rest = dict((k, v) for k, v in props.items() if k not in names)
+
+    return key, rest
+
+
+def _endpoint(value, names, labels):
+    "Returns the labels and key values of a relationship endpoint."
+    if isinstance(value, Node):
+        key, _ = _split(value.props, names)
+        return tuple(value.labels or labels or ()), key
+
+    if not isinstance(value, dict):
+        if len(names) != 1:
+            raise ValueError('endpoint values must be dicts for '
+                             'composite keys')
+        value = {names[0]: value}
+
+    key, _ = _split(value, names)
+
+    return tuple(labels or ()), key
+
+
+def _chunked(items, shape, build, chunk_size):
+    """Groups items by shape and yields a (query, params) pair each time a
+    group reaches the chunk size. Remaining groups are flushed at the end.
+    """
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be a positive integer')
+
+    queries = {}
+    pending = {}
+
+    for item in items:
+        key, row = shape(item)
+        rows = pending.setdefault(key, [])
+        rows.append(row)
+
+        if len(rows) >= chunk_size:
+            if key not in queries:
+                queries[key] = build(key)
+
+            del pending[key]
+            yield queries[key], {'rows': rows}
+
+    for key, rows in pending.items():
+        if key not in queries:
+            queries[key] = build(key)
+
+        yield queries[key], {'rows': rows}
+
+
+def node_query(labels, key=None, merge=True):
+    "Returns the statement that writes a chunk of node rows."
+    names = _names(key)
+
+    if merge:
+        node = Node(_row_map(names, 'key'), identifier='n',
+                    labels=list(labels))
+        write = Merge(node)
+    else:
+        write = Create(Node(identifier='n', labels=list(labels)))
+
+    return Query([
+        Unwind(Param('rows'), ROW),
+        write,
+        Set(Assignment('n', Identifier('props', identifier=ROW), '+=')),
+    ])
+
+
+def nodes(items, key=None, labels=None, merge=True, chunk_size=1000):
+    """Yields (query, params) pairs that write the nodes in chunks.
+
+    Items may be `Node` instances or dicts of properties. `labels` applies to
+    dicts and to nodes without labels. If `merge` is true, nodes are merged
+    on the `key` property (or tuple of properties) and the remaining
+    properties are added to the node, otherwise the nodes are created.
+    """
+    names = _names(key)
+
+    if merge and not names:
+        raise ValueError('a key is required to merge nodes')
+
+    def shape(item):
+        if isinstance(item, Node):
+            props = item.props
+            shape_labels = tuple(item.labels or labels or ())
+        else:
+            props = item
+            shape_labels = tuple(labels or ())
+
+        if not merge:
+            return shape_labels, {'props': dict(props or {})}
+
+        key, rest = _split(props, names)
+
+        return shape_labels, {'key': key, 'props': rest}
+
+    def build(shape_labels):
+        return node_query(shape_labels, names, merge)
+
+    return _chunked(items, shape, build, chunk_size)
+
+
+def rels(items, start_key, end_key, type=None, key=None, start_labels=None,
+         end_labels=None, merge=True, chunk_size=1000):
+    """Yields (query, params) pairs that write the relationships in chunks.
+
+    Items may be `Rel` instances whose start and end are `Node` instances,
+    or dicts with `start`, `end`, and optional `type` and `props` entries.
+    The endpoints are matched on the `start_key` and `end_key` properties.
+    If `merge` is true, relationships are merged on their type and the
+    optional `key` properties, otherwise they are created.
+    """
+    start_names = _names(start_key)
+    end_names = _names(end_key)
+    names = _names(key) if merge else ()
+
+    def shape(item):
+        if isinstance(item, Rel):
+            start, end = item.start, item.end
+            rel_type = item.type or type
+            props = item.props
+        else:
+            start, end = item['start'], item['end']
+            rel_type = item.get('type', type)
+            props = item.get('props')
+
+        if not rel_type:
+            raise ValueError('relationship type is required')
+
+        s_labels, s_key = _endpoint(start, start_names, start_labels)
+        e_labels, e_key = _endpoint(end, end_names, end_labels)
+        k, rest = _split(props, names)
+
+        row = {'start': s_key, 'end': e_key, 'props': rest}
+
+        if names:
+            row['key'] = k
+
+        return (rel_type, s_labels, e_labels), row
+
+    def build(shape):
+        rel_type, s_labels, e_labels = shape
+
+        start = Node(_row_map(start_names, 'start'), identifier='a',
+                     labels=list(s_labels))
+        end = Node(_row_map(end_names, 'end'), identifier='b',
+                   labels=list(e_labels))
+        rel = Rel('a', rel_type, 'b', identifier='r',
+                  props=_row_map(names, 'key'))
+
+        return Query([
+            Unwind(Param('rows'), ROW),
+            Match(start),
+            Match(end),
+            Merge(rel) if merge else Create(rel),
+            Set(Assignment('r', Identifier('props', identifier=ROW), '+=')),
+        ])
+
+    return _chunked(items, shape, build, chunk_size)
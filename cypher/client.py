@@ -0,0 +1,336 @@
+"""
+Client for Neo4j's HTTP transactional endpoint.
+
+Statements are sent in batches, one request per batch, over a pool of
+keep-alive connections:
+
+    client = Client('http://localhost:7474', auth=('neo4j', 'secret'))
+    result = client.run(query)
+    results = client.run_many([query1, (query2, {'id': 1})])
+"""
+from __future__ import unicode_literals, absolute_import
+
+import base64
+import json
+import socket
+import threading
+import time
+from collections import namedtuple
+
+try:
+    from http.client import (HTTPConnection, HTTPSConnection, HTTPException,
+                             RemoteDisconnected)
+    from urllib.parse import urlsplit
+except ImportError:
+    from httplib import HTTPConnection, HTTPSConnection, HTTPException
+    from urlparse import urlsplit
+
+    # Raised with an empty status line when the connection was closed
+    from httplib import BadStatusLine as RemoteDisconnected
+
+from .token import Token
+
+try:
+    str = unicode
+except NameError:
+    pass
+
+
+DEFAULT_PATH = '/db/data/transaction/commit'
+
+
+Result = namedtuple('Result', ['columns', 'rows'])
+
+
+class ClientError(Exception):
+    "Raised when a request fails or the server response is invalid."
+
+
+class SendError(ClientError):
+    """Raised when a request fails before it was sent in full, so none of
+    its statements were run.
+    """
+
+
+class CypherError(ClientError):
+    "Raised when the server reports an error for a statement."
+    def __init__(self, code, message):
+        super(CypherError, self).__init__('{}: {}'.format(code, message))
+        self.code = code
+        self.message = message
+
+
+def statement(query, params=None):
+    """Returns the request body entry for a query. The query may be a token,
+    which is compiled in parameterized mode, or a string. Parameters passed
+    explicitly take precedence over those generated for literal values.
+    """
+    if isinstance(query, Token):
+        text, values = query.compile(params=True)
+    else:
+        text, values = str(query), {}
+
+    if params:
+        values.update(params)
+
+    return {'statement': text, 'parameters': values}
+
+
+def statements(queries):
+    """Returns request body entries for a list of queries. Each item may be
+    a query or a (query, params) tuple.
+    """
+    entries = []
+
+    for query in queries:
+        if isinstance(query, tuple):
+            entries.append(statement(*query))
+        else:
+            entries.append(statement(query))
+
+    return entries
+
+
+def request_headers(auth=None, headers=None):
+    "Returns the headers for requests with optional (user, password) auth."
+    values = {
+        'Accept': 'application/json; charset=UTF-8',
+        'Content-Type': 'application/json',
+    }
+
+    if auth:
+        token = '{}:{}'.format(*auth).encode('utf8')
+        values['Authorization'] = 'Basic {}'.format(
+            base64.b64encode(token).decode('ascii'))
+
+    if headers:
+        values.update(headers)
+
+    return values
+
+
+def parse_results(data):
+    "Returns a list of results from a decoded response, raising on errors."
+    errors = data.get('errors')
+
+    if errors:
+        error = errors[0]
+        raise CypherError(error.get('code'), error.get('message'))
+
+    return [
+        Result(result['columns'], [d['row'] for d in result['data']])
+        for result in data.get('results', ())
+    ]
+
+
+class ConnectionPool(object):
+    """Pool of keep-alive HTTP connections to a single host.
+
+    At most `size` connections are open at once. If all connections are in
+    use, `acquire` waits up to `timeout` seconds for one to be released or
+    discarded.
+    """
+    def __init__(self, host, port=None, secure=False, size=4, timeout=30):
+        self.host = host
+        self.port = port
+        self.secure = secure
+        self.size = size
+        self.timeout = timeout
+
+        self._idle = []
+        self._count = 0
+        self._cond = threading.Condition()
+
+    def _connect(self):
+        cls = HTTPSConnection if self.secure else HTTPConnection
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    def acquire(self):
+        deadline = None
+
+        with self._cond:
+            while not self._idle:
+                if self._count < self.size:
+                    self._count += 1
+                    return self._connect()
+
+                if deadline is None:
+                    deadline = time.time() + self.timeout
+
+                remaining = deadline - time.time()
+
+                if remaining <= 0:
+                    raise ClientError('timed out waiting for a connection')
+
+                self._cond.wait(remaining)
+
+            return self._idle.pop()
+
+    def release(self, conn):
+        "Returns a connection to the pool."
+        with self._cond:
+            self._idle.append(conn)
+            self._cond.notify()
+
+    def discard(self, conn):
+        "Closes a connection that cannot be reused."
+        conn.close()
+
+        with self._cond:
+            self._count -= 1
+            self._cond.notify()
+
+    def close(self):
+        "Closes all idle connections."
+        with self._cond:
+            idle, self._idle = self._idle, []
+
+        for conn in idle:
+            self.discard(conn)
+
+
+class Client(object):
+    """Sends queries to the HTTP transactional endpoint.
+
+    `url` is the base URL of the server and `path` the endpoint that runs
+    statements in a single transaction and commits it. `auth` is an optional
+    (user, password) tuple.
+    """
+    def __init__(self, url='http://localhost:7474', path=DEFAULT_PATH,
+                 auth=None, pool_size=4, timeout=30, headers=None):
+        parts = urlsplit(url)
+
+        self.path = (parts.path.rstrip('/') + path) if parts.path else path
+        self.pool = ConnectionPool(parts.hostname, parts.port,
+                                   secure=parts.scheme == 'https',
+                                   size=pool_size, timeout=timeout)
+
+        self.headers = request_headers(auth, headers)
+
+    def _send(self, conn, payload):
+        "Sends a request, raising `SendError` if it could not be sent."
+        try:
+            conn.request('POST', self.path, payload, self.headers)
+        except socket.timeout as e:
+            # Part of the request may have been sent
+            self.pool.discard(conn)
+            raise ClientError('request timed out: {}'.format(e))
+        except (socket.error, HTTPException) as e:
+            self.pool.discard(conn)
+            raise SendError('request failed: {}'.format(e))
+
+    def request(self, body):
+        """Posts the body and returns the decoded response.
+
+        A kept alive connection may have been closed by the server since it
+        was last used. A request on such a connection that fails while it is
+        sent, or before any response is received, is retried once on a new
+        connection. Other failures, including timeouts, are not retried since
+        the statements may have run.
+        """
+        payload = json.dumps(body).encode('utf8')
+
+        for attempt in range(2):
+            conn = self.pool.acquire()
+            reused = conn.sock is not None
+
+            try:
+                self._send(conn, payload)
+            except SendError:
+                if reused and not attempt:
+                    continue
+
+                raise
+
+            try:
+                response = conn.getresponse()
+                content = response.read()
+            except RemoteDisconnected as e:
+                self.pool.discard(conn)
+
+                if reused and not attempt:
+                    continue
+
+                raise ClientError('request failed: {}'.format(e))
+            except (socket.error, HTTPException) as e:
+                self.pool.discard(conn)
+                raise ClientError('request failed: {}'.format(e))
+
+            if response.getheader('connection', '').lower() == 'close':
+                self.pool.discard(conn)
+            else:
+                self.pool.release(conn)
+
+            break
+
+        if response.status >= 400:
+            raise ClientError('server responded with {} {}'.format(
+                response.status, response.reason))
+
+        try:
+            return json.loads(content.decode('utf8'))
+        except ValueError:
+            raise ClientError('invalid JSON response')
+
+    def run_many(self, queries):
+        """Runs the queries in a single request and transaction and returns a
+        list of results. Each item may be a query or a (query, params) tuple.
+        """
+        entries = statements(queries)
+
+        if not entries:
+            return []
+
+        return parse_results(self.request({'statements': entries}))
+
+    def run(self, query, params=None):
+        "Runs a single query and returns its result."
+        return self.run_many([(query, params)])[0]
+
+    def stream(self, query, params=None, chunk_size=65536):
+        """Runs a single query and yields its rows as they are received,
+        decoding nodes, relationships and paths. See `cypher.results`.
+        """
+        from .results import RESULT_DATA_CONTENTS, iter_rows
+
+        entry = statement(query, params)
+        entry['resultDataContents'] = RESULT_DATA_CONTENTS
+        payload = json.dumps({'statements': [entry]}).encode('utf8')
+
+        conn = self.pool.acquire()
+        self._send(conn, payload)
+
+        try:
+            response = conn.getresponse()
+        except (socket.error, HTTPException) as e:
+            self.pool.discard(conn)
+            raise ClientError('request failed: {}'.format(e))
+
+        done = False
+
+        try:
+            if response.status >= 400:
+                raise ClientError('server responded with {} {}'.format(
+                    response.status, response.reason))
+
+            for row in iter_rows(response, chunk_size):
+                yield row
+
+            done = True
+        finally:
+            close = response.getheader('connection', '').lower() == 'close'
+
+            # A partially read response leaves the connection unusable
+            if done and not close:
+                self.pool.release(conn)
+            else:
+                self.pool.discard(conn)
+
+    def close(self):
+        self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,223 @@
+"""
+Columnar input for bulk writes.
+
+Accepts a dict of arrays or lists, a NumPy structured or record array, or a
+pandas DataFrame. Columns are converted to Python values in bulk, a chunk
+at a time, and rows are built directly as parameter payloads without
+creating tokens for each row. Missing values (None and NaN) are omitted
+from the row they occur in, including `pandas.NA` in nullable columns.
+
+Datetime columns are converted to ISO 8601 strings, which can be passed to
+Cypher's `datetime()` or `localdatetime()`. Timezone aware pandas columns
+are converted to UTC and suffixed with `Z`. Timedelta columns are not
+supported.
+
+NumPy and pandas are not required, columns are handled by duck typing.
+"""
+from __future__ import unicode_literals, absolute_import
+
+from .bulk import _names, node_query
+from .syntax import Collection
+
+
+def columns(data):
+    "Returns a list of (name, column) pairs for the columnar data."
+    # pandas DataFrame
+    if hasattr(data, 'columns') and hasattr(data, 'iloc'):
+        cols = []
+
+        for name in data.columns:
+            col = data[name]
+
+            if getattr(col.dtype, 'tz', None) is not None:
+                # The values of timezone aware columns are in naive UTC
+                cols.append((name, col.array))
+            else:
+                cols.append((name, getattr(col, 'values', col)))
+
+        return cols
+
+    # NumPy structured or record array
+    dtype = getattr(data, 'dtype', None)
+
+    if dtype is not None and dtype.names:
+        return [(name, data[name]) for name in dtype.names]
+
+    if isinstance(data, dict):
+        return list(data.items())
+
+    raise TypeError('columnar data must be a dict of columns, a structured '
+                    'array, or a DataFrame')
+
+
+def _length(cols):
+    lengths = set(len(col) for _, col in cols)
+
+    if len(lengths) > 1:
+        raise ValueError('columns must have the same length')
+
+    return lengths.pop() if lengths else 0
+
+
+def _isoformat(col):
+    "Converts a datetime column slice to a list of ISO 8601 strings."
+    suffix = ''
+
+    if getattr(col.dtype, 'tz', None) is not None:
+        col = getattr(col, 'array', col).tz_convert('UTC').tz_localize(None)
+        suffix = 'Z'
+
+    # pandas series and arrays format datetimes differently from NumPy
+    if hasattr(col, 'to_numpy'):
+        col = col.to_numpy()
+
+    values = col.astype('U').tolist()
+
+    if suffix:
+        values = [v + suffix for v in values]
+
+    return values
+
+
+def _tolist(col):
+    "Converts a column slice to a list of Python values in bulk."
+    kind = getattr(getattr(col, 'dtype', None), 'kind', None)
+
+    # tolist() returns datetime objects or integer nanoseconds, neither of
+    # which can be sent as JSON
+    if kind == 'M':
+        return _isoformat(col)
+
+    if kind == 'm':
+        raise TypeError('timedelta columns are not supported, convert them '
+                        'to numbers or strings')
+
+    if hasattr(col, 'tolist'):
+        return col.tolist()
+
+    return list(col)
+
+
+def _is_missing(value):
+    if value is None:
+        return True
+
+    try:
+        return bool(value != value)
+    except TypeError:
+        # pandas.NA, whose comparisons are neither true nor false
+        return True
+
+
+def _missing(col, values):
+    "Returns a list of flags for missing values, or None if there are none."
+    dtype = getattr(col, 'dtype', None)
+    isna = getattr(col, 'isna', None)
+
+    if callable(isna):
+        # pandas extension arrays and series, including the nullable
+        # integer and boolean types whose dtype kind is 'i' or 'b'
+        mask = _tolist(isna())
+    elif dtype is not None and dtype.kind in 'iubSU':
+        # NumPy integer, boolean and string arrays cannot contain missing
+        # values
+        return None
+    elif dtype is not None and dtype.kind in 'fcmM':
+        # Float, complex and datetime arrays compare NaN/NaT unequal to
+        # itself
+        mask = (col != col).tolist()
+    else:
+        mask = [_is_missing(v) for v in values]
+
+    if not any(mask):
+        return None
+
+    return mask
+
+
+def _chunks(data, chunk_size):
+    """Yields (names, columns, sparse) for each chunk of rows. `columns` are
+    lists of values without missing values and `sparse` is a list of
+    (name, values, mask) for those with missing values.
+    """
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be a positive integer')
+
+    cols = columns(data)
+    length = _length(cols)
+
+    for start in range(0, length, chunk_size):
+        names = []
+        dense = []
+        sparse = []
+
+        for name, col in cols:
+            col = col[start:start + chunk_size]
+            values = _tolist(col)
+            mask = _missing(col, values)
+
+            if mask is None:
+                names.append(name)
+                dense.append(values)
+            else:
+                sparse.append((name, values, mask))
+
+        yield names, dense, sparse
+
+
+def _records(names, dense, sparse):
+    "Builds a dict per row from the column lists of a chunk."
+    if dense:
+        records = [dict(zip(names, row)) for row in zip(*dense)]
+    else:
+        records = [{} for _ in range(len(sparse[0][1]))]
+
+    for name, values, mask in sparse:
+        for record, value, missing in zip(records, values, mask):
+            if not missing:
+                record[name] = value
+
+    return records
+
+
+def records(data, chunk_size=10000):
+    "Yields a dict of properties for each row of the columnar data."
+    for chunk in _chunks(data, chunk_size):
+        for record in _records(*chunk):
+            yield record
+
+
+def collection(data, identifier=None):
+    "Returns a literal collection of maps for the rows."
+    return Collection(list(records(data)), identifier=identifier)
+
+
+def nodes(data, key=None, labels=None, merge=True, chunk_size=1000):
+    """Yields (query, params) pairs that write a node for each row, in the
+    same form as `bulk.nodes`. All rows share the labels and key.
+    """
+    names = _names(key)
+
+    if merge and not names:
+        raise ValueError('a key is required to merge nodes')
+
+    query = node_query(tuple(labels or ()), names, merge)
+
+    for chunk in _chunks(data, chunk_size):
+        props = _records(*chunk)
+
+        if not merge:
+            rows = [{'props': p} for p in props]
+        else:
+            rows = []
+
+            for p in props:
+                try:
+                    key = dict((k, p.pop(k)) for k in names)
+                except KeyError as e:
+                    raise ValueError('row is missing key property {}'
+                                     .format(e))
+
+                rows.append({'key': key, 'props': p})
+
+        yield query, {'rows': rows}
@@ -0,0 +1,302 @@
+"""
+Plans bulk imports with `LOAD CSV`.
+
+Records are streamed into CSV files of at most `chunk_size` rows and a
+statement is generated for each file, for example:
+
+    USING PERIODIC COMMIT 1000
+    LOAD CSV WITH HEADERS FROM 'file:///person_00000.csv' AS row
+    MERGE (n:Person {id: toInteger(row.id)})
+    SET n.name = row.name
+
+CSV values are strings, so columns whose values are all integers, floats
+or booleans are converted back in the statement. Missing values are
+written as empty fields, which are read as null, and leave the existing
+property unchanged:
+
+    SET n.name = coalesce(row.name, n.name)
+
+Files are written to `directory` and referenced by `url`, which should be
+the URL of the same directory as seen by the server, by default its
+import directory.
+"""
+from __future__ import unicode_literals, absolute_import
+
+import io
+import os
+
+from .bulk import _names
+from .syntax import (Function, Identifier, LoadCSV, Match, Merge, Node,
+                     PropertyList, Query, Rel, Set, UsingPeriodicCommit)
+
+try:
+    str = unicode
+except NameError:
+    pass
+
+
+ROW = 'row'
+
+# Columns of relationship records holding the keys of the endpoints
+START = 'start'
+END = 'end'
+
+_special = ('"', ',', '\n', '\r')
+
+
+def _field(value, delimiter=','):
+    "Formats a value as a CSV field."
+    if value is None:
+        return ''
+
+    if value is True:
+        return 'true'
+
+    if value is False:
+        return 'false'
+
+    if isinstance(value, (int, float)):
+        return repr(value)
+
+    if isinstance(value, bytes):
+        value = value.decode('utf8')
+    elif not isinstance(value, str):
+        raise TypeError('cannot write {!r} to CSV'.format(value))
+
+    # Quote empty strings so they are not read as null
+    if not value or delimiter in value or any(c in value for c in _special):
+        return '"{}"'.format(value.replace('"', '""'))
+
+    return value
+
+
+def _converter(values):
+    "Returns the function converting the CSV values of a column, if any."
+    kinds = set()
+
+    for value in values:
+        if value is None:
+            continue
+
+        if isinstance(value, bool):
+            kinds.add('toBoolean')
+        elif isinstance(value, int):
+            kinds.add('toInteger')
+        elif isinstance(value, float):
+            kinds.add('toFloat')
+        else:
+            return None
+
+    if kinds == {'toInteger', 'toFloat'}:
+        return 'toFloat'
+
+    if len(kinds) == 1:
+        return kinds.pop()
+
+
+def _column(name, converter):
+    "Returns the expression of a column, e.g. toInteger(row.id)."
+    value = Identifier(name, identifier=ROW)
+
+    if converter:
+        return Function(converter, [value])
+
+    return value
+
+
+def _properties(columns, rows, values, identifier):
+    """Returns the map of properties set from the columns. Columns with
+    missing values keep the current value of the property instead of
+    removing it.
+    """
+    props = {}
+
+    for i, c in columns:
+        value = values[c]
+
+        if any(r[i] is None for r in rows):
+            value = Function('coalesce', [
+                value, Identifier(c, identifier=identifier)])
+
+        props[c] = value
+
+    return props
+
+
+class Planner(object):
+    """Writes records to CSV files and generates the statements loading
+    them. `plan` is the list of (path, query) pairs in the order they must
+    run: nodes before the relationships between them.
+    """
+    def __init__(self, directory, url='file:///', chunk_size=100000,
+                 periodic_commit=1000, delimiter=','):
+        self.directory = directory
+        self.url = url if url.endswith('/') else url + '/'
+        self.chunk_size = chunk_size
+        self.periodic_commit = periodic_commit
+        self.delimiter = delimiter
+        self.plan = []
+
+        self._files = {}
+
+    def _write(self, name, columns, rows):
+        "Writes a CSV file and returns its path and URL."
+        index = self._files.get(name, 0)
+        self._files[name] = index + 1
+
+        filename = '{}_{:05d}.csv'.format(name, index)
+        path = os.path.join(self.directory, filename)
+        delimiter = self.delimiter
+
+        with io.open(path, 'w', encoding='utf8', newline='') as fp:
+            fp.write(delimiter.join(_field(c, delimiter) for c in columns))
+            fp.write('\n')
+
+            for row in rows:
+                fp.write(delimiter.join(_field(v, delimiter) for v in row))
+                fp.write('\n')
+
+        return path, self.url + filename
+
+    def _load(self, url):
+        toks = []
+
+        if self.periodic_commit is not None:
+            toks.append(UsingPeriodicCommit(self.periodic_commit or None))
+
+        delimiter = self.delimiter if self.delimiter != ',' else None
+        toks.append(LoadCSV(url, ROW, delimiter=delimiter))
+
+        return toks
+
+    def _chunks(self, records):
+        chunk = []
+
+        for record in records:
+            chunk.append(record)
+
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+    def nodes(self, records, labels, key, name=None):
+        """Writes nodes, given as dicts of properties, and returns the
+        statements merging them on the `key` properties.
+        """
+        if not isinstance(labels, (list, tuple)):
+            labels = [labels]
+
+        names = _names(key)
+
+        if not names:
+            raise ValueError('a key is required to merge nodes')
+
+        name = name or '_'.join(labels).lower()
+        queries = []
+
+        for chunk in self._chunks(records):
+            columns = list(names)
+            seen = set(columns)
+
+            for record in chunk:
+                for k in names:
+                    if k not in record:
+                        raise ValueError('record is missing key property '
+                                         '{}'.format(k))
+
+                for k in record:
+                    if k not in seen:
+                        seen.add(k)
+                        columns.append(k)
+
+            rows = [[record.get(c) for c in columns] for record in chunk]
+            path, url = self._write(name, columns, rows)
+
+            values = dict(
+                (c, _column(c, _converter(r[i] for r in rows)))
+                for i, c in enumerate(columns))
+
+            toks = self._load(url)
+            toks.append(Merge(Node(dict((k, values[k]) for k in names),
+                                   identifier='n', labels=list(labels))))
+
+            props = _properties(
+                [(i, c) for i, c in enumerate(columns) if c not in names],
+                rows, values, 'n')
+
+            if props:
+                toks.append(Set(PropertyList(props, identifier='n')))
+
+            query = Query(toks)
+            self.plan.append((path, query))
+            queries.append(query)
+
+        return queries
+
+    def rels(self, records, type, start_labels, start_key, end_labels,
+             end_key, name=None):
+        """Writes relationships, given as (start, end) or (start, end, props)
+        tuples of the endpoint key values, and returns the statements
+        merging them between the matched endpoints.
+
+        The records of each file are sorted by endpoint, so transactions
+        lock nodes in a consistent order and contend less with each other.
+        """
+        if not isinstance(start_labels, (list, tuple)):
+            start_labels = [start_labels]
+
+        if not isinstance(end_labels, (list, tuple)):
+            end_labels = [end_labels]
+
+        name = name or type.lower()
+        queries = []
+
+        for chunk in self._chunks(records):
+            chunk.sort(key=lambda r: (r[0], r[1]))
+
+            columns = [START, END]
+            seen = set(columns)
+
+            for record in chunk:
+                for k in (record[2] if len(record) > 2 and record[2]
+                          else ()):
+                    if k not in seen:
+                        seen.add(k)
+                        columns.append(k)
+
+            rows = []
+
+            for record in chunk:
+                props = record[2] if len(record) > 2 and record[2] else {}
+                rows.append([record[0], record[1]] +
+                            [props.get(c) for c in columns[2:]])
+
+            path, url = self._write(name, columns, rows)
+
+            values = dict(
+                (c, _column(c, _converter(r[i] for r in rows)))
+                for i, c in enumerate(columns))
+
+            start = Node({start_key: values[START]}, identifier='a',
+                         labels=list(start_labels))
+            end = Node({end_key: values[END]}, identifier='b',
+                       labels=list(end_labels))
+
+            toks = self._load(url)
+            toks.append(Match([start, end]))
+            toks.append(Merge(Rel('a', type, 'b', identifier='r')))
+
+            props = _properties(list(enumerate(columns))[2:], rows, values,
+                                'r')
+
+            if props:
+                toks.append(Set(PropertyList(props, identifier='r')))
+
+            query = Query(toks)
+            self.plan.append((path, query))
+            queries.append(query)
+
+        return queries
@@ -0,0 +1,201 @@
+"""
+Renders large numbers of statements into Cypher script files, such as
+those run by `cypher-shell` or `neo4j-shell`, using a pool of processes.
+
+Items are rendered in chunks by worker processes and written as they
+complete, so only a bounded number of chunks are held in memory at once:
+
+    export(nodes, 'import.cypher.gz', render=merge_person, processes=8)
+
+`render` is called with each item that is not a token or string and must
+return one, for example to build a statement from a dict of row data. It
+is sent to the worker processes, so it must be a module-level function.
+
+Items are pickled in the parent process to be sent to the workers, and
+pickling a token costs about as much as rendering it, which limits the
+speedup of token items to about 3x however many processes are used. Pass
+row data, such as dicts, with a `render` function building the tokens so
+they are created and rendered in the workers.
+"""
+from __future__ import unicode_literals, absolute_import
+
+import gzip
+import io
+import multiprocessing
+from collections import deque
+
+from .token import Token
+
+try:
+    str = unicode
+except NameError:
+    pass
+
+
+# Transaction commands of cypher-shell
+CYPHER_SHELL = (':begin', ':commit')
+
+
+def _chunks(items, chunk_size):
+    chunk = []
+
+    for item in items:
+        chunk.append(item)
+
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def _render_chunk(args):
+    """Renders a chunk of items into UTF-8 encoded statements terminated by
+    semicolons. Returns the data and the number of statements.
+    """
+    render, items = args
+    statements = []
+
+    for item in items:
+        if not isinstance(item, (Token, str)):
+            if render is None:
+                raise TypeError('a render function is required to export '
+                                '{!r}'.format(item))
+
+            item = render(item)
+
+        statements.append(str(item))
+        statements.append(';\n')
+
+    return ''.join(statements).encode('utf8'), len(items)
+
+
+def _next_ready(pending):
+    "Removes and returns the result of the first completed task."
+    while True:
+        for i, result in enumerate(pending):
+            if result.ready():
+                del pending[i]
+                return result.get()
+
+        pending[0].wait(0.005)
+
+
+def render_chunks(chunks, render=None, processes=None, ordered=True,
+                  max_pending=None):
+    """Yields the (data, count) of each rendered chunk. With more than one
+    process, at most `max_pending` chunks are submitted to the pool at once,
+    which defaults to twice the number of processes.
+    """
+    if processes == 1:
+        for chunk in chunks:
+            yield _render_chunk((render, chunk))
+        return
+
+    processes = processes or multiprocessing.cpu_count()
+    max_pending = max_pending or 2 * processes
+
+    pool = multiprocessing.Pool(processes)
+    pending = deque()
+
+    try:
+        for chunk in chunks:
+            pending.append(pool.apply_async(_render_chunk,
+                                            ((render, chunk),)))
+
+            while len(pending) >= max_pending:
+                if ordered:
+                    yield pending.popleft().get()
+                else:
+                    yield _next_ready(pending)
+
+        while pending:
+            if ordered:
+                yield pending.popleft().get()
+            else:
+                yield _next_ready(pending)
+
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+class ScriptWriter(object):
+    """Writes rendered statements to a file, wrapped in transaction markers
+    every `commit_every` statements. `markers` is the pair of lines opening
+    and committing a transaction, by default the `:begin` and `:commit`
+    commands of cypher-shell. Markers are placed between chunks so
+    transactions may be larger by up to a chunk. The file is compressed with
+    gzip if `compress` is true, or by default if the path ends with `.gz`.
+    """
+    def __init__(self, path, commit_every=10000, compress=None,
+                 markers=CYPHER_SHELL):
+        if compress is None:
+            compress = path.endswith('.gz')
+
+        self.fp = gzip.open(path, 'wb') if compress else io.open(path, 'wb')
+        self.commit_every = commit_every
+        self.statements = 0
+
+        self._begin, self._commit = (
+            '{}\n'.format(m).encode('utf8') for m in markers)
+
+        self._open = 0
+
+    def write(self, data, count):
+        if self.commit_every and not self._open:
+            self.fp.write(self._begin)
+
+        self.fp.write(data)
+        self.statements += count
+        self._open += count
+
+        if self.commit_every and self._open >= self.commit_every:
+            self.fp.write(self._commit)
+            self._open = 0
+
+    def close(self):
+        if self.commit_every and self._open:
+            self.fp.write(self._commit)
+            self._open = 0
+
+        self.fp.close()
+
+
+def export(items, paths, render=None, processes=None, chunk_size=1000,
+           ordered=True, commit_every=10000, compress=None, max_pending=None,
+           markers=CYPHER_SHELL):
+    """Renders the items into the script file at `paths` and returns the
+    number of statements written.
+
+    If `paths` is a list, chunks are distributed among the files in turn so
+    they can be loaded in parallel. With `ordered` false, chunks are written
+    as soon as they are rendered rather than in the order of the items.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be a positive integer')
+
+    writers = []
+    results = render_chunks(_chunks(items, chunk_size), render, processes,
+                            ordered, max_pending)
+
+    try:
+        for path in paths:
+            writers.append(ScriptWriter(path, commit_every, compress,
+                                        markers))
+
+        for i, (data, count) in enumerate(results):
+            writers[i % len(writers)].write(data, count)
+    finally:
+        # Stops the pool if writing failed
+        results.close()
+
+        for writer in writers:
+            writer.close()
+
+    return sum(writer.statements for writer in writers)
@@ -54,6 +54,7 @@ functions = {
 
 
 class _StartLookup(Token):
+    __slots__ = ('key', 'index', 'identifier')
     function = ''
 
     def __init__(self, key, value=None, index=None, identifier=None):
@@ -90,13 +91,17 @@ class _StartLookup(Token):
 
 
 class StartNode(_StartLookup):
+    __slots__ = ()
     function = NODE
 
 
 class StartRel(_StartLookup):
+    __slots__ = ()
     function = REL
 
 
 class Id(Function):
+    __slots__ = ()
+
     def __init__(self, identifier):
         super(Id, self).__init__(ID, Identifier(identifier))
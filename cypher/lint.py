@@ -0,0 +1,272 @@
+"""
+Static checks for patterns that commonly cause expensive queries.
+
+    >>> lint(Query([Match(Rel('a', '*', 'b')), Return(Identifier('b'))]))
+    [Issue(rule='unbounded-path', severity='error', ...),
+     Issue(rule='unlimited-return', severity='info', ...)]
+
+Rules:
+
+- `unbounded-path`: a variable length relationship without an upper
+  bound, such as `*` or `*1..`.
+- `disconnected-match`: a `Match` of patterns that share no identifiers,
+  which computes their Cartesian product.
+- `unlimited-return`: a `Return` of matched rows without a `Limit`.
+
+Wrap a query in `Strict` to raise `LintError` when it is rendered with
+issues of at least a given severity.
+"""
+from __future__ import unicode_literals, absolute_import
+
+import re
+from collections import namedtuple
+
+from .syntax import (Create, Function, Identifier, Limit, Match, Merge, Node,
+                     Path, Query, Rel, Return, Start, Union, UnionAll,
+                     Unwind)
+from .token import Token
+
+try:
+    str = unicode
+except NameError:
+    pass
+
+
+SEVERITIES = ('info', 'warning', 'error')
+
+DEFAULT_SEVERITIES = {
+    'unbounded-path': 'error',
+    'disconnected-match': 'warning',
+    'unlimited-return': 'info',
+}
+
+AGGREGATES = {'count', 'sum', 'avg', 'min', 'max', 'collect', 'stdev',
+              'stdevp', 'percentilecont', 'percentiledisc'}
+
+Issue = namedtuple('Issue', ['rule', 'severity', 'message', 'token'])
+
+_var_length = re.compile(r'^\*\s*(\d*)\s*(\.\.\s*(\d*))?\s*$')
+
+
+class LintError(ValueError):
+    "Raised when a strict query is rendered with issues."
+    def __init__(self, issues):
+        super(LintError, self).__init__('; '.join(
+            '{} ({}): {}'.format(i.rule, i.severity, i.message)
+            for i in issues))
+        self.issues = issues
+
+
+def is_unbounded(rel_type):
+    "Returns true if a relationship type is a range without an upper bound."
+    if not isinstance(rel_type, str):
+        return False
+
+    match = _var_length.match(rel_type)
+
+    if match is None:
+        return False
+
+    lower, dots, upper = match.groups()
+
+    if dots:
+        return not upper
+
+    return not lower
+
+
+def _walk(token):
+    "Yields all tokens contained in the token, including itself."
+    stack = [token]
+
+    while stack:
+        value = stack.pop()
+
+        if isinstance(value, Token):
+            yield value
+            stack.extend(value._fields().values())
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+
+
+def _node_names(node):
+    if isinstance(node, Node):
+        return [node.identifier] if node.identifier else []
+
+    if isinstance(node, Identifier):
+        return [node.value]
+
+    return [node] if node else []
+
+
+def _names(pattern):
+    "Returns the identifiers of a pattern."
+    if isinstance(pattern, Node):
+        return _node_names(pattern)
+
+    if isinstance(pattern, Rel):
+        names = _node_names(pattern.start) + _node_names(pattern.end)
+
+        if pattern.identifier:
+            names.append(pattern.identifier)
+
+        return names
+
+    if isinstance(pattern, Path):
+        names = [pattern.identifier] if pattern.identifier else []
+
+        for rel in pattern.rels:
+            names.extend(_names(rel))
+
+        return names
+
+    if isinstance(pattern, Identifier):
+        return [pattern.value]
+
+    return []
+
+
+def _components(patterns, bound):
+    """Returns the number of groups of patterns that share identifiers,
+    ignoring patterns that only refer to bound identifiers.
+    """
+    groups = []
+
+    for pattern in patterns:
+        names = set(_names(pattern))
+
+        if names and names <= bound:
+            continue
+
+        names -= bound
+        merged = [g for g in groups if g & names]
+
+        for g in merged:
+            groups.remove(g)
+            names |= g
+
+        groups.append(names)
+
+    return len(groups)
+
+
+def _is_aggregate(value):
+    if not isinstance(value, Function):
+        return False
+
+    return str(value.function).lower() in AGGREGATES
+
+
+class Linter(object):
+    """Checks token trees. `severities` maps rule names to a severity, one
+    of `SEVERITIES`, or None to disable the rule.
+    """
+    def __init__(self, severities=None):
+        self.severities = dict(DEFAULT_SEVERITIES)
+
+        if severities:
+            for rule, severity in severities.items():
+                if rule not in DEFAULT_SEVERITIES:
+                    raise ValueError('unknown rule "{}"'.format(rule))
+
+                if severity is not None and severity not in SEVERITIES:
+                    raise ValueError('unknown severity "{}"'.format(severity))
+
+            self.severities.update(severities)
+
+    def lint(self, token):
+        "Returns a list of issues found in the token."
+        issues = []
+
+        def report(rule, message, tok):
+            severity = self.severities.get(rule)
+
+            if severity is not None:
+                issues.append(Issue(rule, severity, message, tok))
+
+        for tok in _walk(token):
+            if isinstance(tok, Rel) and is_unbounded(tok.type):
+                report('unbounded-path', 'relationship range "{}" has no '
+                       'upper bound'.format(tok.type), tok)
+
+        if isinstance(token, Query):
+            self._query(token.tokens, report)
+        elif isinstance(token, Match):
+            self._query([token], report)
+
+        return issues
+
+    def _query(self, tokens, report):
+        bound = set()
+        matched = False
+        returned = None
+
+        # Parts of a union are checked separately
+        for tok in list(tokens) + [None]:
+            if tok is None or isinstance(tok, (Union, UnionAll)):
+                if returned is not None:
+                    report('unlimited-return', 'return of matched rows has '
+                           'no limit', returned)
+
+                bound = set()
+                matched = False
+                returned = None
+                continue
+
+            if isinstance(tok, Match):
+                matched = True
+
+                if _components(tok.values, bound) > 1:
+                    report('disconnected-match', 'patterns share no '
+                           'identifiers and produce a Cartesian product', tok)
+
+                for pattern in tok.values:
+                    bound.update(_names(pattern))
+            elif isinstance(tok, Start):
+                matched = True
+            elif isinstance(tok, Merge):
+                bound.update(_names(tok.expr))
+            elif isinstance(tok, Create):
+                for pattern in tok.values:
+                    bound.update(_names(pattern))
+            elif isinstance(tok, Unwind):
+                bound.add(tok.alias)
+            elif isinstance(tok, Return):
+                if matched and not all(_is_aggregate(v) for v in tok.values):
+                    returned = tok
+            elif isinstance(tok, Limit):
+                returned = None
+
+    def check(self, token, severity='error'):
+        """Raises `LintError` if the token has issues of at least the given
+        severity.
+        """
+        level = SEVERITIES.index(severity)
+        issues = [i for i in self.lint(token)
+                  if SEVERITIES.index(i.severity) >= level]
+
+        if issues:
+            raise LintError(issues)
+
+
+def lint(token, severities=None):
+    "Returns a list of issues found in the token."
+    return Linter(severities).lint(token)
+
+
+class Strict(Token):
+    """Wraps a query that is checked when it is rendered, raising
+    `LintError` if it has issues of at least `severity`.
+    """
+    __slots__ = ('query', 'severity', 'severities')
+
+    def __init__(self, query, severity='error', severities=None):
+        self.query = query
+        self.severity = severity
+        self.severities = severities
+
+    def tokenize(self):
+        Linter(self.severities).check(self.query, self.severity)
+        return [self.query]
@@ -0,0 +1,347 @@
+"""
+Static rewrites of token trees that remove redundant work without
+changing the result of a query.
+
+    >>> optimize(Query([Match(Node(identifier='n', labels=['Person'])),
+    ...                 Where(Predicate(Identifier('name', identifier='n'),
+    ...                                 '=', Value('Bob'))),
+    ...                 Return([Identifier('n'), Identifier('n')])]))
+    MATCH (n:Person {name: 'Bob'})
+    RETURN n
+
+The input is never modified, rewritten tokens are copies.
+"""
+from __future__ import unicode_literals, absolute_import
+
+from .syntax import (Identifier, Match, Node, Param, Path, Predicate,
+                     PredicateList, Query, Rel, Return, Value, Where, With,
+                     is_literal)
+from .token import Token, token_type
+
+try:
+    str = unicode
+except NameError:
+    pass
+
+
+def optimize(token):
+    """Returns an equivalent token with redundant work removed:
+
+    - Adjacent `Match` clauses are merged and duplicated patterns dropped.
+    - `n.key = value` predicates of a `Where` following a `Match` are moved
+      into the props map of node `n` so an index on the key can be used.
+    - Nested `AND`/`OR` predicate lists are flattened and duplicated
+      predicates dropped.
+    - Duplicated `Return` and `With` items are dropped.
+    """
+    if isinstance(token, Query):
+        return _query(token)
+
+    if isinstance(token, PredicateList):
+        return _predicates(token)
+
+    if isinstance(token, Where):
+        return token.copy(values=[
+            _predicates(v) if isinstance(v, PredicateList) else v
+            for v in token.values
+        ])
+
+    if token_type(token) is Match:
+        return token.copy(values=_unique_patterns(token.values))
+
+    if isinstance(token, (Return, With)):
+        return _unique_items(token)
+
+    return token
+
+
+def _query(query):
+    tokens = []
+
+    for tok in query.tokens:
+        tok = optimize(tok)
+        prev = tokens[-1] if tokens else None
+
+        if token_type(tok) is Match and token_type(prev) is Match:
+            values = _merge_patterns(prev.values, tok.values)
+
+            if values is not None:
+                tokens[-1] = prev.copy(values=values)
+                continue
+
+        if isinstance(tok, Where) and isinstance(prev, Match):
+            tokens[-1], tok = _push_predicates(prev, tok)
+
+            if tok is None:
+                # The next clause may now be merged with the match
+                continue
+
+        tokens.append(tok)
+
+    return query.copy(tokens=tokens)
+
+
+def _is_and_or(plist):
+    return str(plist.operator).upper() in ('AND', 'OR')
+
+
+def _predicates(plist):
+    "Flattens nested lists with the same operator and drops duplicates."
+    preds = []
+
+    for pred in plist.preds:
+        if isinstance(pred, PredicateList):
+            pred = _predicates(pred)
+
+            if (_is_and_or(pred) and
+                    str(pred.operator).upper() ==
+                    str(plist.operator).upper()):
+                preds.extend(p for p in pred.preds
+                             if not (_is_and_or(plist) and p in preds))
+                continue
+
+        # p AND p and p OR p are equivalent to p, but not p XOR p
+        if _is_and_or(plist) and pred in preds:
+            continue
+
+        preds.append(pred)
+
+    return plist.copy(preds=preds)
+
+
+def _item(value):
+    "Returns the item as it is rendered by Return and With."
+    if isinstance(value, (Node, Rel, Path)) and value.identifier:
+        return Identifier(value.identifier)
+
+    if not isinstance(value, Token):
+        return Value(value)
+
+    return value
+
+
+def _unique_items(token):
+    seen = []
+    values = []
+
+    for value in token.values:
+        item = _item(value)
+
+        if item not in seen:
+            seen.append(item)
+            values.append(value)
+
+    return token.copy(values=values)
+
+
+def _node_bound(node):
+    if isinstance(node, Node):
+        return bool(node.identifier)
+
+    return bool(node)
+
+
+def _bound(pattern):
+    """Returns true if every node and relationship of the pattern is bound
+    to an identifier, so repeating the pattern does not change the number
+    of rows.
+    """
+    if isinstance(pattern, Node):
+        return bool(pattern.identifier)
+
+    if isinstance(pattern, Rel):
+        return bool(pattern.identifier and _node_bound(pattern.start) and
+                    _node_bound(pattern.end))
+
+    if isinstance(pattern, Path):
+        return all(_bound(rel) for rel in pattern.rels)
+
+    return False
+
+
+def _has_rels(pattern):
+    "Returns true if the pattern may contain relationships."
+    return not isinstance(pattern, Node)
+
+
+def _unique_patterns(patterns, existing=()):
+    """Returns the existing patterns followed by the patterns that do not
+    repeat them. Within a single clause only node patterns are dropped,
+    since repeating a relationship yields no rows.
+    """
+    values = list(existing)
+
+    for pattern in patterns:
+        if _bound(pattern) and (
+                pattern in existing or
+                (isinstance(pattern, Node) and pattern in values)):
+            continue
+
+        values.append(pattern)
+
+    return values
+
+
+def _merge_patterns(first, second):
+    """Returns the patterns of two adjacent Match clauses as a single list,
+    or None if they cannot be merged. Relationships matched by a single
+    clause must be distinct, so clauses that both match relationships are
+    not merged.
+    """
+    values = _unique_patterns(second, first)
+    added = values[len(first):]
+
+    if any(_has_rels(p) for p in first) and any(_has_rels(p) for p in added):
+        return None
+
+    return values
+
+
+def _equality(pred):
+    """Returns (identifier, key, value) for a `n.key = value` predicate
+    with a literal or parameter value, otherwise None.
+    """
+    if (not isinstance(pred, Predicate) or str(pred.operator) != '=' or
+            pred.alias):
+        return None
+
+    subject = pred.subject
+
+    if (not isinstance(subject, Identifier) or subject.alias or
+            not isinstance(subject.identifier, str)):
+        return None
+
+    value = pred.value
+
+    if isinstance(value, Value):
+        value = value.value
+    elif isinstance(value, (str, bytes)) or value is None:
+        # Strings are inserted as is and may be expressions
+        return None
+
+    # Null never compares equal, keep the predicate as written
+    if value is None or not (isinstance(value, Param) or is_literal(value)):
+        return None
+
+    return subject.identifier, subject.value, value
+
+
+def _find_node(pattern, identifier):
+    if isinstance(pattern, Node):
+        return pattern if pattern.identifier == identifier else None
+
+    if isinstance(pattern, Rel):
+        for node in (pattern.start, pattern.end):
+            if isinstance(node, Node) and node.identifier == identifier:
+                return node
+
+    if isinstance(pattern, Path):
+        for rel in pattern.rels:
+            node = _find_node(rel, identifier)
+
+            if node is not None:
+                return node
+
+
+def _replace_node(pattern, old, new):
+    "Replaces all nodes equal to `old` in the pattern."
+    if isinstance(pattern, Node):
+        return new if pattern == old else pattern
+
+    if isinstance(pattern, Rel):
+        start, end = pattern.start, pattern.end
+
+        if isinstance(start, Node) and start == old:
+            start = new
+
+        if isinstance(end, Node) and end == old:
+            end = new
+
+        return pattern.copy(start=start, end=end)
+
+    if isinstance(pattern, Path):
+        return pattern.copy(rels=[_replace_node(r, old, new)
+                                  for r in pattern.rels])
+
+    return pattern
+
+
+def _push_property(patterns, identifier, key, value):
+    """Returns the patterns with the property added to the props map of the
+    node, or None if the node is not matched by the patterns.
+    """
+    for i, pattern in enumerate(patterns):
+        node = _find_node(pattern, identifier)
+
+        if node is None:
+            continue
+
+        props = node.props
+
+        if props is None:
+            props = {}
+        elif not isinstance(props, dict):
+            return None
+
+        if key in props:
+            current = props[key]
+
+            # A conflicting value must still be checked by the predicate
+            if type(current) is not type(value) or current != value:
+                return None
+
+            return patterns
+
+        props = dict(props)
+        props[key] = value
+
+        patterns = list(patterns)
+        patterns[i] = _replace_node(pattern, node, node.copy(props=props))
+
+        return patterns
+
+    return None
+
+
+def _push_predicates(match, where):
+    """Moves equality predicates of the Where clause into the props maps of
+    the preceding Match clause. Returns the Match and the Where, which is
+    None if all of its predicates were moved.
+    """
+    if len(where.values) != 1:
+        return match, where
+
+    pred = where.values[0]
+
+    if isinstance(pred, PredicateList):
+        if str(pred.operator).upper() != 'AND':
+            return match, where
+
+        preds = pred.preds
+    else:
+        preds = [pred]
+
+    remaining = []
+    values = match.values
+
+    for p in preds:
+        equality = _equality(p)
+        pushed = _push_property(values, *equality) if equality else None
+
+        if pushed is None:
+            remaining.append(p)
+        else:
+            values = pushed
+
+    if len(remaining) == len(preds):
+        return match, where
+
+    match = match.copy(values=values)
+
+    if not remaining:
+        return match, None
+
+    if isinstance(pred, PredicateList):
+        return match, where.copy(values=[pred.copy(preds=remaining)])
+
+    return match, where.copy(values=remaining)
@@ -0,0 +1,204 @@
+"""
+Keyset pagination, which pages through results by the last key seen
+instead of skipping rows:
+
+    MATCH (n:Person)
+    WHERE (n.id IS NOT NULL AND n.id > $last)
+    RETURN n.name, n.id
+    ORDER BY n.id
+    LIMIT $size
+
+Unlike `Skip`, the cost of a page does not grow with its offset as long as
+the key is indexed. The key must be unique, or rows sharing the key of the
+last row of a page are skipped. Rows whose key is null are never returned,
+since they cannot be compared with the last key.
+"""
+from __future__ import unicode_literals, absolute_import
+
+from .syntax import (Identifier, Limit, Match, OptionalMatch, OrderBy, Param,
+                     Predicate, PredicateList, Query, Return, Skip, Where,
+                     With)
+
+try:
+    str = unicode
+except NameError:
+    pass
+
+
+KEY_ALIAS = '_key'
+
+# Key of the row before the first page
+_FIRST = object()
+
+
+def _key(key):
+    "Returns the key as an Identifier, accepting strings such as 'n.id'."
+    if isinstance(key, Identifier):
+        return key
+
+    identifier, dot, name = key.partition('.')
+
+    if not dot:
+        raise ValueError('key must be a property such as "n.id"')
+
+    return Identifier(name, identifier=identifier)
+
+
+def _where(before, preds):
+    """Returns the clauses before the Return with the predicates added to
+    the Where clause that filters its rows, adding one if needed.
+    """
+    before = list(before)
+    prev = before[-1] if before else None
+
+    if isinstance(prev, Where):
+        # A WHERE of an OPTIONAL MATCH only filters the optional pattern
+        if len(before) > 1 and isinstance(before[-2], OptionalMatch):
+            raise ValueError('Return cannot follow an OptionalMatch')
+
+        preds = [p for v in prev.values for p in (
+            v.preds if isinstance(v, PredicateList) and
+            str(v.operator).upper() == 'AND' else [v])] + preds
+
+        before[-1] = prev.copy(values=[PredicateList(preds)])
+    elif isinstance(prev, OptionalMatch):
+        raise ValueError('Return cannot follow an OptionalMatch')
+    elif isinstance(prev, (Match, With)):
+        before.append(Where(PredicateList(preds) if len(preds) > 1
+                            else preds[0]))
+    else:
+        raise ValueError('Return must follow a Match, With or Where')
+
+    return before
+
+
+def _same(a, b):
+    return (isinstance(a, Identifier) and isinstance(b, Identifier) and
+            a.value == b.value and a.identifier == b.identifier)
+
+
+class KeysetPaginator(object):
+    """Builds the page queries of a `Match` ... `Return` query ordered by
+    `key`, a property such as `'n.id'`. Any `OrderBy`, `Skip` and `Limit`
+    following the `Return` are replaced.
+
+    `first` is the query of the first page and `next` that of the
+    following pages, which takes the key of the last row of the previous
+    page as the `last` parameter. Both take the page size as the `size`
+    parameter. If the key is not returned by the query it is added as the
+    last column, unless the Return is DISTINCT, which would then return
+    different rows, and raises `ValueError`.
+    """
+    def __init__(self, query, key, size=1000, descending=False,
+                 last_param='last', size_param='size'):
+        self.key = key = _key(key)
+        self.size = size
+        self.last_param = last_param
+        self.size_param = size_param
+
+        tokens = list(query.tokens)
+        index = None
+
+        for i, tok in enumerate(tokens):
+            if isinstance(tok, Return):
+                index = i
+
+        if index is None:
+            raise ValueError('query must have a Return clause')
+
+        ret = tokens[index]
+        before = tokens[:index]
+
+        for tok in tokens[index + 1:]:
+            if not isinstance(tok, (OrderBy, Skip, Limit)):
+                raise ValueError('query must end with its Return clause')
+
+        # Position of the key in the returned rows
+        self.column = None
+        self.added = False
+
+        # Ordering by the returned column is also valid for RETURN DISTINCT
+        order = key
+
+        for i, value in enumerate(ret.values):
+            if _same(value, key):
+                self.column = i
+
+                if value.alias:
+                    order = Identifier(value.alias)
+
+        if self.column is None:
+            if ret.distinct:
+                raise ValueError('the key must be returned by RETURN DISTINCT')
+
+            self.column = len(ret.values)
+            self.added = True
+            order = Identifier(KEY_ALIAS)
+            ret = ret.copy(values=list(ret.values) + [
+                Identifier(key.value, identifier=key.identifier,
+                           alias=KEY_ALIAS)])
+
+        if descending:
+            order = Predicate(order, 'DESC')
+
+        after = [ret, OrderBy(order), Limit(Param(size_param))]
+
+        # Null keys sort last in ascending order and cannot be paged past
+        not_null = Predicate(key, 'IS NOT NULL')
+        pred = Predicate(key, '<' if descending else '>', Param(last_param))
+
+        self.first = Query(_where(before, [not_null]) + after,
+                           delimiter=query.delimiter)
+        self.next = Query(_where(before, [not_null, pred]) + after,
+                          delimiter=query.delimiter)
+
+    def page(self, last=_FIRST):
+        """Returns the (query, params) of the page after the key `last`, or
+        of the first page if it is not given.
+        """
+        params = {self.size_param: self.size}
+
+        if last is _FIRST:
+            return self.first, params
+
+        if last is None:
+            raise ValueError('the last key cannot be null')
+
+        params[self.last_param] = last
+
+        return self.next, params
+
+    def pages(self, executor):
+        """Yields pages of rows until a page has fewer rows than the size.
+        `executor` is called with each page's query and params, such as
+        `Client.run`, and returns the rows or a result with a `rows` field.
+        """
+        last = _FIRST
+
+        while True:
+            result = executor(*self.page(last))
+            rows = list(getattr(result, 'rows', result))
+
+            if not rows:
+                return
+
+            last = rows[-1][self.column]
+
+            if self.added:
+                rows = [row[:self.column] for row in rows]
+
+            yield rows
+
+            if len(rows) < self.size:
+                return
+
+    def rows(self, executor):
+        "Yields the rows of all pages."
+        for rows in self.pages(executor):
+            for row in rows:
+                yield row
+
+
+def paginate(query, key, executor, size=1000, descending=False):
+    "Yields all rows of the query, fetched in pages ordered by `key`."
+    return KeysetPaginator(query, key, size, descending).rows(executor)
@@ -0,0 +1,155 @@
+"""
+Parses the execution plans returned for `Query.explain()` and
+`Query.profile()` into a tree of operators:
+
+    data = client.request({'statements': [statement(query.profile())]})
+    plan = parse_plan(data)
+
+    assert not cartesian_products(plan)
+    assert plan.total_db_hits < 1000
+
+Both the plan format of the HTTP endpoint, where statistics are members of
+the operator, and the driver format, where they are in `args`, are
+supported.
+"""
+from __future__ import unicode_literals, absolute_import
+
+try:
+    str = unicode
+except NameError:
+    pass
+
+
+# Operators that read every node, or every node with a label
+SCAN_OPERATORS = ('AllNodesScan', 'NodeByLabelScan')
+
+CARTESIAN_OPERATORS = ('CartesianProduct',)
+
+# Operators that materialize all rows before passing them on
+EAGER_OPERATORS = ('Eager',)
+
+
+class Operator(object):
+    "An operator of an execution plan."
+    __slots__ = ('type', 'db_hits', 'rows', 'estimated_rows', 'identifiers',
+                 'args', 'children')
+
+    def __init__(self, type, db_hits=None, rows=None, estimated_rows=None,
+                 identifiers=None, args=None, children=None):
+        self.type = type
+        self.db_hits = db_hits
+        self.rows = rows
+        self.estimated_rows = estimated_rows
+        self.identifiers = identifiers or []
+        self.args = args or {}
+        self.children = children or []
+
+    def walk(self):
+        "Yields the operator and all operators below it, depth first."
+        stack = [self]
+
+        while stack:
+            op = stack.pop()
+            yield op
+            stack.extend(reversed(op.children))
+
+    def find(self, *types):
+        "Returns the operators of the given types."
+        return [op for op in self.walk() if op.type in types]
+
+    @property
+    def total_db_hits(self):
+        "Sum of the db hits of all operators, which requires a profile."
+        return sum(op.db_hits or 0 for op in self.walk())
+
+    def __repr__(self):
+        return '<Operator {} rows={} estimated_rows={} db_hits={}>'.format(
+            self.type, self.rows, self.estimated_rows, self.db_hits)
+
+
+def _stat(op, args, *names):
+    for name in names:
+        for source in (op, args):
+            if name in source:
+                return source[name]
+
+
+def parse_operator(data):
+    "Returns the tree of operators for a plan operator."
+    args = data.get('args') or {}
+
+    # Neo4j 4 and later suffix operator names with the runtime, e.g. @neo4j
+    op_type = (data.get('operatorType') or '').split('@', 1)[0]
+
+    estimated = _stat(data, args, 'EstimatedRows', 'estimatedRows')
+
+    return Operator(
+        op_type,
+        db_hits=_stat(data, args, 'DbHits', 'dbHits'),
+        rows=_stat(data, args, 'Rows', 'rows'),
+        estimated_rows=float(estimated) if estimated is not None else None,
+        identifiers=list(data.get('identifiers') or ()),
+        args=args,
+        children=[parse_operator(c) for c in data.get('children') or ()])
+
+
+def parse_plan(data, index=0):
+    """Returns the root operator of a plan. `data` may be a decoded response
+    of the transactional endpoint, in which case the plan of the result at
+    `index` is used, a single result, a plan, or an operator.
+    """
+    if 'results' in data:
+        results = data['results']
+
+        if index >= len(results):
+            raise ValueError('response has no result at index {}'
+                             .format(index))
+
+        data = results[index]
+
+    for key in ('profile', 'plan'):
+        if data.get(key):
+            data = data[key]
+            break
+
+    if 'root' in data:
+        data = data['root']
+
+    if 'operatorType' not in data:
+        raise ValueError('data does not contain an execution plan')
+
+    return parse_operator(data)
+
+
+def label_scans(plan):
+    "Returns operators that scan all nodes or all nodes with a label."
+    return plan.find(*SCAN_OPERATORS)
+
+
+def cartesian_products(plan):
+    "Returns operators that compute the Cartesian product of their inputs."
+    return plan.find(*CARTESIAN_OPERATORS)
+
+
+def eager_operators(plan):
+    "Returns operators that materialize all rows of their input."
+    return plan.find(*EAGER_OPERATORS)
+
+
+def misestimates(plan, ratio=10):
+    """Returns profiled operators whose actual rows differ from the
+    estimate by more than `ratio` times in either direction.
+    """
+    ops = []
+
+    for op in plan.walk():
+        if op.rows is None or op.estimated_rows is None:
+            continue
+
+        actual = max(op.rows, 1)
+        estimated = max(op.estimated_rows, 1)
+
+        if actual > estimated * ratio or estimated > actual * ratio:
+            ops.append(op)
+
+    return ops
@@ -0,0 +1,452 @@
+"""
+Streaming decoder for responses of the HTTP transactional endpoint.
+
+The response is parsed incrementally as data arrives and rows are yielded
+as soon as they are complete, so memory is bounded by the size of a row
+and the read size rather than the size of the result. Nodes, relationships
+and paths are decoded into `Node`, `Rel` and `Path` subclasses that can be
+used directly in new statements. Labels, types and property keys are
+interned in a table shared by all rows.
+
+Entities are decoded from the `row` and `graph` result data contents,
+which `Client.stream` and `Session.stream` request. With `row` alone,
+labels and relationship types are not available.
+"""
+from __future__ import unicode_literals, absolute_import
+
+import codecs
+import json
+
+from .client import ClientError, CypherError
+from .syntax import Node, Rel, Path
+
+try:
+    str = unicode
+except NameError:
+    pass
+
+try:
+    from sys import intern
+except ImportError:
+    pass
+
+
+RESULT_DATA_CONTENTS = ['row', 'graph']
+
+
+class ResultNode(Node):
+    "A node returned by the server."
+    __slots__ = ('id',)
+
+    def __init__(self, id, props=None, labels=None):
+        super(ResultNode, self).__init__(props, labels=labels)
+        self.id = id
+
+
+class ResultRel(Rel):
+    "A relationship returned by the server."
+    __slots__ = ('id',)
+
+    def __init__(self, id, start=None, type=None, end=None, props=None):
+        super(ResultRel, self).__init__(start, type, end, props=props)
+        self.id = id
+
+
+class Row(object):
+    "A result row whose values can be accessed by index or column name."
+    __slots__ = ('columns', 'values')
+
+    def __init__(self, columns, values):
+        self.columns = columns
+        self.values = values
+
+    def __getitem__(self, key):
+        if isinstance(key, (str, bytes)):
+            try:
+                key = self.columns.index(key)
+            except ValueError:
+                raise KeyError(key)
+
+        return self.values[key]
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __eq__(self, other):
+        if isinstance(other, Row):
+            return (self.columns, self.values) == (other.columns,
+                                                   other.values)
+        return list(self.values) == other
+
+    def __ne__(self, other):
+        return not (self == other)
+
+    def __repr__(self):
+        return 'Row({!r})'.format(dict(zip(self.columns, self.values)))
+
+
+class Interner(object):
+    "Shared table of labels, types, column lists and property keys."
+    def __init__(self):
+        self._values = {}
+
+    def key(self, value):
+        try:
+            return self._values[value]
+        except KeyError:
+            value = self._values[value] = intern(value)
+            return value
+
+    def tuple(self, values):
+        key = tuple(values)
+
+        try:
+            return self._values[key]
+        except KeyError:
+            value = self._values[key] = tuple(self.key(v) for v in key)
+            return value
+
+    def props(self, props):
+        if not props:
+            return props
+
+        key = self.key
+        return dict((key(k), v) for k, v in props.items())
+
+
+def _id(value):
+    "Returns an entity id, which the graph contents encode as a string."
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return value
+
+
+class RowDecoder(object):
+    """Decodes the `row`, `meta` and `graph` contents of a response row."""
+    def __init__(self, interner=None):
+        self.interner = interner or Interner()
+
+    def decode(self, columns, data):
+        graph = data.get('graph')
+
+        if graph:
+            nodes = dict((n['id'], n) for n in graph.get('nodes', ()))
+            rels = dict((r['id'], r) for r in graph.get('relationships', ()))
+        else:
+            nodes = rels = {}
+
+        values = data.get('row', ())
+        meta = data.get('meta') or [None] * len(values)
+        cache = {}
+
+        return Row(columns, [
+            self._value(value, m, nodes, rels, cache)
+            for value, m in zip(values, meta)
+        ])
+
+    def _node(self, id, props, nodes, cache):
+        id = _id(id)
+        key = ('node', id)
+
+        if key not in cache:
+            info = nodes.get(str(id)) or nodes.get(id) or {}
+
+            if props is None:
+                props = info.get('properties')
+
+            cache[key] = ResultNode(id, self.interner.props(props),
+                                    self.interner.tuple(info.get('labels',
+                                                                 ())))
+
+        return cache[key]
+
+    def _rel(self, id, props, nodes, rels, cache):
+        id = _id(id)
+        key = ('rel', id)
+
+        if key not in cache:
+            info = rels.get(str(id)) or rels.get(id) or {}
+            rel_type = info.get('type')
+
+            start = end = None
+
+            if 'startNode' in info:
+                start = self._node(info['startNode'], None, nodes, cache)
+                end = self._node(info['endNode'], None, nodes, cache)
+
+            if props is None:
+                props = info.get('properties')
+
+            cache[key] = ResultRel(
+                id, start, rel_type and self.interner.key(rel_type), end,
+                self.interner.props(props))
+
+        return cache[key]
+
+    def _path(self, values, meta, nodes, rels, cache):
+        path_nodes = [self._node(m['id'], v, nodes, cache)
+                      for v, m in zip(values[::2], meta[::2])]
+
+        hops = []
+
+        for i, (v, m) in enumerate(zip(values[1::2], meta[1::2])):
+            rel = self._rel(m['id'], v, nodes, rels, cache)
+            start, end = path_nodes[i], path_nodes[i + 1]
+
+            # The path may traverse the relationship against its direction
+            reverse = rel.start is not None and rel.start.id != start.id
+
+            hops.append(ResultRel(rel.id, start, rel.type, end,
+                                  rel.props))
+            hops[-1].reverse = reverse
+
+        return Path(hops)
+
+    def _value(self, value, meta, nodes, rels, cache):
+        if isinstance(meta, dict):
+            kind = meta.get('type')
+
+            if kind == 'node':
+                return self._node(meta['id'], value, nodes, cache)
+
+            if kind == 'relationship':
+                return self._rel(meta['id'], value, nodes, rels, cache)
+
+            return value
+
+        if isinstance(meta, list) and isinstance(value, list):
+            kinds = [m.get('type') if isinstance(m, dict) else None
+                     for m in meta]
+
+            if (len(kinds) > 1 and len(kinds) % 2 and
+                    all(k == 'node' for k in kinds[::2]) and
+                    all(k == 'relationship' for k in kinds[1::2])):
+                return self._path(value, meta, nodes, rels, cache)
+
+            return [self._value(v, m, nodes, rels, cache)
+                    for v, m in zip(value, meta)]
+
+        return value
+
+
+_WHITESPACE = ' \t\n\r'
+
+
+class ResponseDecoder(object):
+    """Incremental parser for a transactional endpoint response.
+
+    Data is passed to `feed` as it is received and the rows that were
+    completed are returned. `close` must be called at the end of the
+    response and raises `CypherError` if the server reported an error.
+    """
+    def __init__(self, interner=None):
+        self.rows = RowDecoder(interner)
+        self.errors = []
+        self.columns = ()
+
+        self._text = codecs.getincrementaldecoder('utf8')()
+        self._json = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._state = 'start'
+        self._key = None
+        self._final = False
+
+    def feed(self, data, final=False):
+        "Adds data to the buffer and returns the rows completed by it."
+        if isinstance(data, bytes):
+            data = self._text.decode(data, final)
+
+        self._buf = self._buf[self._pos:] + data
+        self._pos = 0
+        self._final = final
+
+        rows = []
+
+        while self._step(rows):
+            pass
+
+        return rows
+
+    def close(self):
+        "Ends the response, raising any error reported by the server."
+        if self._state != 'done':
+            raise ClientError('incomplete response')
+
+        if self.errors:
+            error = self.errors[0]
+            raise CypherError(error.get('code'), error.get('message'))
+
+    def _skip(self, commas=True):
+        "Skips whitespace and returns the next character, if any."
+        buf = self._buf
+        pos = self._pos
+        size = len(buf)
+
+        while pos < size and (buf[pos] in _WHITESPACE or
+                              (commas and buf[pos] == ',')):
+            pos += 1
+
+        self._pos = pos
+
+        return buf[pos] if pos < size else None
+
+    def _value(self):
+        """Decodes the next value. Returns a (found, value) tuple, `found`
+        being false if more data is needed.
+        """
+        if self._skip() is None:
+            return False, None
+
+        try:
+            value, end = self._json.raw_decode(self._buf, self._pos)
+        except ValueError:
+            if self._final:
+                raise ClientError('invalid JSON response')
+            return False, None
+
+        # A number at the end of the buffer may be incomplete
+        if end == len(self._buf) and not self._final and (
+                isinstance(value, (int, float)) and
+                not isinstance(value, bool)):
+            return False, None
+
+        self._pos = end
+
+        return True, value
+
+    def _member(self):
+        "Decodes the next key of an object and the following colon."
+        start = self._pos
+        found, key = self._value()
+
+        if not found:
+            return False
+
+        if self._skip(commas=False) != ':':
+            if self._pos < len(self._buf):
+                raise ClientError('invalid JSON response')
+
+            self._pos = start
+            return False
+
+        self._pos += 1
+        self._key = key
+
+        return True
+
+    def _expect(self, char, state):
+        "Consumes the character and changes to the state."
+        found = self._skip()
+
+        if found is None:
+            return False
+
+        if found != char:
+            raise ClientError('invalid JSON response')
+
+        self._pos += 1
+        self._state = state
+
+        return True
+
+    def _step(self, rows):
+        state = self._state
+
+        if state == 'done':
+            return False
+
+        if state == 'start':
+            return self._expect('{', 'top')
+
+        if state in ('top', 'result'):
+            char = self._skip()
+
+            if char is None:
+                return False
+
+            if char == '}':
+                self._pos += 1
+                self._state = 'done' if state == 'top' else 'results'
+                return True
+
+            if not self._member():
+                return False
+
+            if state == 'top' and self._key == 'results':
+                self._state = 'results-start'
+            elif state == 'result' and self._key == 'data':
+                self._state = 'data-start'
+            else:
+                self._state = state + '-value'
+
+            return True
+
+        if state in ('top-value', 'result-value'):
+            found, value = self._value()
+
+            if not found:
+                return False
+
+            if state == 'top-value' and self._key == 'errors':
+                self.errors.extend(value)
+            elif state == 'result-value' and self._key == 'columns':
+                self.columns = self.rows.interner.tuple(value)
+
+            self._state = state[:-len('-value')]
+
+            return True
+
+        if state == 'results-start':
+            return self._expect('[', 'results')
+
+        if state == 'data-start':
+            return self._expect('[', 'data')
+
+        if state in ('results', 'data'):
+            char = self._skip()
+
+            if char is None:
+                return False
+
+            if char == ']':
+                self._pos += 1
+                self._state = 'top' if state == 'results' else 'result'
+                return True
+
+            if state == 'results':
+                return self._expect('{', 'result')
+
+            found, value = self._value()
+
+            if not found:
+                return False
+
+            rows.append(self.rows.decode(self.columns, value))
+
+            return True
+
+        raise ClientError('invalid decoder state')
+
+
+def iter_rows(fp, chunk_size=65536, interner=None):
+    """Yields the rows of a response read incrementally from the file-like
+    object `fp`, raising `CypherError` at the end if the server reported
+    an error.
+    """
+    decoder = ResponseDecoder(interner)
+
+    while True:
+        data = fp.read(chunk_size)
+
+        for row in decoder.feed(data, final=not data):
+            yield row
+
+        if not data:
+            break
+
+    decoder.close()
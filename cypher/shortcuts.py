@@ -11,8 +11,7 @@ def exists(value):
         raise TypeError('value must support an identifier')
 
     if not value.identifier:
-        value = value.__class__(**value.__dict__)
-        value.identifier = 'v'
+        value = value.copy(identifier='v')
 
     ident = Identifier(value.identifier)
 
@@ -32,8 +31,7 @@ def get(value):
         raise TypeError('value must support an identifier')
 
     if not value.identifier:
-        value = value.__class__(**value.__dict__)
-        value.identifier = 'v'
+        value = value.copy(identifier='v')
 
     ident = Identifier(value.identifier)
 
@@ -1,6 +1,7 @@
 from __future__ import unicode_literals, absolute_import
 
 import re
+from collections import OrderedDict
 
 try:
     str = unicode
@@ -9,36 +10,91 @@ except NameError:
 
 from . import constants, utils
 from .token import Token
+from .template import Template
+
+
+def is_literal(value):
+    "Returns true if the value does not contain any tokens."
+    if isinstance(value, Token):
+        return False
+
+    if isinstance(value, dict):
+        return all(is_literal(v) for v in value.values())
+
+    if isinstance(value, (list, tuple)):
+        return all(is_literal(v) for v in value)
+
+    return True
+
+
+def _literal(value):
+    """Returns what a `Value` token renders for a value, so literals can be
+    rendered without creating one: the text of a string, boolean or null, a
+    token for a map or list, or the value itself, which is converted with
+    `str`. Not valid in parameterized mode, where literals are collected.
+    """
+    if isinstance(value, (str, bytes)):
+        return utils.quote_string(value)
+
+    if value is True:
+        return constants.TRUE
+
+    if value is False:
+        return constants.FALSE
+
+    if value is None:
+        return constants.NULL
+
+    if isinstance(value, dict):
+        return Map(value)
+
+    if isinstance(value, (list, tuple)):
+        return Collection(value)
+
+    return value
 
 
 class Value(Token):
+    __slots__ = ()
+
     def __init__(self, value):
         self.value = value
 
     def tokenize(self):
+        return [_literal(self.value)]
+
+    def tokenize_params(self, params):
         value = self.value
 
-        if value is True:
-            value = constants.TRUE
-        elif value is False:
-            value = constants.FALSE
-        elif value is None:
-            value = constants.NULL
-        elif isinstance(value, dict):
-            value = Map(value)
-        elif isinstance(value, (list, tuple)):
-            value = Collection(value)
-        elif isinstance(value, bytes):
-            value = repr(value.decode()).lstrip('u')
-        elif isinstance(value, str):
-            value = repr(value).lstrip('u')
+        # NULL is kept inline since it is commonly used in predicates
+        if value is None or not is_literal(value):
+            return self.tokenize()
+
+        if isinstance(value, bytes):
+            value = value.decode('utf8')
+
+        return [params.add(value)]
+
 
-        return [value]
+class Param(Token):
+    "Represents a named parameter that is bound when the query is executed."
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def tokenize(self):
+        return ['$', self.name]
+
+    def tokenize_params(self, params):
+        return [params.slot(self.name)]
 
 
 class Identifier(Token):
     "Represents an identifier or property identifier with an optional alias."
-    valid_ident = re.compile(r'^[_a-z][_a-z0-0]*$', re.I)
+    __slots__ = ('identifier', 'alias')
+    # \Z since $ also matches before a trailing newline
+    valid_ident = re.compile(r'^[_a-z][_a-z0-9]*\Z', re.I)
 
     def __init__(self, value, identifier=None, alias=None):
         if isinstance(value, Identifier):
@@ -53,24 +109,86 @@ class Identifier(Token):
         self.alias = alias
 
     def tokenize(self):
+        value = self.value
+        parent = self.identifier or None
+        alias = self.alias or None
+
+        if (isinstance(value, str) and
+                (parent is None or isinstance(parent, str)) and
+                (alias is None or isinstance(alias, str))):
+            return [identifier_text(value, parent, alias)]
+
         toks = []
 
-        if self.identifier:
-            toks.extend([Identifier(self.identifier), '.'])
+        if parent:
+            toks.extend([Identifier(parent), '.'])
 
-        # valid characters, no need to wrap in backticks
-        if self.valid_ident.match(self.value):
-            toks.append(self.value)
-        else:
-            toks.append('`{}`'.format(self.value))
+        toks.append(_quote(value))
 
-        if self.alias:
-            toks.extend([' AS ', Identifier(self.alias)])
+        if alias:
+            toks.extend([' AS ', Identifier(alias)])
 
         return toks
 
 
+def _quote(name):
+    # valid characters, no need to wrap in backticks
+    if Identifier.valid_ident.match(name):
+        return name
+
+    # Backticks are escaped by doubling them
+    return '`{}`'.format(name.replace('`', '``'))
+
+
+# Rendered text of identifiers keyed by (name, parent, alias), least
+# recently used first
+_identifiers = OrderedDict()
+
+IDENTIFIER_CACHE_SIZE = 4096
+
+
+def identifier_text(name, parent=None, alias=None):
+    """Returns the rendered text of an identifier given as strings, such as
+    `n.name` or `n.name AS name`. The text is kept in a bounded LRU cache
+    so common identifiers are quoted once.
+    """
+    key = (name, parent, alias)
+
+    try:
+        text = _identifiers.pop(key)
+    except KeyError:
+        text = _quote(name)
+
+        if parent:
+            text = '{}.{}'.format(_quote(parent), text)
+
+        if alias:
+            text = '{} AS {}'.format(text, _quote(alias))
+
+        if len(_identifiers) >= IDENTIFIER_CACHE_SIZE:
+            try:
+                _identifiers.popitem(last=False)
+            except KeyError:
+                pass
+
+    _identifiers[key] = text
+
+    return text
+
+
+def _identifier(value, parent=None):
+    """Returns the rendered text of an identifier without creating a token,
+    or an `Identifier` if the value is not a plain name.
+    """
+    if isinstance(value, str) and (not parent or isinstance(parent, str)):
+        return identifier_text(value, parent or None)
+
+    return Identifier(value, identifier=parent)
+
+
 class Function(Token):
+    __slots__ = ('function', 'arguments', 'alias')
+
     def __init__(self, function, arguments=None, alias=None):
         if not arguments:
             arguments = []
@@ -87,22 +205,26 @@ class Function(Token):
         toks.append(')')
 
         if self.alias:
-            toks.extend([' ', constants.AS, ' ', Identifier(self.alias)])
+            toks.extend([' ', constants.AS, ' ', _identifier(self.alias)])
 
         return toks
 
 
 class MapPair(Token):
     "Represents a key/value pair in a map."
+    __slots__ = ('key',)
+
     def __init__(self, key, value):
         self.key = key
         self.value = value
 
     def tokenize(self):
-        return [Identifier(self.key), ': ', Value(self.value)]
+        return [_identifier(self.key), ': ', Value(self.value)]
 
 
 class Map(Token):
+    __slots__ = ('props', 'identifier')
+
     def __init__(self, props, identifier=None):
         if identifier is None and hasattr(props, 'identifier'):
             identifier = props.identifier
@@ -114,23 +236,62 @@ class Map(Token):
         self.identifier = identifier
 
     def tokenize(self):
+        if isinstance(self.props, Param):
+            return self._tokenize(None)
+
         toks = []
 
         if self.identifier:
-            toks.extend([Identifier(self.identifier), ' = '])
+            toks.extend([_identifier(self.identifier), ' = '])
 
         toks.append('{')
 
-        toks.extend(utils.delimit([
-            MapPair(k, v) for k, v in self.props.items()
-        ]))
+        # Pairs are rendered inline rather than as MapPair tokens
+        for key, value in self.props.items():
+            toks.extend([_identifier(key), ': ', _literal(value), ', '])
+
+        if self.props:
+            toks.pop()
 
         toks.append('}')
 
         return toks
 
+    def tokenize_params(self, params):
+        if isinstance(self.props, Param):
+            return self._tokenize(None)
+
+        # A whole map parameter is only valid in an assignment, e.g. SET
+        if self.identifier and is_literal(self.props):
+            return [_identifier(self.identifier), ' = ',
+                    params.add(dict(self.props))]
+
+        if params.ordered:
+            return self._tokenize(utils.sorted_items(self.props))
+
+        return self._tokenize(self.props.items())
+
+    def _tokenize(self, items):
+        toks = []
+
+        if self.identifier:
+            toks.extend([_identifier(self.identifier), ' = '])
+
+        # The whole map is bound as a single parameter
+        if items is None:
+            toks.append(self.props)
+            return toks
+
+        toks.append('{')
+        toks.extend(utils.delimit([MapPair(k, v) for k, v in items]))
+        toks.append('}')
+
+        return toks
+
 
 class ValueList(Token):
+    __slots__ = ('values', 'delimiter')
+
     def __init__(self, values, delimiter=', '):
         if not isinstance(values, (list, tuple)):
             values = [values]
@@ -154,22 +315,50 @@ class ValueList(Token):
 
 
 class Collection(Token):
+    __slots__ = ('values', 'identifier')
+
     def __init__(self, values, identifier=None):
         self.values = values
         self.identifier = identifier
 
+    def _prefix(self):
+        if self.identifier:
+            return [_identifier(self.identifier), ' = ']
+
+        return []
+
     def tokenize(self):
-        toks = []
+        toks = self._prefix()
+        toks.append('[')
 
-        if self.identifier:
-            toks.extend([Identifier(self.identifier), ' = '])
+        # Values are rendered inline rather than as Value tokens
+        for value in self.values:
+            toks.append(value if isinstance(value, Token) else
+                        _literal(value))
+            toks.append(', ')
+
+        if self.values:
+            toks.pop()
+
+        toks.append(']')
+
+        return toks
+
+    def tokenize_params(self, params):
+        if not is_literal(self.values):
+            toks = self._prefix()
+            toks.extend(['[', ValueList(self.values), ']'])
+            return toks
 
-        toks.extend(['[', ValueList(self.values), ']'])
+        toks = self._prefix()
+        toks.append(params.add(list(self.values)))
 
         return toks
 
 
 class Node(Token):
+    __slots__ = ('props', 'identifier', 'labels')
+
     def __init__(self, props=None, identifier=None, labels=None):
         self.props = props
         self.identifier = identifier
@@ -180,7 +369,7 @@ class Node(Token):
         space = False
 
         if self.identifier:
-            toks.append(Identifier(self.identifier))
+            toks.append(_identifier(self.identifier))
             space = True
 
         if self.labels:
@@ -200,6 +389,9 @@ class Node(Token):
 
 
 class Rel(Token):
+    __slots__ = ('start', 'type', 'end', 'identifier', 'props', 'reverse',
+                 'directed')
+
     def __init__(self, start=None, type=None, end=None, identifier=None,
                  props=None, reverse=False, directed=True):
         self.start = start
@@ -211,26 +403,26 @@ class Rel(Token):
         self.directed = directed
 
     def tokenize(self):
-        toks = []
+        toks = [self._endpoint(self.start, 'start')]
+        toks.extend(self._connector())
+        toks.append(self._endpoint(self.end, 'end'))
 
-        start = self.start
-        end = self.end
+        return toks
 
-        if not isinstance(start, Token):
-            start = Node(identifier=start)
-        # Ensure this is an identifier or node
-        elif not isinstance(self.start, (Identifier, Node)):
-            raise ValueError('relationship start node must be an '
-                             'identifier or node')
+    def _endpoint(self, node, name):
+        if not isinstance(node, Token):
+            return Node(identifier=node)
 
-        if not isinstance(end, Token):
-            end = Node(identifier=end)
         # Ensure this is an identifier or node
-        elif not isinstance(self.end, (Identifier, Node)):
-            raise ValueError('relationship end node must be an '
-                             'identifier or node')
+        if not isinstance(node, (Identifier, Node)):
+            raise ValueError('relationship {} node must be an '
+                             'identifier or node'.format(name))
+
+        return node
 
-        toks.append(start)
+    def _connector(self):
+        "Returns the tokens between the start and end nodes."
+        toks = []
 
         if self.directed and self.reverse is True:
             toks.append('<-')
@@ -244,19 +436,19 @@ class Rel(Token):
 
             if self.identifier:
                 space = True
-                toks.append(Identifier(self.identifier))
+                toks.append(_identifier(self.identifier))
 
             if self.type:
                 space = True
 
                 if isinstance(self.type, (list, tuple)):
                     toks.append(':')
-                    types = [Identifier(t) for t in self.type]
+                    types = [_identifier(t) for t in self.type]
                     toks.extend(utils.delimit(types, delimiter='|'))
                 elif self.type.startswith('*'):
                     toks.append(self.type)
                 else:
-                    toks.extend([':', Identifier(self.type)])
+                    toks.extend([':', _identifier(self.type)])
 
             if self.props:
                 if space:
@@ -271,58 +463,194 @@ class Rel(Token):
         else:
             toks.append('-')
 
-        toks.append(end)
-
         return toks
 
 
+def _node_identifier(node):
+    "Returns the identifier of a relationship start or end node."
+    if isinstance(node, Node):
+        return node.identifier
+
+    if isinstance(node, Identifier):
+        return node.value
+
+    return node
+
+
+def _reference(node):
+    """Returns the identifier of a node that only refers to another by its
+    identifier, otherwise None.
+    """
+    if isinstance(node, Node):
+        return None if node.labels or node.props else node.identifier
+
+    if isinstance(node, Identifier):
+        return None if node.identifier or node.alias else node.value
+
+    if isinstance(node, Token):
+        return None
+
+    return node
+
+
+def _continues(end, start):
+    """Returns true if a relationship starting at `start` continues a path
+    ending at `end`. Only the end node is rendered, so the start must be
+    the same node, an equal one or a reference to its identifier, such as
+    a string or a node without labels or properties.
+    """
+    if start is end or start == end:
+        return True
+
+    ref = _reference(start)
+
+    return bool(ref) and ref == _node_identifier(end)
+
+
 class Path(Token):
     """
     node, rel, node, rel, node...
     ()-->()<-[]-()
+
+    Each relationship must start at the end node of the previous one,
+    which is checked when the path is built. Relationships without a start
+    node are attached to the end of the path. The first element may be a
+    `Node`, which starts the path, so a path can consist of a single node.
     """
+    __slots__ = ('rels', 'identifier')
+
     def __init__(self, rels, identifier=None):
         if not isinstance(rels, (list, tuple)):
             rels = [rels]
 
-        self.rels = rels
+        self.rels = []
         self.identifier = identifier
 
+        self._extend(rels)
+
+    def _extend(self, rels):
+        if self.frozen:
+            raise AttributeError('cannot extend a frozen path')
+
+        chain = self.rels
+
+        for rel in rels:
+            if not isinstance(rel, Rel):
+                if chain or not isinstance(rel, Node):
+                    raise TypeError('path elements must be relationships, '
+                                    'optionally preceded by a node, got '
+                                    '{!r}'.format(rel))
+
+                chain.append(rel)
+                continue
+
+            if chain:
+                last = chain[-1]
+                end = last.end if isinstance(last, Rel) else last
+
+                if rel.start is None:
+                    rel = rel.copy(start=end)
+                elif not _continues(end, rel.start):
+                    raise ValueError('start is not the end')
+
+                # A starting node is replaced by the first relationship
+                if not isinstance(last, Rel):
+                    chain.pop()
+                    rel = rel.copy(start=last)
+
+            chain.append(rel)
+
+    def append(self, rel):
+        "Adds a relationship to the end of the path and returns the path."
+        self._extend([rel])
+
+        return self
+
+    def extend(self, rels):
+        "Adds relationships to the end of the path and returns the path."
+        self._extend(rels)
+
+        return self
+
+    @property
+    def nodes(self):
+        "Returns the nodes of the path in order."
+        if not self.rels:
+            return []
+
+        if not isinstance(self.rels[0], Rel):
+            return [self.rels[0]]
+
+        return [self.rels[0].start] + [rel.end for rel in self.rels]
+
+    def elements(self):
+        "Yields the nodes and relationships of the path in order."
+        if self.rels and not isinstance(self.rels[0], Rel):
+            yield self.rels[0]
+            return
+
+        for i, rel in enumerate(self.rels):
+            if not i:
+                yield rel.start
+
+            yield rel
+            yield rel.end
+
     def tokenize(self):
         toks = []
 
         if self.identifier:
-            toks.extend([Identifier(self.identifier), ' = '])
+            toks.extend([_identifier(self.identifier), ' = '])
 
-        end = None
+        rels = self.rels
 
-        for rel in self.rels:
-            rtoks = rel.tokenize()
+        if not rels:
+            return toks
 
-            if end is not None:
-                start = rtoks.pop(0)
+        if not isinstance(rels[0], Rel):
+            toks.append(rels[0])
+            return toks
 
-                if start != end:
-                    raise ValueError('start is not the end')
+        # The end node of each relationship is the start of the next one
+        toks.append(rels[0]._endpoint(rels[0].start, 'start'))
 
-            toks.extend(rtoks)
-            end = rtoks[-1]
+        for rel in rels:
+            toks.extend(rel._connector())
+            toks.append(rel._endpoint(rel.end, 'end'))
 
         return toks
 
 
 class Property(Token):
+    __slots__ = ('key', 'identifier')
+
     def __init__(self, key, value, identifier=None):
         self.key = key
         self.value = value
         self.identifier = identifier
 
     def tokenize(self):
-        return [Identifier(self.key, identifier=self.identifier), ' = ',
+        return [_identifier(self.key, self.identifier), ' = ',
+                Value(self.value)]
+
+
+class Assignment(Token):
+    "Represents an assignment to an identifier such as `n += {a: 1}`."
+    __slots__ = ('identifier', 'operator')
+
+    def __init__(self, identifier, value, operator='='):
+        self.identifier = identifier
+        self.value = value
+        self.operator = operator
+
+    def tokenize(self):
+        return [_identifier(self.identifier), ' ', self.operator, ' ',
                 Value(self.value)]
 
 
 class PropertyList(Token):
+    __slots__ = ('props', 'identifier')
+
     def __init__(self, props, identifier=None):
         if identifier is None and hasattr(props, 'identifier'):
             identifier = props.identifier
@@ -338,8 +666,19 @@ class PropertyList(Token):
             Property(k, v, self.identifier) for k, v in self.props.items()
         ])
 
+    def tokenize_params(self, params):
+        if not params.ordered:
+            return self.tokenize()
+
+        return utils.delimit([
+            Property(k, v, self.identifier)
+            for k, v in utils.sorted_items(self.props)
+        ])
+
 
 class Predicate(Token):
+    __slots__ = ('subject', 'operator', 'alias')
+
     def __init__(self, subject, operator=None, value=None, alias=None):
         self.subject = subject
         self.operator = operator
@@ -347,7 +686,9 @@ class Predicate(Token):
         self.alias = alias
 
     def tokenize(self):
-        if hasattr(self.subject, 'identifier'):
+        if isinstance(self.subject, Identifier):
+            subject = self.subject
+        elif hasattr(self.subject, 'identifier'):
             subject = Identifier(self.subject.identifier)
         else:
             subject = Value(self.subject)
@@ -361,12 +702,14 @@ class Predicate(Token):
             toks.extend([' ', self.value])
 
         if self.alias:
-            toks.extend([' AS ', Identifier(self.alias)])
+            toks.extend([' AS ', _identifier(self.alias)])
 
         return toks
 
 
 class PredicateList(Token):
+    __slots__ = ('preds', 'operator')
+
     def __init__(self, preds, operator='AND'):
         self.preds = preds
         self.operator = operator
@@ -392,6 +735,7 @@ class PredicateList(Token):
 
 
 class Statement(Token):
+    __slots__ = ()
     keyword = ''
 
     def tokenize(self):
@@ -401,22 +745,27 @@ class Statement(Token):
 
 
 class Start(Statement, ValueList):
+    __slots__ = ()
     keyword = 'START'
 
 
 class Where(Statement, ValueList):
+    __slots__ = ()
     keyword = 'WHERE'
 
 
 class Match(Statement, ValueList):
+    __slots__ = ()
     keyword = 'MATCH'
 
 
 class OptionalMatch(Match):
+    __slots__ = ()
     keyword = 'OPTIONAL MATCH'
 
 
 class Create(Statement, ValueList):
+    __slots__ = ('unique',)
     keyword = 'CREATE'
 
     def __init__(self, values, unique=False):
@@ -435,11 +784,14 @@ class Create(Statement, ValueList):
 
 
 class CreateUnique(Create):
+    __slots__ = ()
+
     def __init__(self, values):
         super(CreateUnique, self).__init__(values, unique=True)
 
 
 class CreateIndex(Statement):
+    __slots__ = ('label', 'prop')
     keyword = 'CREATE INDEX'
 
     def __init__(self, label, prop):
@@ -452,10 +804,12 @@ class CreateIndex(Statement):
 
 
 class DropIndex(CreateIndex):
+    __slots__ = ()
     keyword = 'DROP INDEX'
 
 
 class CreateConstraint(Statement):
+    __slots__ = ('label', 'prop')
     keyword = 'CREATE CONSTRAINT'
 
     def __init__(self, label, prop):
@@ -470,38 +824,50 @@ class CreateConstraint(Statement):
 
 
 class DropConstraint(CreateConstraint):
+    __slots__ = ()
     keyword = 'DROP CONSTRAINT'
 
 
 class Delete(Statement, ValueList):
+    __slots__ = ()
     keyword = 'DELETE'
 
 
 class Skip(Statement):
+    __slots__ = ()
     keyword = 'SKIP'
 
     def __init__(self, value):
-        if not isinstance(value, int):
-            raise TypeError('SKIP value must be an integer')
+        if not isinstance(value, (int, Param)):
+            raise TypeError('SKIP value must be an integer or parameter')
 
         self.value = value
 
+    def tokenize(self):
+        return [self.keyword, ' ', Value(self.value)]
+
 
 class Limit(Statement):
+    __slots__ = ()
     keyword = 'LIMIT'
 
     def __init__(self, value):
-        if not isinstance(value, int):
-            raise TypeError('LIMIT value must be an integer')
+        if not isinstance(value, (int, Param)):
+            raise TypeError('LIMIT value must be an integer or parameter')
 
         self.value = value
 
+    def tokenize(self):
+        return [self.keyword, ' ', Value(self.value)]
+
 
 class OrderBy(Statement, ValueList):
+    __slots__ = ()
     keyword = 'ORDER BY'
 
 
 class Return(Statement, ValueList):
+    __slots__ = ('distinct',)
     keyword = 'RETURN'
 
     def __init__(self, values, distinct=False):
@@ -531,15 +897,18 @@ class Return(Statement, ValueList):
 
 
 class ReturnDistinct(Return):
+    __slots__ = ()
+
     def __init__(self, values):
         super(ReturnDistinct, self).__init__(values, distinct=True)
 
 
 class With(Statement, ValueList):
+    __slots__ = ()
     keyword = 'WITH'
 
     def tokenize(self):
-        toks = [self.keyword]
+        toks = [self.keyword, ' ']
         values = []
 
         for value in self.values:
@@ -557,6 +926,7 @@ class With(Statement, ValueList):
 
 
 class Merge(Statement):
+    __slots__ = ('expr',)
     keyword = 'MERGE'
 
     def __init__(self, expr):
@@ -566,30 +936,125 @@ class Merge(Statement):
         return [self.keyword, ' ', self.expr]
 
 
+class Unwind(Statement):
+    __slots__ = ('expr', 'alias')
+    keyword = 'UNWIND'
+
+    def __init__(self, expr, alias):
+        self.expr = expr
+        self.alias = alias
+
+    def tokenize(self):
+        return [self.keyword, ' ', Value(self.expr), ' AS ',
+                _identifier(self.alias)]
+
+
+class UsingPeriodicCommit(Statement):
+    __slots__ = ()
+    keyword = 'USING PERIODIC COMMIT'
+
+    def __init__(self, value=None):
+        if value is not None and not isinstance(value, int):
+            raise TypeError('PERIODIC COMMIT size must be an integer')
+
+        self.value = value
+
+    def tokenize(self):
+        if self.value is None:
+            return [self.keyword]
+
+        # The size cannot be a parameter
+        return [self.keyword, ' ', str(self.value)]
+
+
+class LoadCSV(Statement):
+    __slots__ = ('url', 'alias', 'headers', 'delimiter')
+    keyword = 'LOAD CSV'
+
+    def __init__(self, url, alias, headers=True, delimiter=None):
+        self.url = url
+        self.alias = alias
+        self.headers = headers
+        self.delimiter = delimiter
+
+    def tokenize(self):
+        toks = [self.keyword]
+
+        if self.headers:
+            toks.append(' WITH HEADERS')
+
+        toks.extend([' FROM ', Value(self.url), ' AS ',
+                     _identifier(self.alias)])
+
+        # The field terminator cannot be a parameter
+        if self.delimiter:
+            toks.extend([' FIELDTERMINATOR ',
+                         utils.quote_string(self.delimiter)])
+
+        return toks
+
+
 class OnCreate(Statement, ValueList):
+    __slots__ = ()
     keyword = 'ON CREATE'
 
 
 class OnMatch(Statement, ValueList):
+    __slots__ = ()
     keyword = 'ON MATCH'
 
 
 class Set(Statement, ValueList):
+    __slots__ = ()
     keyword = 'SET'
 
 
 class Union(Statement):
+    __slots__ = ()
     keyword = 'UNION'
 
 
 class UnionAll(Statement):
+    __slots__ = ()
     keyword = 'UNION ALL'
 
 
 class Query(Token):
+    __slots__ = ('tokens', 'delimiter')
+
     def __init__(self, tokens, delimiter='\n'):
         self.tokens = tokens
         self.delimiter = delimiter
 
     def tokenize(self):
         return utils.delimit(self.tokens, delimiter=self.delimiter)
+
+    def prepare(self):
+        "Renders the query once into a template that can be bound repeatedly."
+        return Template(self)
+
+    def explain(self):
+        "Returns the query prefixed with EXPLAIN."
+        return Explain(self)
+
+    def profile(self):
+        "Returns the query prefixed with PROFILE."
+        return Profile(self)
+
+
+class Explain(Token):
+    "Returns the execution plan of a query without running it."
+    __slots__ = ('query',)
+    keyword = 'EXPLAIN'
+
+    def __init__(self, query):
+        self.query = query
+
+    def tokenize(self):
+        return [self.keyword, ' ', self.query]
+
+
+class Profile(Explain):
+    "Runs a query and returns its execution plan with runtime statistics."
+    __slots__ = ()
+    keyword = 'PROFILE'
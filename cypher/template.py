@@ -0,0 +1,44 @@
+from __future__ import unicode_literals, absolute_import
+
+from .token import Parameters
+
+
+class Template(object):
+    """A token rendered once into parameterized text.
+
+    Literal values are stored as constant parameters and each `Param` in the
+    token tree becomes a named slot. Binding values to the slots only builds
+    the parameter dict, the token tree is not walked again.
+    """
+    def __init__(self, token):
+        params = Parameters()
+
+        self.text = token.render(params)
+        self.slots = tuple(params.slots)
+        self.constants = params.values
+
+        self._slots = frozenset(self.slots)
+
+    def bind(self, **values):
+        "Returns a tuple of the text and the parameters for the values."
+        if self._slots.symmetric_difference(values):
+            missing = self._slots.difference(values)
+            unknown = set(values).difference(self._slots)
+
+            if missing:
+                raise TypeError('missing values for slots: {}'.format(
+                    ', '.join(sorted(missing))))
+
+            raise TypeError('unknown slots: {}'.format(
+                ', '.join(sorted(unknown))))
+
+        params = dict(self.constants)
+        params.update(values)
+
+        return self.text, params
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        return '<Template: {!r}>'.format(self.text)
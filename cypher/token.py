@@ -1,20 +1,368 @@
 from __future__ import unicode_literals
 
+import hashlib
+from collections import namedtuple
+
+from .utils import hashable
+
+try:
+    str = unicode
+except NameError:
+    pass
+
+
+class Parameters(object):
+    """Collects literal values that are replaced by `$name` placeholders when
+    a token is rendered in parameterized mode.
+
+    Each literal gets its own parameter, named by its position, so the text
+    only depends on the shape of the query and not on its values.
+    """
+    prefix = 'p'
+
+    # Whether map items are rendered in a deterministic order
+    ordered = False
+
+    def __init__(self):
+        self.values = {}
+        self.slots = []
+
+    def add(self, value):
+        "Adds a value and returns the placeholder that refers to it."
+        name = '{}{}'.format(self.prefix, len(self.values))
+
+        if name in self.slots:
+            raise ValueError('slot name "{}" conflicts with a generated '
+                             'parameter name'.format(name))
+
+        self.values[name] = value
+
+        return '$' + name
+
+    def slot(self, name):
+        "Declares a named slot whose value is bound later."
+        if name in self.values:
+            raise ValueError('slot name "{}" conflicts with a generated '
+                             'parameter name'.format(name))
+
+        if name not in self.slots:
+            self.slots.append(name)
+
+        return '$' + name
+
+
+# Public field names of each token class, derived from __slots__
+_field_names = {}
+
+
+def field_names(cls):
+    "Returns the names of the fields declared by a token class."
+    names = _field_names.get(cls)
+
+    if names is None:
+        names = []
+
+        for klass in reversed(cls.__mro__):
+            for name in klass.__dict__.get('__slots__', ()):
+                if name[0] != '_' and name not in names:
+                    names.append(name)
+
+        names = _field_names[cls] = tuple(names)
+
+    return names
+
+
+class Canonical(Parameters):
+    """Parameters that render literal values as `?` and map items in a
+    deterministic order, producing the canonical form of a token.
+    """
+    ordered = True
+
+    def add(self, value):
+        return '?'
+
+
+Fingerprint = namedtuple('Fingerprint', ['text', 'digest'])
+
+_new = object.__new__
+_setattr = object.__setattr__
+
+
+def _frozen_setattr(self, name, value):
+    if name[0] != '_':
+        raise AttributeError('cannot assign to field "{}" of a frozen '
+                             'token'.format(name))
+
+    _setattr(self, name, value)
+
+
+# Frozen subclass of each token class
+_frozen_classes = {}
+
+
+def _frozen_class(cls):
+    """Returns the subclass that frozen tokens of a class are switched to,
+    so only frozen tokens pay for checking assignments.
+    """
+    frozen = _frozen_classes.get(cls)
+
+    if frozen is None:
+        frozen = _frozen_classes[cls] = type(cls)(cls.__name__, (cls,), {
+            '__slots__': (),
+            '__module__': cls.__module__,
+            '__setattr__': _frozen_setattr,
+            '_frozen': True,
+            '_unfrozen': cls,
+        })
+
+    return frozen
+
+
+def token_type(value):
+    """Returns the class of a value, or of a token as it was created since
+    frozen tokens are instances of a subclass.
+    """
+    return getattr(value, '_unfrozen', None) or type(value)
+
+
+def _restore(cls, fields, frozen):
+    "Unpickles a token."
+    token = _new(cls)
+
+    for name, value in fields.items():
+        _setattr(token, name, value)
+
+    return token.freeze() if frozen else token
+
 
 class Token(object):
+    # The cached text and hash are only set on frozen tokens
+    __slots__ = ('value', '_hash', '_text')
+
+    _frozen = False
+
+    # The class of a frozen token before it was frozen
+    _unfrozen = None
+
     def __init__(self, value):
         self.value = value
 
+    def __reduce__(self):
+        return _restore, (token_type(self), self._fields(), self._frozen)
+
+    @property
+    def frozen(self):
+        return self._frozen
+
+    def freeze(self):
+        """Freezes the token and all tokens it contains so their fields can
+        no longer be reassigned, and returns the token.
+
+        Frozen tokens can be shared between threads and reused across queries,
+        and their rendered text and hash are cached. Containers such as props
+        dicts are not copied and must not be modified in place.
+        """
+        stack = [self]
+
+        while stack:
+            value = stack.pop()
+
+            if isinstance(value, Token):
+                if value._frozen:
+                    continue
+
+                _setattr(value, '_text', None)
+                _setattr(value, '_hash', None)
+                _setattr(value, '__class__', _frozen_class(type(value)))
+                stack.extend(value._fields().values())
+            elif isinstance(value, dict):
+                stack.extend(value.values())
+            elif isinstance(value, (list, tuple)):
+                stack.extend(value)
+
+        return self
+
+    def copy(self, **fields):
+        "Returns an unfrozen shallow copy of the token with fields replaced."
+        token = _new(token_type(self))
+
+        values = self._fields()
+        values.update(fields)
+
+        for name, value in values.items():
+            _setattr(token, name, value)
+
+        return token
+
     def tokenize(self):
         return [self.value]
 
+    def tokenize_params(self, params):
+        """Returns the tokens used in parameterized mode. Tokens that contain
+        literal values override this to add them to `params` instead.
+        """
+        return self.tokenize()
+
+    def iter_render(self, params=None):
+        """Yields the rendered text of the token as a stream of strings.
+
+        The token tree is walked iteratively using an explicit stack of
+        iterators, so deeply nested tokens do not recurse and no intermediate
+        string is built for each level of the tree. If a `Parameters` instance
+        is passed, literal values are collected into it and rendered as
+        placeholders.
+
+        Frozen tokens with cached text are emitted as is. Outside of a frozen
+        token, frozen tokens are rendered once and cached since they are
+        typically shared fragments.
+        """
+        cache_frozen = not self._frozen
+
+        if params is None:
+            text = self._cached_text()
+
+            if text is not None:
+                yield text
+                return
+
+            stack = [iter(self.tokenize())]
+        else:
+            stack = [iter(self.tokenize_params(params))]
+
+        while stack:
+            for tok in stack[-1]:
+                if isinstance(tok, Token):
+                    if params is not None:
+                        stack.append(iter(tok.tokenize_params(params)))
+                        break
+
+                    text = tok._cached_text()
+
+                    if text is None and cache_frozen and tok._frozen:
+                        text = tok.render()
+
+                    if text is not None:
+                        yield text
+                        continue
+
+                    stack.append(iter(tok.tokenize()))
+                    break
+
+                if isinstance(tok, str):
+                    yield tok
+                else:
+                    yield str(tok)
+            else:
+                stack.pop()
+
+    def _cached_text(self):
+        # Only frozen tokens are cached
+        if self._frozen:
+            return self._text
+
+    def render(self, params=None):
+        """Renders the token into a single string. The text of frozen tokens
+        is cached, other tokens are rendered from their current state every
+        time. Parameterized renders are not cached.
+        """
+        if params is not None:
+            return ''.join(self.iter_render(params))
+
+        text = self._cached_text()
+
+        if text is None:
+            text = ''.join(self.iter_render())
+
+            if self._frozen:
+                object.__setattr__(self, '_text', text)
+
+        return text
+
+    def compile(self, params=False):
+        """Renders the token. If `params` is true, literal values are replaced
+        by placeholders and a tuple of the text and a dict of parameters is
+        returned.
+        """
+        if not params:
+            return self.render()
+
+        params = Parameters()
+        text = self.render(params)
+
+        return text, params.values
+
+    def fingerprint(self):
+        """Returns the canonical text of the token with literal values
+        stripped and map items ordered, along with a stable 64-bit digest of
+        the text. Tokens of the same shape have the same fingerprint.
+        """
+        text = self.render(Canonical())
+        digest = hashlib.sha1(text.encode('utf8')).hexdigest()
+
+        return Fingerprint(text, int(digest[:16], 16))
+
+    def render_to(self, fp, params=None, buffer_size=8192):
+        """Writes the rendered text to the file-like object `fp`.
+
+        Output is written in chunks of roughly `buffer_size` characters so
+        large statements never need to be held in memory as one string.
+        """
+        buf = []
+        size = 0
+
+        for chunk in self.iter_render(params):
+            buf.append(chunk)
+            size += len(chunk)
+
+            if size >= buffer_size:
+                fp.write(''.join(buf))
+                buf = []
+                size = 0
+
+        if buf:
+            fp.write(''.join(buf))
+
     def __str__(self):
-        return ''.join([str(t) for t in self.tokenize()])
+        return self.render()
+
+    def _fields(self):
+        "Returns a dict of the fields that are set on the token."
+        fields = {}
+
+        for name in field_names(self.__class__):
+            try:
+                fields[name] = getattr(self, name)
+            except AttributeError:
+                pass
+
+        return fields
+
+    def _key(self):
+        return (token_type(self), hashable(self._fields()))
 
     def __eq__(self, other):
-        if not isinstance(other, (Token, str)):
-            return False
-        return str(self) == str(other)
+        if self is other:
+            return True
+
+        # Tokens are compared structurally. Strings are not equal to tokens
+        # since their hashes could not be consistent with the rendered text.
+        if isinstance(other, Token):
+            return hash(self) == hash(other) and self._key() == other._key()
+
+        return False
+
+    def __hash__(self):
+        # Frozen tokens cannot change so their hash is cached
+        if not self._frozen:
+            return hash(self._key())
+
+        value = self._hash
+
+        if value is None:
+            value = hash(self._key())
+            object.__setattr__(self, '_hash', value)
+
+        return value
 
     def __ne__(self, other):
         return not (self == other)
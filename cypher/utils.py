@@ -1,5 +1,12 @@
 from __future__ import unicode_literals, absolute_import
 
+import re
+
+try:
+    str = unicode
+except NameError:
+    pass
+
 
 def delimit(values, delimiter=', '):
     "Returns a list of tokens interleaved with the delimiter."
@@ -20,3 +27,116 @@ def delimit(values, delimiter=', '):
             toks.extend(delimiter)
 
     return toks
+
+
+def hashable(value):
+    """Returns a hashable representation of a value. Containers are
+    converted recursively and the type is retained so values that compare
+    equal across types, such as 1 and True, are kept distinct.
+    """
+    if isinstance(value, dict):
+        return (dict, frozenset((k, hashable(v)) for k, v in value.items()))
+
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(hashable(v) for v in value))
+
+    return (type(value), value)
+
+
+def sorted_items(mapping):
+    "Returns the items of a mapping in a deterministic order."
+    return sorted(mapping.items(), key=lambda item: str(item[0]))
+
+
+# Escape sequences for control characters in Cypher string literals. Those
+# without a short escape sequence use a unicode escape.
+_control_escapes = dict((chr(i), '\\u{:04x}'.format(i)) for i in range(0x20))
+_control_escapes.update({
+    '\n': '\\n',
+    '\r': '\\r',
+    '\t': '\\t',
+    '\b': '\\b',
+    '\f': '\\f',
+})
+
+_control = re.compile(r'[\x00-\x1f]')
+
+# Bytes of control characters. UTF-8 encoded multibyte characters never
+# contain bytes in the ASCII range so encoded text can be checked directly.
+_control_bytes = bytes(bytearray(range(0x20)))
+
+# Control characters common in text, replaced without a regex
+_common_control = '\n\r\t'
+
+# Length from which ASCII text is checked as bytes, which is faster than
+# isprintable for long text but not for short values
+_long_text = 256
+
+
+if hasattr(str, 'isprintable'):
+    # Cheaper than a regex search; false positives such as a non-breaking
+    # space are harmless.
+    _is_printable = str.isprintable
+else:
+    def _is_printable(value):
+        return _control.search(value) is None
+
+
+def _has_control(value, raw=None):
+    """Returns true if the text may contain control characters. `raw` is
+    the text encoded as UTF-8, if available.
+    """
+    if raw is None and len(value) >= _long_text:
+        try:
+            raw = value.encode('ascii')
+        except UnicodeEncodeError:
+            pass
+
+    if raw is None:
+        return not _is_printable(value)
+
+    return len(raw.translate(None, _control_bytes)) != len(raw)
+
+
+def _escape_control(match):
+    return _control_escapes[match.group()]
+
+
+def quote_string(value):
+    """Returns a single-quoted Cypher string literal for a string or UTF-8
+    encoded bytes.
+
+    Short printable text without quotes or backslashes, the common case, is
+    returned after a few checks that do not copy it. Long ASCII text is
+    checked for control characters as bytes.
+    """
+    if (type(value) is str and len(value) < _long_text and
+            "'" not in value and '\\' not in value and _is_printable(value)):
+        return "'" + value + "'"
+
+    if isinstance(value, bytes):
+        raw = value
+        value = value.decode('utf8')
+    else:
+        raw = None
+
+    control = _has_control(value, raw)
+
+    if not control and "'" not in value and '\\' not in value:
+        return "'" + value + "'"
+
+    if '\\' in value:
+        value = value.replace('\\', '\\\\')
+
+    if "'" in value:
+        value = value.replace("'", "\\'")
+
+    if control:
+        for char in _common_control:
+            if char in value:
+                value = value.replace(char, _control_escapes[char])
+
+        if _has_control(value):
+            value = _control.sub(_escape_control, value)
+
+    return "'" + value + "'"
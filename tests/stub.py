@@ -0,0 +1,113 @@
+"""
+Stub of the HTTP transactional endpoint that records the requests it
+receives and responds according to a list of actions, one per request:
+
+- 'ok': responds with a result of one row for each statement.
+- 'ok-close': responds, then closes the connection as servers do with
+  idle keep-alive connections.
+- 'drop': closes the connection without responding.
+- ('sleep', seconds): waits before responding.
+- ('status', code): responds with the status code.
+- ('json', data): responds with the data.
+
+Once the actions are used up, requests are answered with 'ok'.
+"""
+from __future__ import unicode_literals, absolute_import
+
+import json
+import threading
+import time
+
+try:
+    from http.server import BaseHTTPRequestHandler
+    from socketserver import ThreadingTCPServer
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler
+    from SocketServer import ThreadingTCPServer
+
+
+def result(rows, columns=('n',)):
+    "Returns a response with a single result."
+    return {
+        'results': [{
+            'columns': list(columns),
+            'data': [{'row': row} for row in rows],
+        }],
+        'errors': [],
+    }
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        length = int(self.headers.get('content-length', 0))
+        body = json.loads(self.rfile.read(length).decode('utf8'))
+        action = self.server.next_action(body)
+
+        if action == 'drop':
+            self.close_connection = True
+            return
+
+        status = 200
+        data = result([[1]])
+        data['results'] *= len(body['statements'])
+
+        if isinstance(action, tuple):
+            kind, value = action
+
+            if kind == 'sleep':
+                time.sleep(value)
+            elif kind == 'status':
+                status = value
+            elif kind == 'json':
+                data = value
+
+        content = json.dumps(data).encode('utf8')
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+        if action == 'ok-close':
+            self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, actions=()):
+        ThreadingTCPServer.__init__(self, ('127.0.0.1', 0), Handler)
+        self.actions = list(actions)
+        self.requests = []
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self.serve_forever)
+        self._thread.daemon = True
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:{}'.format(self.server_address[1])
+
+    def next_action(self, body):
+        with self._lock:
+            self.requests.append(body)
+            return self.actions.pop(0) if self.actions else 'ok'
+
+    def statements(self):
+        "Returns the text of all statements received."
+        return [s['statement'] for body in self.requests
+                for s in body['statements']]
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
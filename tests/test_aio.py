@@ -0,0 +1,157 @@
+from __future__ import unicode_literals, absolute_import
+
+import asyncio
+import time
+import unittest
+
+from cypher import Create, Identifier, Node, Query, Return
+from cypher.aio import Session
+from cypher.client import ClientError, CypherError, SendError
+
+from .stub import StubServer, result
+from .test_client import create, free_port
+
+
+def run(coro):
+    return asyncio.get_event_loop_policy().new_event_loop().run_until_complete(
+        coro)
+
+
+def query(i):
+    return Query([Create(Node({'i': i}, identifier='n')),
+                  Return(Identifier('n'))])
+
+
+class SessionTestCase(unittest.TestCase):
+    def test_run(self):
+        async def main(url):
+            async with Session(url, window=0) as session:
+                return await session.run(create())
+
+        with StubServer() as server:
+            result = run(main(server.url))
+
+        self.assertEqual(result.rows, [[1]])
+        self.assertEqual(len(server.requests), 1)
+
+    def test_coalesces_statements(self):
+        async def main(url):
+            async with Session(url, window=0.05) as session:
+                return await asyncio.gather(
+                    *[session.run(query(i)) for i in range(5)])
+
+        with StubServer() as server:
+            results = run(main(server.url))
+
+        self.assertEqual(len(results), 5)
+        self.assertEqual(len(server.requests), 1)
+        self.assertEqual(len(server.requests[0]['statements']), 5)
+
+    def test_failed_statement_only_fails_its_caller(self):
+        # The second statement fails, the others are resubmitted
+        error = {'results': [{'columns': ['n'], 'data': [{'row': [1]}]}],
+                 'errors': [{'code': 'Neo.ClientError.Statement.SyntaxError',
+                             'message': 'invalid'}]}
+
+        async def main(url):
+            async with Session(url, window=0.05) as session:
+                return await asyncio.gather(
+                    *[session.run(query(i)) for i in range(3)],
+                    return_exceptions=True)
+
+        with StubServer([('json', error)]) as server:
+            results = run(main(server.url))
+
+        self.assertIsInstance(results[1], CypherError)
+        self.assertEqual(results[0].rows, [[1]])
+        self.assertEqual(results[2].rows, [[1]])
+        self.assertEqual(len(server.requests), 2)
+        self.assertEqual(len(server.requests[1]['statements']), 2)
+
+    def test_missing_results_fail_callers(self):
+        async def main(url):
+            async with Session(url, window=0.05) as session:
+                return await asyncio.gather(
+                    *[session.run(query(i)) for i in range(2)],
+                    return_exceptions=True)
+
+        with StubServer([('json', {'results': [], 'errors': []})]) as server:
+            results = run(main(server.url))
+
+        self.assertIsInstance(results[0], ClientError)
+        self.assertIsInstance(results[1], ClientError)
+
+    def test_retries_closed_keep_alive_connection(self):
+        async def main(url):
+            async with Session(url, window=0, pool_size=1) as session:
+                await session.run(create())
+                await asyncio.sleep(0.1)
+                return await session.run(create())
+
+        with StubServer(['ok-close']) as server:
+            result = run(main(server.url))
+
+        self.assertEqual(result.rows, [[1]])
+        self.assertEqual(len(server.requests), 2)
+
+    def test_timeout_is_not_retried(self):
+        async def main(url):
+            async with Session(url, window=0.01, timeout=0.2) as session:
+                return await asyncio.gather(
+                    session.run(query(1)), session.run(query(2)),
+                    return_exceptions=True)
+
+        with StubServer([('sleep', 0.5)]) as server:
+            results = run(main(server.url))
+            time.sleep(0.5)
+
+        self.assertIsInstance(results[0], ClientError)
+        self.assertIsInstance(results[1], ClientError)
+        self.assertEqual(len(server.requests), 1)
+
+    def test_timeout_on_reused_connection_is_not_retried(self):
+        async def main(url):
+            async with Session(url, window=0, timeout=0.2,
+                               pool_size=1) as session:
+                await session.run(create())
+                await session.run(create())
+
+        with StubServer(['ok', ('sleep', 0.5)]) as server:
+            with self.assertRaises(ClientError):
+                run(main(server.url))
+
+            time.sleep(0.5)
+
+        self.assertEqual(len(server.requests), 2)
+
+    def test_connection_refused(self):
+        async def main(url):
+            async with Session(url, window=0) as session:
+                await session.run(create())
+
+        with self.assertRaises(SendError):
+            run(main('http://127.0.0.1:{}'.format(free_port())))
+
+    def test_stream(self):
+        data = result([[{'name': 'a'}]])
+        data['results'][0]['data'][0]['meta'] = [{'id': 1, 'type': 'node',
+                                                  'deleted': False}]
+        data['results'][0]['data'][0]['graph'] = {
+            'nodes': [{'id': '1', 'labels': ['L'],
+                       'properties': {'name': 'a'}}],
+            'relationships': []}
+
+        async def main(url):
+            async with Session(url, window=0) as session:
+                return [row async for row in session.stream(create())]
+
+        with StubServer([('json', data)]) as server:
+            rows = run(main(server.url))
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0][0].id, 1)
+        self.assertEqual(list(rows[0][0].labels), ['L'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+from __future__ import unicode_literals, absolute_import
+
+import threading
+import time
+import unittest
+
+from cypher import Create, Node
+from cypher.batch import Batcher, is_transient
+from cypher.client import Client, ClientError, CypherError, SendError
+
+from .stub import StubServer
+
+
+def create(i):
+    return Create(Node({'i': i}, labels=['L']))
+
+
+class Executor(object):
+    "Records batches, failing with the given errors first."
+    def __init__(self, errors=()):
+        self.errors = list(errors)
+        self.batches = []
+        self.calls = 0
+
+    def __call__(self, batch):
+        self.calls += 1
+
+        if self.errors:
+            raise self.errors.pop(0)
+
+        self.batches.append(batch)
+
+
+class IsTransientTestCase(unittest.TestCase):
+    def test_transient(self):
+        self.assertTrue(is_transient(CypherError(
+            'Neo.TransientError.Transaction.DeadlockDetected', '')))
+        self.assertTrue(is_transient(SendError('connection refused')))
+
+    def test_not_transient(self):
+        self.assertFalse(is_transient(CypherError(
+            'Neo.ClientError.Statement.SyntaxError', '')))
+        self.assertFalse(is_transient(ClientError('request timed out')))
+        self.assertFalse(is_transient(ClientError(
+            'server responded with 401 Unauthorized')))
+        self.assertFalse(is_transient(ClientError('invalid JSON response')))
+        self.assertFalse(is_transient(ValueError()))
+
+
+class BatcherTestCase(unittest.TestCase):
+    def test_max_statements(self):
+        executor = Executor()
+
+        with Batcher(executor, max_statements=3, max_delay=10) as batcher:
+            for i in range(7):
+                batcher.add(create(i))
+
+        self.assertEqual([len(b) for b in executor.batches], [3, 3, 1])
+        self.assertEqual(batcher.statements, 7)
+        self.assertEqual(batcher.batches, 3)
+
+        statement, params = executor.batches[0][1]
+        self.assertEqual(statement, 'CREATE (:L {i: $p0})')
+        self.assertEqual(params, {'p0': 1})
+
+    def test_max_bytes(self):
+        executor = Executor()
+
+        with Batcher(executor, max_bytes=150, max_delay=10) as batcher:
+            for i in range(4):
+                batcher.add(create(i))
+
+        self.assertEqual([len(b) for b in executor.batches], [2, 2])
+
+    def test_max_delay(self):
+        executor = Executor()
+        batcher = Batcher(executor, max_delay=0.05)
+        batcher.add(create(1))
+        time.sleep(0.3)
+
+        self.assertEqual(len(executor.batches), 1)
+        batcher.close()
+
+    def test_flush(self):
+        executor = Executor()
+        batcher = Batcher(executor, max_delay=10)
+        batcher.add(create(1))
+        batcher.flush()
+
+        self.assertEqual(len(executor.batches), 1)
+        batcher.close()
+
+    def test_retries_transient_errors(self):
+        executor = Executor([
+            CypherError('Neo.TransientError.Transaction.DeadlockDetected',
+                        'deadlock'),
+            SendError('connection refused'),
+        ])
+
+        with Batcher(executor, backoff=0.01) as batcher:
+            batcher.add(create(1))
+
+        self.assertEqual(executor.calls, 3)
+        self.assertEqual(len(executor.batches), 1)
+
+    def test_does_not_retry_other_errors(self):
+        for error in (ClientError('request timed out'),
+                      ClientError('server responded with 401 Unauthorized'),
+                      CypherError('Neo.ClientError.Statement.SyntaxError',
+                                  'invalid')):
+            executor = Executor([error])
+            batcher = Batcher(executor, backoff=0.01)
+            batcher.add(create(1))
+
+            with self.assertRaises(ClientError) as cm:
+                batcher.close()
+
+            self.assertIs(cm.exception, error)
+            self.assertEqual(executor.calls, 1)
+
+    def test_gives_up_after_retries(self):
+        error = CypherError('Neo.TransientError.General.Unknown', '')
+        executor = Executor([error] * 5)
+        batcher = Batcher(executor, retries=2, backoff=0.01)
+        batcher.add(create(1))
+
+        with self.assertRaises(CypherError):
+            batcher.flush()
+
+        self.assertEqual(executor.calls, 3)
+        batcher.close()
+
+    def test_add_blocks_on_pending_batches(self):
+        release = threading.Event()
+
+        def executor(batch):
+            release.wait(5)
+
+        batcher = Batcher(executor, max_statements=1, max_pending=1)
+        batcher.add(create(1))
+        batcher.add(create(2))
+
+        added = threading.Event()
+
+        def add():
+            batcher.add(create(3))
+            added.set()
+
+        thread = threading.Thread(target=add)
+        thread.start()
+
+        self.assertFalse(added.wait(0.2))
+        release.set()
+        self.assertTrue(added.wait(5))
+
+        thread.join()
+        batcher.close()
+
+    def test_closed(self):
+        batcher = Batcher(Executor())
+        batcher.close()
+
+        with self.assertRaises(ClientError):
+            batcher.add(create(1))
+
+    def test_error_status_is_not_resubmitted(self):
+        with StubServer([('status', 401)]) as server:
+            client = Client(server.url)
+            batcher = Batcher(client.run_many, backoff=0.01)
+            batcher.add(create(1))
+
+            with self.assertRaises(ClientError):
+                batcher.close()
+
+        self.assertEqual(len(server.requests), 1)
+
+    def test_timeout_is_not_resubmitted(self):
+        with StubServer([('sleep', 0.5)]) as server:
+            client = Client(server.url, timeout=0.2)
+            batcher = Batcher(client.run_many, backoff=0.01)
+            batcher.add(create(1))
+
+            with self.assertRaises(ClientError):
+                batcher.close()
+
+            time.sleep(0.5)
+
+        self.assertEqual(len(server.requests), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
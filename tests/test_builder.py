@@ -0,0 +1,80 @@
+from __future__ import unicode_literals, absolute_import
+
+import unittest
+
+from cypher import Identifier, Limit, Node, Predicate, Value
+from cypher.builder import QueryBuilder
+
+
+def age(op, value):
+    return Predicate(Identifier('age', identifier='n'), op, Value(value))
+
+
+class QueryBuilderTestCase(unittest.TestCase):
+    def test_build(self):
+        query = (QueryBuilder()
+                 .match(Node(identifier='n', labels=['Person']))
+                 .where(age('>=', 18))
+                 .with_(Identifier('n'))
+                 .ret(Identifier('n'), distinct=True)
+                 .order_by(Identifier('name', identifier='n'))
+                 .skip(5)
+                 .limit(10))
+
+        self.assertEqual(str(query).split('\n'), [
+            'MATCH (n:Person)',
+            'WHERE n.age >= 18',
+            'WITH n',
+            'RETURN DISTINCT n',
+            'ORDER BY n.name',
+            'SKIP 5',
+            'LIMIT 10',
+        ])
+        self.assertEqual(str(query.query()), str(query))
+
+    def test_consecutive_where_are_combined(self):
+        query = (QueryBuilder()
+                 .match(Node(identifier='n'))
+                 .where(age('>=', 18))
+                 .where(age('<', 65))
+                 .ret(Identifier('n')))
+
+        self.assertEqual(str(query).split('\n')[1],
+                         'WHERE (n.age >= 18 AND n.age < 65)')
+
+    def test_branches_share_prefix(self):
+        base = QueryBuilder().match(Node(identifier='n'))
+        first = base.ret(Identifier('n'))
+        second = base.then(Limit(1))
+
+        self.assertEqual(str(first), 'MATCH (n)\nRETURN n')
+        self.assertEqual(str(second), 'MATCH (n)\nLIMIT 1')
+        self.assertEqual(str(base), 'MATCH (n)')
+        self.assertIs(first.parent, second.parent)
+
+    def test_caches_frozen_clauses(self):
+        node = Node(identifier='n').freeze()
+        query = QueryBuilder().match(node).limit(1)
+
+        self.assertEqual(str(query), 'MATCH (n)\nLIMIT 1')
+        self.assertTrue(query.clause.frozen)
+        self.assertEqual(query._text, 'MATCH (n)\nLIMIT 1')
+
+    def test_renders_current_state_of_unfrozen_clauses(self):
+        node = Node({'a': 1}, identifier='n')
+        query = QueryBuilder().match(node).limit(1)
+
+        self.assertEqual(str(query), 'MATCH (n {a: 1})\nLIMIT 1')
+
+        node.props['a'] = 2
+        self.assertEqual(str(query), 'MATCH (n {a: 2})\nLIMIT 1')
+
+    def test_compile(self):
+        query = QueryBuilder().match(Node({'a': 1}, identifier='n'))
+
+        self.assertEqual(query.compile(params=True),
+                         ('MATCH (n {a: $p0})', {'p0': 1}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+from __future__ import unicode_literals, absolute_import
+
+import socket
+import threading
+import time
+import unittest
+
+from cypher import Identifier, Node, Query, Return, Create
+from cypher.client import Client, ClientError, ConnectionPool, SendError
+
+from .stub import StubServer
+
+
+def create():
+    return Query([Create(Node({'a': 1}, identifier='n', labels=['L'])),
+                  Return(Identifier('n'))])
+
+
+def free_port():
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+class ClientTestCase(unittest.TestCase):
+    def test_run(self):
+        with StubServer() as server:
+            client = Client(server.url)
+            result = client.run(create())
+
+            self.assertEqual(result.columns, ['n'])
+            self.assertEqual(result.rows, [[1]])
+
+            body = server.requests[0]['statements'][0]
+            self.assertEqual(body['statement'],
+                             'CREATE (n:L {a: $p0})\nRETURN n')
+            self.assertEqual(body['parameters'], {'p0': 1})
+
+    def test_reuses_connection(self):
+        with StubServer() as server:
+            client = Client(server.url, pool_size=1)
+            client.run(create())
+            conn = client.pool._idle[0]
+            client.run(create())
+
+            self.assertIs(client.pool._idle[0], conn)
+
+    def test_retries_closed_keep_alive_connection(self):
+        # The server closes the connection after the first response
+        with StubServer(['ok-close']) as server:
+            client = Client(server.url)
+            client.run(create())
+            time.sleep(0.1)
+            client.run(create())
+
+            self.assertEqual(len(server.requests), 2)
+
+    def test_timeout_is_not_retried(self):
+        with StubServer([('sleep', 0.5)]) as server:
+            client = Client(server.url, timeout=0.2)
+
+            with self.assertRaises(ClientError):
+                client.run(create())
+
+            time.sleep(0.5)
+            self.assertEqual(len(server.requests), 1)
+
+    def test_timeout_on_reused_connection_is_not_retried(self):
+        with StubServer(['ok', ('sleep', 0.5)]) as server:
+            client = Client(server.url, timeout=0.2)
+            client.run(create())
+
+            with self.assertRaises(ClientError):
+                client.run(create())
+
+            time.sleep(0.5)
+            self.assertEqual(len(server.requests), 2)
+
+    def test_dropped_new_connection_is_not_retried(self):
+        with StubServer(['drop']) as server:
+            client = Client(server.url)
+
+            with self.assertRaises(ClientError) as cm:
+                client.run(create())
+
+            self.assertNotIsInstance(cm.exception, SendError)
+            self.assertEqual(len(server.requests), 1)
+
+    def test_connection_refused(self):
+        client = Client('http://127.0.0.1:{}'.format(free_port()))
+
+        with self.assertRaises(SendError):
+            client.run(create())
+
+        self.assertEqual(client.pool._count, 0)
+
+    def test_error_status(self):
+        with StubServer([('status', 401)]) as server:
+            client = Client(server.url)
+
+            with self.assertRaises(ClientError) as cm:
+                client.run(create())
+
+            self.assertIn('401', str(cm.exception))
+            self.assertEqual(len(server.requests), 1)
+
+
+class ConnectionPoolTestCase(unittest.TestCase):
+    def test_discard_wakes_waiter(self):
+        pool = ConnectionPool('127.0.0.1', size=1, timeout=3)
+        conn = pool.acquire()
+        acquired = []
+
+        def wait():
+            acquired.append(pool.acquire())
+
+        thread = threading.Thread(target=wait)
+        thread.start()
+
+        time.sleep(0.1)
+        start = time.time()
+        pool.discard(conn)
+        thread.join(3)
+
+        self.assertEqual(len(acquired), 1)
+        self.assertLess(time.time() - start, 1)
+
+    def test_release_wakes_waiter(self):
+        pool = ConnectionPool('127.0.0.1', size=1, timeout=3)
+        conn = pool.acquire()
+        acquired = []
+
+        thread = threading.Thread(target=lambda: acquired.append(
+            pool.acquire()))
+        thread.start()
+
+        time.sleep(0.1)
+        pool.release(conn)
+        thread.join(3)
+
+        self.assertEqual(acquired, [conn])
+
+    def test_timeout(self):
+        pool = ConnectionPool('127.0.0.1', size=1, timeout=0.1)
+        pool.acquire()
+
+        with self.assertRaises(ClientError):
+            pool.acquire()
+
+
+if __name__ == '__main__':
+    unittest.main()
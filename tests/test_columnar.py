@@ -0,0 +1,125 @@
+from __future__ import unicode_literals, absolute_import
+
+import json
+import unittest
+
+from cypher import columnar
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+
+class DictTestCase(unittest.TestCase):
+    def test_records(self):
+        data = {'id': [1, 2, 3], 'name': ['a', None, 'c'],
+                'score': [1.5, float('nan'), 2.0]}
+
+        self.assertEqual(list(columnar.records(data)), [
+            {'id': 1, 'name': 'a', 'score': 1.5},
+            {'id': 2},
+            {'id': 3, 'name': 'c', 'score': 2.0},
+        ])
+
+    def test_chunks(self):
+        data = {'id': list(range(5))}
+
+        self.assertEqual(list(columnar.records(data, chunk_size=2)),
+                         [{'id': i} for i in range(5)])
+
+    def test_nodes(self):
+        data = {'id': [1, 2], 'name': ['a', None]}
+        (query, params), = columnar.nodes(data, key='id', labels=['L'])
+
+        self.assertEqual(params, {'rows': [
+            {'key': {'id': 1}, 'props': {'name': 'a'}},
+            {'key': {'id': 2}, 'props': {}},
+        ]})
+
+    def test_missing_key(self):
+        with self.assertRaises(ValueError):
+            list(columnar.nodes({'id': [1, None]}, key='id'))
+
+    def test_columns_must_have_same_length(self):
+        with self.assertRaises(ValueError):
+            list(columnar.records({'a': [1, 2], 'b': [1]}))
+
+
+@unittest.skipIf(numpy is None, 'requires NumPy')
+class RecordArrayTestCase(unittest.TestCase):
+    def test_records(self):
+        data = numpy.array([(1, 1.5, '2020-01-01T10:00'),
+                            (2, numpy.nan, 'NaT')],
+                           dtype=[('id', 'i8'), ('score', 'f8'),
+                                  ('at', 'M8[s]')])
+
+        records = list(columnar.records(data))
+
+        self.assertEqual(records, [
+            {'id': 1, 'score': 1.5, 'at': '2020-01-01T10:00:00'},
+            {'id': 2},
+        ])
+        self.assertIs(type(records[0]['id']), int)
+        json.dumps(records)
+
+    def test_datetime_resolutions(self):
+        for unit in ('us', 'ns'):
+            data = {'at': numpy.array(['2020-01-01T10:00:00.5'],
+                                      dtype='M8[{}]'.format(unit))}
+            value = list(columnar.records(data))[0]['at']
+
+            self.assertTrue(value.startswith('2020-01-01T10:00:00.5'))
+
+    def test_timedelta(self):
+        with self.assertRaises(TypeError):
+            list(columnar.records({'d': numpy.array([1], dtype='m8[s]')}))
+
+
+@unittest.skipIf(pandas is None, 'requires pandas')
+class DataFrameTestCase(unittest.TestCase):
+    def frame(self):
+        at = pandas.to_datetime(['2020-01-01 10:00', None,
+                                 '2021-05-05 00:00']).as_unit('us')
+
+        return pandas.DataFrame({
+            'id': [1, 2, 3],
+            'score': [1.5, numpy.nan, 2.0],
+            'count': pandas.array([1, None, 3], dtype='Int64'),
+            'name': pandas.array(['a', pandas.NA, 'c'], dtype='string'),
+            'at': at,
+            'utc': at.tz_localize('Europe/Paris'),
+        })
+
+    def test_records(self):
+        records = list(columnar.records(self.frame()))
+
+        self.assertEqual(records, [
+            {'id': 1, 'score': 1.5, 'count': 1, 'name': 'a',
+             'at': '2020-01-01T10:00:00.000000',
+             'utc': '2020-01-01T09:00:00.000000Z'},
+            {'id': 2},
+            {'id': 3, 'score': 2.0, 'count': 3, 'name': 'c',
+             'at': '2021-05-05T00:00:00.000000',
+             'utc': '2021-05-04T22:00:00.000000Z'},
+        ])
+
+    def test_nodes_are_json(self):
+        for query, params in columnar.nodes(self.frame(), key='id',
+                                            labels=['L'], chunk_size=2):
+            json.dumps(params)
+
+    def test_object_column_with_na(self):
+        frame = pandas.DataFrame({'name': ['a', pandas.NA, None]})
+
+        self.assertEqual(list(columnar.records(frame)),
+                         [{'name': 'a'}, {}, {}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+from __future__ import unicode_literals, absolute_import
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from cypher.csvload import Planner
+
+
+class PlannerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.planner = Planner(self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_nodes(self):
+        query, = self.planner.nodes([{'id': 1, 'name': 'Bob'}], 'Person',
+                                    key='id')
+
+        self.assertEqual(str(query), '\n'.join([
+            'USING PERIODIC COMMIT 1000',
+            "LOAD CSV WITH HEADERS FROM 'file:///person_00000.csv' AS row",
+            'MERGE (n:Person {id: toInteger(row.id)})',
+            'SET n.name = row.name',
+        ]))
+
+        path = os.path.join(self.directory, 'person_00000.csv')
+
+        with io.open(path, encoding='utf8') as fp:
+            self.assertEqual(fp.read(), 'id,name\n1,Bob\n')
+
+    def test_missing_node_property_is_kept(self):
+        query, = self.planner.nodes([{'id': 1, 'age': 30}, {'id': 2}],
+                                    'Person', key='id')
+
+        self.assertEqual(str(query).split('\n')[-1],
+                         'SET n.age = coalesce(toInteger(row.age), n.age)')
+
+    def test_missing_rel_property_is_kept(self):
+        query, = self.planner.rels([(1, 2, {'since': 2010}), (2, 3)],
+                                   'KNOWS', 'Person', 'id', 'Person', 'id')
+
+        self.assertEqual(
+            str(query).split('\n')[-1],
+            'SET r.since = coalesce(toInteger(row.since), r.since)')
+
+
+if __name__ == '__main__':
+    unittest.main()
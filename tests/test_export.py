@@ -0,0 +1,61 @@
+from __future__ import unicode_literals, absolute_import
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from cypher import Identifier, Return
+from cypher.export import export
+
+
+def rows(*names):
+    return [{'name': name} for name in names]
+
+
+def ret(row):
+    return Return(Identifier(row['name']))
+
+
+class ExportTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'script.cypher')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def read(self):
+        with io.open(self.path, encoding='utf8') as fp:
+            return fp.read()
+
+    def test_cypher_shell_markers(self):
+        count = export(rows('a', 'b', 'c'), self.path, render=ret, processes=1,
+                       chunk_size=2, commit_every=2)
+
+        self.assertEqual(count, 3)
+        self.assertEqual(self.read(), ':begin\nRETURN a;\nRETURN b;\n:commit\n'
+                                      ':begin\nRETURN c;\n:commit\n')
+
+    def test_markers(self):
+        export(rows('a'), self.path, render=ret, processes=1,
+               markers=('BEGIN', 'COMMIT'))
+
+        self.assertEqual(self.read(), 'BEGIN\nRETURN a;\nCOMMIT\n')
+
+    def test_without_transactions(self):
+        export([Return(Identifier('a'))], self.path, processes=1,
+               commit_every=0)
+
+        self.assertEqual(self.read(), 'RETURN a;\n')
+
+    def test_processes(self):
+        export(rows('a', 'b'), self.path, render=ret, processes=2,
+               chunk_size=1, commit_every=0)
+
+        self.assertEqual(self.read(), 'RETURN a;\nRETURN b;\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
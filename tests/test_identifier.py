@@ -0,0 +1,36 @@
+from __future__ import unicode_literals, absolute_import
+
+import unittest
+
+from cypher import Identifier, Map, Node
+
+
+class IdentifierTestCase(unittest.TestCase):
+    def test_plain(self):
+        self.assertEqual(str(Identifier('name_1')), 'name_1')
+        self.assertEqual(str(Identifier('name', identifier='n')), 'n.name')
+
+    def test_quoted(self):
+        self.assertEqual(str(Identifier('a b')), '`a b`')
+        self.assertEqual(str(Identifier('1a')), '`1a`')
+        self.assertEqual(str(Identifier('é')), '`é`')
+
+    def test_trailing_newline(self):
+        self.assertEqual(str(Identifier('x\n')), '`x\n`')
+
+    def test_backticks(self):
+        self.assertEqual(str(Identifier('a`b')), '`a``b`')
+        self.assertEqual(str(Identifier('a`b', identifier='n`')),
+                         '`n```.`a``b`')
+
+    def test_map_key(self):
+        key = 'a` }) DETACH DELETE n //'
+
+        self.assertEqual(str(Map({key: 1})),
+                         '{`a`` }) DETACH DELETE n //`: 1}')
+        self.assertEqual(str(Node({key: 1}, identifier='n')),
+                         '(n {`a`` }) DETACH DELETE n //`: 1})')
+
+
+if __name__ == '__main__':
+    unittest.main()
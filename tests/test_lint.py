@@ -0,0 +1,135 @@
+from __future__ import unicode_literals, absolute_import
+
+import unittest
+
+from cypher import (Function, Identifier, Limit, Match, Node, Query, Rel,
+                    Return, Union, Unwind, Value)
+from cypher.lint import LintError, Linter, Strict, is_unbounded, lint
+
+
+def rules(token, **kwargs):
+    return [(i.rule, i.severity) for i in lint(token, **kwargs)]
+
+
+class RulesTestCase(unittest.TestCase):
+    def test_is_unbounded(self):
+        for rel_type in ('*', '*1..', '* 2 ..'):
+            self.assertTrue(is_unbounded(rel_type), rel_type)
+
+        for rel_type in ('*2', '*1..3', '*..3', 'KNOWS', None):
+            self.assertFalse(is_unbounded(rel_type), rel_type)
+
+    def test_unbounded_path(self):
+        query = Query([Match(Rel('a', '*', 'b')), Return(Identifier('b')),
+                       Limit(10)])
+
+        self.assertEqual(rules(query), [('unbounded-path', 'error')])
+        self.assertEqual(rules(Query([Match(Rel('a', '*1..3', 'b')),
+                                      Return(Identifier('b')), Limit(10)])),
+                         [])
+
+    def test_disconnected_match(self):
+        query = Query([Match([Node(identifier='a'), Node(identifier='b')]),
+                       Return(Identifier('a')), Limit(10)])
+
+        self.assertEqual(rules(query), [('disconnected-match', 'warning')])
+
+    def test_connected_match(self):
+        query = Query([Match([Rel('a', 'KNOWS', 'b'),
+                              Rel('b', 'KNOWS', 'c')]),
+                       Return(Identifier('a')), Limit(10)])
+
+        self.assertEqual(rules(query), [])
+
+    def test_bound_identifiers_do_not_disconnect(self):
+        query = Query([Match(Node(identifier='a')),
+                       Match([Identifier('a'), Rel('a', 'KNOWS', 'b')]),
+                       Return(Identifier('b')), Limit(10)])
+
+        self.assertEqual(rules(query), [])
+
+    def test_unwind_binds(self):
+        query = Query([Unwind(Value([1, 2]), 'x'),
+                       Match([Identifier('x'), Node(identifier='n')]),
+                       Return(Identifier('n')), Limit(10)])
+
+        self.assertEqual(rules(query), [])
+
+    def test_unlimited_return(self):
+        query = Query([Match(Node(identifier='n')), Return(Identifier('n'))])
+
+        self.assertEqual(rules(query), [('unlimited-return', 'info')])
+
+    def test_aggregate_return_is_not_unlimited(self):
+        query = Query([Match(Node(identifier='n')),
+                       Return(Function('count', [Identifier('n')]))])
+
+        self.assertEqual(rules(query), [])
+
+    def test_union_parts(self):
+        query = Query([Match(Node(identifier='n')), Return(Identifier('n')),
+                       Limit(1), Union(''),
+                       Match(Node(identifier='m')), Return(Identifier('m'))])
+
+        self.assertEqual(rules(query), [('unlimited-return', 'info')])
+
+
+class SeveritiesTestCase(unittest.TestCase):
+    query = Query([Match([Node(identifier='a'), Rel('b', '*', 'c')]),
+                   Return(Identifier('a'))])
+
+    def test_defaults(self):
+        self.assertEqual(sorted(rules(self.query)), [
+            ('disconnected-match', 'warning'),
+            ('unbounded-path', 'error'),
+            ('unlimited-return', 'info'),
+        ])
+
+    def test_override(self):
+        self.assertEqual(sorted(rules(self.query, severities={
+            'unlimited-return': None,
+            'disconnected-match': 'error',
+        })), [('disconnected-match', 'error'), ('unbounded-path', 'error')])
+
+    def test_unknown_rule_or_severity(self):
+        with self.assertRaises(ValueError):
+            Linter({'no-such-rule': 'error'})
+
+        with self.assertRaises(ValueError):
+            Linter({'unlimited-return': 'fatal'})
+
+    def test_check(self):
+        Linter({'unbounded-path': None}).check(self.query)
+
+        with self.assertRaises(LintError) as cm:
+            Linter().check(self.query, severity='warning')
+
+        self.assertEqual(sorted(i.rule for i in cm.exception.issues),
+                         ['disconnected-match', 'unbounded-path'])
+
+
+class StrictTestCase(unittest.TestCase):
+    def test_raises_when_rendered(self):
+        strict = Strict(Query([Match(Rel('a', '*', 'b')),
+                               Return(Identifier('b')), Limit(10)]))
+
+        with self.assertRaises(LintError):
+            str(strict)
+
+        with self.assertRaises(LintError):
+            strict.compile(params=True)
+
+    def test_severity(self):
+        query = Query([Match(Node(identifier='n')), Return(Identifier('n'))])
+
+        self.assertEqual(str(Strict(query)), 'MATCH (n)\nRETURN n')
+
+        with self.assertRaises(LintError):
+            str(Strict(query, severity='info'))
+
+        self.assertEqual(str(Strict(query, severity='info', severities={
+            'unlimited-return': None})), 'MATCH (n)\nRETURN n')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,307 @@
+from __future__ import unicode_literals, absolute_import
+
+import unittest
+
+from cypher import (Identifier, Match, Node, OptionalMatch, Param, Predicate,
+                    PredicateList, Query, Rel, Return, Value, Where, With)
+from cypher.optimize import optimize
+
+
+def prop(identifier, key):
+    return Identifier(key, identifier=identifier)
+
+
+def eq(identifier, key, value):
+    return Predicate(prop(identifier, key), '=', value)
+
+
+def person(identifier='n', **props):
+    return Node(props or None, identifier=identifier, labels=['Person'])
+
+
+def render(token):
+    return str(token).split('\n')
+
+
+class OptimizeTestCase(unittest.TestCase):
+    def assertOptimized(self, token, expected):
+        before = str(token)
+        self.assertEqual(render(optimize(token)), expected)
+
+        # The input is not modified
+        self.assertEqual(str(token), before)
+
+    def assertUnchanged(self, token):
+        self.assertEqual(str(optimize(token)), str(token))
+
+
+class MergeMatchTestCase(OptimizeTestCase):
+    def test_merge_nodes(self):
+        self.assertOptimized(Query([
+            Match(person('n')),
+            Match(Node(identifier='m')),
+            Return(Identifier('n')),
+        ]), [
+            'MATCH (n:Person), (m)',
+            'RETURN n',
+        ])
+
+    def test_merge_node_with_rel(self):
+        self.assertOptimized(Query([
+            Match(person('n')),
+            Match(Rel('n', 'KNOWS', 'm', identifier='r')),
+            Return(Identifier('m')),
+        ]), [
+            'MATCH (n:Person), (n)-[r:KNOWS]->(m)',
+            'RETURN m',
+        ])
+
+    def test_drop_repeated_pattern(self):
+        self.assertOptimized(Query([
+            Match(person('n')),
+            Match(person('n')),
+            Return(Identifier('n')),
+        ]), [
+            'MATCH (n:Person)',
+            'RETURN n',
+        ])
+
+    def test_drop_repeated_node_in_clause(self):
+        self.assertOptimized(Match([person('n'), person('n')]),
+                             ['MATCH (n:Person)'])
+
+    def test_keep_repeated_anonymous_node(self):
+        # Each anonymous node multiplies the rows
+        self.assertUnchanged(Match([Node(labels=['A']), Node(labels=['A'])]))
+
+    def test_keep_repeated_rel_in_clause(self):
+        # A relationship cannot be matched twice in one pattern
+        rel = Rel('a', 'X', 'b', identifier='r')
+        self.assertUnchanged(Match([rel, rel]))
+
+    def test_rels_in_both_clauses(self):
+        # Merging would require the relationships to be distinct
+        self.assertUnchanged(Query([
+            Match(Rel('a', 'X', 'b', identifier='r')),
+            Match(Rel('a', 'X', 'c', identifier='s')),
+            Return(Identifier('c')),
+        ]))
+
+    def test_optional_match_is_not_merged(self):
+        self.assertUnchanged(Query([
+            Match(person('n')),
+            OptionalMatch(Node(identifier='m')),
+            Return(Identifier('m')),
+        ]))
+
+
+class PushPredicatesTestCase(OptimizeTestCase):
+    def test_push_equality(self):
+        self.assertOptimized(Query([
+            Match(person('n')),
+            Where(eq('n', 'name', Value('Bob'))),
+            Return(Identifier('n')),
+        ]), [
+            "MATCH (n:Person {name: 'Bob'})",
+            'RETURN n',
+        ])
+
+    def test_push_param(self):
+        self.assertOptimized(Query([
+            Match(person('n')),
+            Where(eq('n', 'id', Param('id'))),
+            Return(Identifier('n')),
+        ]), [
+            'MATCH (n:Person {id: $id})',
+            'RETURN n',
+        ])
+
+    def test_push_some_of_and(self):
+        self.assertOptimized(Query([
+            Match(person('n')),
+            Where(PredicateList([
+                eq('n', 'name', Value('Bob')),
+                Predicate(prop('n', 'age'), '>', Value(18)),
+            ])),
+            Return(Identifier('n')),
+        ]), [
+            "MATCH (n:Person {name: 'Bob'})",
+            'WHERE n.age > 18',
+            'RETURN n',
+        ])
+
+    def test_push_into_rel_endpoint(self):
+        self.assertOptimized(Query([
+            Match(Rel(person('a'), 'KNOWS', person('b'))),
+            Where(eq('b', 'id', Value(2))),
+            Return(Identifier('a')),
+        ]), [
+            'MATCH (a:Person)-[:KNOWS]->(b:Person {id: 2})',
+            'RETURN a',
+        ])
+
+    def test_push_into_optional_match(self):
+        # A Where following an OptionalMatch is part of its pattern
+        self.assertOptimized(Query([
+            Match(person('n')),
+            OptionalMatch(Node(identifier='m', labels=['Pet'])),
+            Where(eq('m', 'name', Value('Rex'))),
+            Return(Identifier('m')),
+        ]), [
+            'MATCH (n:Person)',
+            "OPTIONAL MATCH (m:Pet {name: 'Rex'})",
+            'RETURN m',
+        ])
+
+    def test_matching_existing_prop(self):
+        self.assertOptimized(Query([
+            Match(person('n', id=1)),
+            Where(eq('n', 'id', Value(1))),
+            Return(Identifier('n')),
+        ]), [
+            'MATCH (n:Person {id: 1})',
+            'RETURN n',
+        ])
+
+    def test_conflicting_prop(self):
+        self.assertUnchanged(Query([
+            Match(person('n', id=1)),
+            Where(eq('n', 'id', Value(2))),
+            Return(Identifier('n')),
+        ]))
+
+    def test_conflicting_prop_type(self):
+        # 1 and 1.0 are equal in Python but the predicate is kept
+        self.assertUnchanged(Query([
+            Match(person('n', id=1)),
+            Where(eq('n', 'id', Value(1.0))),
+            Return(Identifier('n')),
+        ]))
+
+    def test_or_is_not_pushed(self):
+        self.assertUnchanged(Query([
+            Match(person('n')),
+            Where(PredicateList([eq('n', 'id', Value(1)),
+                                 eq('n', 'id', Value(2))], operator='OR')),
+            Return(Identifier('n')),
+        ]))
+
+    def test_null_is_not_pushed(self):
+        self.assertUnchanged(Query([
+            Match(person('n')),
+            Where(eq('n', 'name', Value(None))),
+            Return(Identifier('n')),
+        ]))
+
+    def test_expression_is_not_pushed(self):
+        self.assertUnchanged(Query([
+            Match(person('n')),
+            Where(eq('n', 'name', 'm.name')),
+            Return(Identifier('n')),
+        ]))
+
+    def test_other_operator_is_not_pushed(self):
+        self.assertUnchanged(Query([
+            Match(person('n')),
+            Where(Predicate(prop('n', 'age'), '>', Value(18))),
+            Return(Identifier('n')),
+        ]))
+
+    def test_unmatched_identifier_is_not_pushed(self):
+        self.assertUnchanged(Query([
+            Match(person('n')),
+            With([Identifier('n')]),
+            Where(eq('n', 'name', Value('Bob'))),
+            Return(Identifier('n')),
+        ]))
+
+    def test_merge_after_push(self):
+        self.assertOptimized(Query([
+            Match(person('n')),
+            Where(eq('n', 'id', Value(1))),
+            Match(Node(identifier='m')),
+            Return(Identifier('m')),
+        ]), [
+            'MATCH (n:Person {id: 1}), (m)',
+            'RETURN m',
+        ])
+
+
+class FlattenPredicatesTestCase(OptimizeTestCase):
+    def test_flatten_and(self):
+        a = Predicate(prop('n', 'a'), '>', Value(1))
+        b = Predicate(prop('n', 'b'), '>', Value(2))
+        c = Predicate(prop('n', 'c'), '>', Value(3))
+
+        self.assertOptimized(
+            Where(PredicateList([a, PredicateList([b, c])])),
+            ['WHERE (n.a > 1 AND n.b > 2 AND n.c > 3)'])
+
+    def test_flatten_or(self):
+        a = Predicate(prop('n', 'a'), '>', Value(1))
+        b = Predicate(prop('n', 'b'), '>', Value(2))
+        c = Predicate(prop('n', 'c'), '>', Value(3))
+
+        self.assertOptimized(
+            Where(PredicateList([PredicateList([a, b], operator='OR'), c],
+                                operator='OR')),
+            ['WHERE (n.a > 1 OR n.b > 2 OR n.c > 3)'])
+
+    def test_mixed_operators_are_not_flattened(self):
+        a = Predicate(prop('n', 'a'), '>', Value(1))
+        b = Predicate(prop('n', 'b'), '>', Value(2))
+        c = Predicate(prop('n', 'c'), '>', Value(3))
+
+        self.assertUnchanged(
+            Where(PredicateList([a, PredicateList([b, c], operator='OR')])))
+
+    def test_drop_duplicates(self):
+        a = Predicate(prop('n', 'a'), '>', Value(1))
+        b = Predicate(prop('n', 'b'), '>', Value(2))
+
+        self.assertOptimized(
+            Where(PredicateList([a, b, Predicate(prop('n', 'a'), '>',
+                                                 Value(1))])),
+            ['WHERE (n.a > 1 AND n.b > 2)'])
+
+    def test_xor_is_kept(self):
+        # p XOR p is false, not p
+        a = Predicate(prop('n', 'a'), '>', Value(1))
+
+        self.assertUnchanged(
+            Where(PredicateList([a, a], operator='XOR')))
+        self.assertUnchanged(
+            Where(PredicateList([a, PredicateList([a, a], operator='XOR')],
+                                operator='XOR')))
+
+    def test_values_distinguish_types(self):
+        a = Predicate(prop('n', 'a'), '=', Value(1))
+        b = Predicate(prop('n', 'a'), '=', Value(True))
+
+        self.assertUnchanged(Where(PredicateList([a, b])))
+
+
+class UniqueItemsTestCase(OptimizeTestCase):
+    def test_return(self):
+        self.assertOptimized(
+            Return([Identifier('n'), Identifier('m'), Identifier('n')]),
+            ['RETURN n, m'])
+
+    def test_return_node_and_identifier(self):
+        self.assertOptimized(Return([person('n'), Identifier('n')]),
+                             ['RETURN n'])
+
+    def test_with(self):
+        self.assertOptimized(
+            With([prop('n', 'a'), prop('n', 'a'), prop('n', 'b')]),
+            ['WITH n.a, n.b'])
+
+    def test_aliases_are_kept(self):
+        self.assertUnchanged(Return([
+            Identifier('a', identifier='n', alias='x'),
+            Identifier('a', identifier='n', alias='y'),
+        ]))
+
+
+if __name__ == '__main__':
+    unittest.main()
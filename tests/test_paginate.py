@@ -0,0 +1,139 @@
+from __future__ import unicode_literals, absolute_import
+
+import unittest
+
+from cypher import (Identifier, Match, Node, OptionalMatch, Predicate, Query,
+                    Return, Value, Where, With)
+from cypher.paginate import KeysetPaginator, paginate
+
+
+def people():
+    return Query([Match(Node(identifier='n', labels=['Person'])),
+                  Return([Identifier('name', identifier='n'),
+                          Identifier('id', identifier='n')])])
+
+
+class KeysetPaginatorTestCase(unittest.TestCase):
+    def test_queries(self):
+        pages = KeysetPaginator(people(), 'n.id', size=10)
+
+        self.assertEqual(str(pages.first).split('\n'), [
+            'MATCH (n:Person)',
+            'WHERE n.id IS NOT NULL',
+            'RETURN n.name, n.id',
+            'ORDER BY n.id',
+            'LIMIT $size',
+        ])
+        self.assertEqual(str(pages.next).split('\n'), [
+            'MATCH (n:Person)',
+            'WHERE (n.id IS NOT NULL AND n.id > $last)',
+            'RETURN n.name, n.id',
+            'ORDER BY n.id',
+            'LIMIT $size',
+        ])
+        self.assertEqual(pages.page(5), (pages.next, {'size': 10,
+                                                      'last': 5}))
+
+    def test_existing_where(self):
+        query = Query([
+            Match(Node(identifier='n')),
+            Where(Predicate(Identifier('age', identifier='n'), '>',
+                            Value(18))),
+            Return(Identifier('id', identifier='n')),
+        ])
+        pages = KeysetPaginator(query, 'n.id', descending=True)
+
+        self.assertEqual(str(pages.next).split('\n')[1:4], [
+            'WHERE (n.age > 18 AND n.id IS NOT NULL AND n.id < $last)',
+            'RETURN n.id',
+            'ORDER BY n.id DESC',
+        ])
+
+    def test_after_with(self):
+        query = Query([Match(Node(identifier='n')),
+                       With([Identifier('n')]),
+                       Return(Identifier('n'))])
+        pages = KeysetPaginator(query, 'n.id')
+
+        self.assertEqual(str(pages.next).split('\n'), [
+            'MATCH (n)',
+            'WITH n',
+            'WHERE (n.id IS NOT NULL AND n.id > $last)',
+            'RETURN n, n.id AS _key',
+            'ORDER BY _key',
+            'LIMIT $size',
+        ])
+
+    def test_rows(self):
+        data = [['a', 1], ['b', 2], ['c', 3], ['d', 4], ['e', 5]]
+        calls = []
+
+        def executor(query, params):
+            calls.append(params)
+            last = params.get('last', 0)
+            rows = [r for r in data if r[1] > last]
+            return rows[:params['size']]
+
+        rows = list(paginate(people(), 'n.id', executor, size=2))
+
+        self.assertEqual(rows, data)
+        self.assertEqual([c.get('last') for c in calls], [None, 2, 4])
+
+    def test_added_key_is_stripped(self):
+        query = Query([Match(Node(identifier='n')),
+                       Return(Identifier('name', identifier='n'))])
+
+        def executor(query, params):
+            return [['a', 1]] if 'last' not in params else []
+
+        self.assertEqual(list(paginate(query, 'n.id', executor)), [['a']])
+
+    def test_null_last_key_is_rejected(self):
+        # The queries exclude null keys, an executor returning one must not
+        # restart from the first page
+        pages = KeysetPaginator(people(), 'n.id', size=3)
+
+        def executor(query, params):
+            return [['a', 1], ['b', 2], ['c', None]]
+
+        with self.assertRaises(ValueError):
+            list(pages.pages(executor))
+
+    def test_first_page_is_not_a_null_key(self):
+        pages = KeysetPaginator(people(), 'n.id')
+
+        self.assertIs(pages.page()[0], pages.first)
+
+        with self.assertRaises(ValueError):
+            pages.page(None)
+
+    def test_optional_match(self):
+        optional = OptionalMatch(Node(identifier='n'))
+        where = Where(Predicate(Identifier('age', identifier='n'), '>',
+                                Value(18)))
+
+        for tokens in ([optional], [optional, where]):
+            query = Query([Match(Node(identifier='m'))] + tokens +
+                          [Return(Identifier('id', identifier='n'))])
+
+            with self.assertRaises(ValueError):
+                KeysetPaginator(query, 'n.id')
+
+    def test_distinct_must_return_key(self):
+        query = Query([Match(Node(identifier='n')),
+                       Return(Identifier('name', identifier='n'),
+                              distinct=True)])
+
+        with self.assertRaises(ValueError):
+            KeysetPaginator(query, 'n.id')
+
+        query = Query([Match(Node(identifier='n')),
+                       Return(Identifier('id', identifier='n'),
+                              distinct=True)])
+
+        self.assertEqual(str(KeysetPaginator(query, 'n.id').first).split(
+            '\n')[2], 'RETURN DISTINCT n.id')
+
+
+if __name__ == '__main__':
+    unittest.main()
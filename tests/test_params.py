@@ -0,0 +1,105 @@
+from __future__ import unicode_literals, absolute_import
+
+import unittest
+
+from cypher import (Collection, Identifier, Limit, Map, Match, Node, Param,
+                    Query, Return, Set, Skip)
+
+
+def find(props, limit):
+    return Query([Match(Node(props, identifier='n', labels=['User'])),
+                  Return(Identifier('n')),
+                  Limit(limit)])
+
+
+class ParametersTestCase(unittest.TestCase):
+    def test_compile(self):
+        query = Query([
+            Match(Node({'id': 1}, identifier='n', labels=['User'])),
+            Set(Map({'name': 'Bob'}, identifier='n')),
+            Limit(10),
+        ])
+
+        self.assertEqual(query.compile(params=True), (
+            'MATCH (n:User {id: $p0})\nSET n = $p1\nLIMIT $p2',
+            {'p0': 1, 'p1': {'name': 'Bob'}, 'p2': 10},
+        ))
+
+    def test_text_does_not_depend_on_values(self):
+        texts = set()
+
+        for a, b, limit in [(1, 2, 3), (1, 1, 1), ('x', 'x', 5)]:
+            text, values = find({'a': a}, limit).compile(params=True)
+            texts.add(text)
+            self.assertEqual(values, {'p0': a, 'p1': limit})
+
+            text, values = Node({'a': a, 'b': b}).compile(params=True)
+            self.assertEqual(sorted(values.values(), key=repr),
+                             sorted([a, b], key=repr))
+
+        self.assertEqual(len(texts), 1)
+
+    def test_equal_values_are_not_shared(self):
+        text, values = Query([Skip(1), Limit(1)]).compile(params=True)
+
+        self.assertEqual(text, 'SKIP $p0\nLIMIT $p1')
+        self.assertEqual(values, {'p0': 1, 'p1': 1})
+
+    def test_null_is_inlined(self):
+        text, values = Node({'a': None}).compile(params=True)
+
+        self.assertEqual(text, '({a: NULL})')
+        self.assertEqual(values, {})
+
+    def test_collection_is_a_single_parameter(self):
+        text, values = Collection([1, 2, 3]).compile(params=True)
+
+        self.assertEqual(text, '$p0')
+        self.assertEqual(values, {'p0': [1, 2, 3]})
+
+    def test_slot(self):
+        text, values = find({'name': Param('name')}, 10).compile(params=True)
+
+        self.assertEqual(text, 'MATCH (n:User {name: $name})\nRETURN n\n'
+                               'LIMIT $p0')
+        self.assertEqual(values, {'p0': 10})
+
+    def test_slot_conflicts_with_generated_name(self):
+        with self.assertRaises(ValueError):
+            Node({'a': 1, 'b': Param('p0')}).compile(params=True)
+
+        with self.assertRaises(ValueError):
+            find({'a': Param('p0')}, 10).compile(params=True)
+
+        with self.assertRaises(ValueError):
+            find({'a': Param('p0')}, 10).prepare()
+
+
+class TemplateTestCase(unittest.TestCase):
+    def test_bind(self):
+        template = find({'name': Param('name')}, Param('limit')).prepare()
+
+        self.assertEqual(template.slots, ('name', 'limit'))
+        self.assertEqual(template.bind(name='Bob', limit=10), (
+            'MATCH (n:User {name: $name})\nRETURN n\nLIMIT $limit',
+            {'name': 'Bob', 'limit': 10},
+        ))
+
+    def test_constants(self):
+        template = find({'name': Param('name')}, 10).prepare()
+
+        self.assertEqual(template.bind(name='Bob')[1],
+                         {'name': 'Bob', 'p0': 10})
+
+    def test_missing_and_unknown_slots(self):
+        template = find({'name': Param('name')}, 10).prepare()
+
+        with self.assertRaises(TypeError):
+            template.bind()
+
+        with self.assertRaises(TypeError):
+            template.bind(name='Bob', other=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
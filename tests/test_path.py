@@ -0,0 +1,71 @@
+from __future__ import unicode_literals, absolute_import
+
+import unittest
+
+from cypher import Identifier, Node, Path, Rel
+
+
+class PathTestCase(unittest.TestCase):
+    def test_chain(self):
+        path = Path([Rel('a', 'X', 'b'), Rel(None, 'Y', 'c')],
+                    identifier='p')
+
+        self.assertEqual(str(path), 'p = (a)-[:X]->(b)-[:Y]->(c)')
+        self.assertEqual(path.nodes, ['a', 'b', 'c'])
+
+    def test_discontinuous(self):
+        with self.assertRaises(ValueError):
+            Path([Rel('a', 'X', 'b'), Rel('c', 'Y', 'd')])
+
+    def test_continuation_references_end(self):
+        end = Node({'x': 1}, identifier='b')
+
+        for start in ('b', Identifier('b'), Node(identifier='b'),
+                      Node({'x': 1}, identifier='b')):
+            path = Path([Rel('a', 'R', end), Rel(start, 'S', 'c')])
+            self.assertEqual(str(path), '(a)-[:R]->(b {x: 1})-[:S]->(c)')
+
+    def test_continuation_with_constraints(self):
+        # The start node is not rendered, its label would be dropped
+        with self.assertRaises(ValueError):
+            Path([Rel('a', 'R', Node({'x': 1}, identifier='b')),
+                  Rel(Node(identifier='b', labels=['Y']), 'S', 'c')])
+
+        with self.assertRaises(ValueError):
+            Path([Rel('a', 'R', 'b'),
+                  Rel(Node({'y': 2}, identifier='b'), 'S', 'c')])
+
+    def test_single_node(self):
+        node = Node(identifier='a')
+        path = Path(node, identifier='p')
+
+        self.assertEqual(str(path), 'p = (a)')
+        self.assertEqual(path.nodes, [node])
+        self.assertEqual(list(path.elements()), [node])
+
+    def test_starting_node(self):
+        node = Node(identifier='a', labels=['L'])
+        path = Path(node)
+        path.append(Rel(None, 'X', 'b'))
+
+        self.assertEqual(str(path), '(a:L)-[:X]->(b)')
+        self.assertEqual(path.nodes, [node, 'b'])
+
+    def test_starting_node_must_continue(self):
+        with self.assertRaises(ValueError):
+            Path([Node(identifier='a'), Rel('z', 'X', 'b')])
+
+    def test_node_after_start(self):
+        with self.assertRaises(TypeError):
+            Path([Rel('a', 'X', 'b'), Node(identifier='b')])
+
+        with self.assertRaises(TypeError):
+            Path([Node(identifier='a'), Node(identifier='b')])
+
+    def test_invalid_element(self):
+        with self.assertRaises(TypeError):
+            Path(['a'])
+
+
+if __name__ == '__main__':
+    unittest.main()
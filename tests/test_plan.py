@@ -0,0 +1,153 @@
+from __future__ import unicode_literals, absolute_import
+
+import unittest
+
+from cypher import Identifier, Match, Node, Query, Return
+from cypher.plan import (cartesian_products, eager_operators, label_scans,
+                         misestimates, parse_plan)
+
+
+# Profile of the HTTP endpoint, statistics are members of each operator
+HTTP_PROFILE = {
+    'results': [{
+        'columns': ['a', 'b'],
+        'data': [],
+        'profile': {
+            'operatorType': 'ProduceResults@neo4j',
+            'identifiers': ['a', 'b'],
+            'dbHits': 0,
+            'rows': 400,
+            'args': {'EstimatedRows': 4.0},
+            'children': [{
+                'operatorType': 'CartesianProduct@neo4j',
+                'identifiers': ['a', 'b'],
+                'dbHits': 0,
+                'rows': 400,
+                'args': {'EstimatedRows': 4.0},
+                'children': [{
+                    'operatorType': 'NodeByLabelScan@neo4j',
+                    'identifiers': ['a'],
+                    'dbHits': 21,
+                    'rows': 20,
+                    'args': {'EstimatedRows': 1.5},
+                    'children': [],
+                }, {
+                    'operatorType': 'AllNodesScan@neo4j',
+                    'identifiers': ['b'],
+                    'dbHits': 101,
+                    'rows': 20,
+                    'args': {'EstimatedRows': 20.0},
+                    'children': [],
+                }],
+            }],
+        },
+    }],
+    'errors': [],
+}
+
+# Plan in the driver format, statistics are in args
+DRIVER_PLAN = {
+    'plan': {
+        'operatorType': 'ProduceResults',
+        'identifiers': ['n'],
+        'args': {'EstimatedRows': 10.0},
+        'children': [{
+            'operatorType': 'Eager',
+            'identifiers': ['n'],
+            'args': {'EstimatedRows': 10.0},
+            'children': [{
+                'operatorType': 'NodeIndexSeek',
+                'identifiers': ['n'],
+                'args': {'EstimatedRows': 10.0, 'DbHits': 11, 'Rows': 10},
+                'children': [],
+            }],
+        }],
+    },
+}
+
+
+class ParsePlanTestCase(unittest.TestCase):
+    def test_http_profile(self):
+        plan = parse_plan(HTTP_PROFILE)
+
+        self.assertEqual([op.type for op in plan.walk()], [
+            'ProduceResults', 'CartesianProduct', 'NodeByLabelScan',
+            'AllNodesScan',
+        ])
+        self.assertEqual(plan.rows, 400)
+        self.assertEqual(plan.estimated_rows, 4.0)
+        self.assertEqual(plan.identifiers, ['a', 'b'])
+        self.assertEqual(plan.total_db_hits, 122)
+
+    def test_driver_plan(self):
+        plan = parse_plan(DRIVER_PLAN)
+        seek = plan.find('NodeIndexSeek')[0]
+
+        self.assertEqual(plan.type, 'ProduceResults')
+        self.assertIsNone(plan.db_hits)
+        self.assertEqual(seek.db_hits, 11)
+        self.assertEqual(seek.rows, 10)
+        self.assertEqual(plan.total_db_hits, 11)
+
+    def test_runtime_suffix(self):
+        plan = parse_plan({'operatorType': 'Filter@pipelined',
+                           'args': {}})
+
+        self.assertEqual(plan.type, 'Filter')
+
+    def test_result_and_root(self):
+        plan = parse_plan({'plan': {'root': {'operatorType': 'Limit'}}})
+
+        self.assertEqual(plan.type, 'Limit')
+        self.assertEqual(plan.children, [])
+
+    def test_missing_plan(self):
+        with self.assertRaises(ValueError):
+            parse_plan({'results': [{'columns': [], 'data': []}]})
+
+        with self.assertRaises(ValueError):
+            parse_plan(HTTP_PROFILE, index=1)
+
+
+class HelpersTestCase(unittest.TestCase):
+    def test_label_scans(self):
+        scans = label_scans(parse_plan(HTTP_PROFILE))
+
+        self.assertEqual([op.type for op in scans],
+                         ['NodeByLabelScan', 'AllNodesScan'])
+        self.assertEqual(label_scans(parse_plan(DRIVER_PLAN)), [])
+
+    def test_cartesian_products(self):
+        self.assertEqual(len(cartesian_products(parse_plan(HTTP_PROFILE))),
+                         1)
+        self.assertEqual(cartesian_products(parse_plan(DRIVER_PLAN)), [])
+
+    def test_eager_operators(self):
+        self.assertEqual([op.type for op in
+                          eager_operators(parse_plan(DRIVER_PLAN))],
+                         ['Eager'])
+        self.assertEqual(eager_operators(parse_plan(HTTP_PROFILE)), [])
+
+    def test_misestimates(self):
+        plan = parse_plan(HTTP_PROFILE)
+
+        self.assertEqual([op.type for op in misestimates(plan)],
+                         ['ProduceResults', 'CartesianProduct',
+                          'NodeByLabelScan'])
+        self.assertEqual([op.type for op in misestimates(plan, ratio=100)],
+                         [])
+
+    def test_misestimates_requires_profile(self):
+        self.assertEqual(misestimates(parse_plan(DRIVER_PLAN)), [])
+
+
+class ExplainTestCase(unittest.TestCase):
+    def test_prefix(self):
+        query = Query([Match(Node(identifier='n')), Return(Identifier('n'))])
+
+        self.assertEqual(str(query.explain()), 'EXPLAIN MATCH (n)\nRETURN n')
+        self.assertEqual(str(query.profile()), 'PROFILE MATCH (n)\nRETURN n')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+from __future__ import unicode_literals, absolute_import
+
+import io
+import json
+import unittest
+
+from cypher import Path
+from cypher.client import ClientError, CypherError
+from cypher.results import ResponseDecoder, ResultNode, ResultRel, iter_rows
+
+
+RESPONSE = {
+    'results': [{
+        'columns': ['a', 'r', 'p', 'n'],
+        'data': [{
+            'row': [
+                {'name': 'Bob'},
+                {'since': 2000},
+                [{'name': 'Bob'}, {'since': 2000}, {'name': 'Alice'}],
+                1,
+            ],
+            'meta': [
+                {'id': 1, 'type': 'node', 'deleted': False},
+                {'id': 10, 'type': 'relationship', 'deleted': False},
+                [{'id': 1, 'type': 'node', 'deleted': False},
+                 {'id': 10, 'type': 'relationship', 'deleted': False},
+                 {'id': 2, 'type': 'node', 'deleted': False}],
+                None,
+            ],
+            'graph': {
+                'nodes': [
+                    {'id': '1', 'labels': ['Person'],
+                     'properties': {'name': 'Bob'}},
+                    {'id': '2', 'labels': ['Person'],
+                     'properties': {'name': 'Alice'}},
+                ],
+                'relationships': [
+                    {'id': '10', 'type': 'KNOWS', 'startNode': '2',
+                     'endNode': '1', 'properties': {'since': 2000}},
+                ],
+            },
+        }, {
+            'row': [{'name': 'Eve'}, None, None, 2],
+            'meta': [{'id': 3, 'type': 'node', 'deleted': False},
+                     None, None, None],
+            'graph': {
+                'nodes': [{'id': '3', 'labels': ['Person'],
+                           'properties': {'name': 'Eve'}}],
+                'relationships': [],
+            },
+        }],
+    }],
+    'errors': [],
+}
+
+
+def encode(data):
+    return json.dumps(data, indent=1).encode('utf8')
+
+
+class ResponseDecoderTestCase(unittest.TestCase):
+    def decode(self, data, size):
+        decoder = ResponseDecoder()
+        rows = []
+
+        for i in range(0, len(data), size):
+            rows.extend(decoder.feed(data[i:i + size]))
+
+        rows.extend(decoder.feed(b'', final=True))
+        decoder.close()
+
+        return rows
+
+    def test_entities(self):
+        rows = self.decode(encode(RESPONSE), 65536)
+
+        self.assertEqual(len(rows), 2)
+
+        a, r, p, n = rows[0]
+
+        self.assertIsInstance(a, ResultNode)
+        self.assertEqual(a.id, 1)
+        self.assertEqual(list(a.labels), ['Person'])
+        self.assertEqual(a.props, {'name': 'Bob'})
+
+        self.assertIsInstance(r, ResultRel)
+        self.assertEqual(r.type, 'KNOWS')
+        self.assertEqual(r.start.id, 2)
+        self.assertEqual(r.end.id, 1)
+        self.assertIs(r.end, a)
+
+        self.assertIsInstance(p, Path)
+        self.assertEqual([node.id for node in p.nodes], [1, 2])
+        self.assertTrue(p.rels[0].reverse)
+
+        self.assertEqual(n, 1)
+        self.assertEqual(rows[0]['n'], 1)
+        self.assertEqual(rows[1]['a'].props, {'name': 'Eve'})
+        self.assertIsNone(rows[1]['r'])
+
+    def test_renders_entities(self):
+        rows = self.decode(encode(RESPONSE), 65536)
+
+        self.assertEqual(str(rows[0]['a']), "(:Person {name: 'Bob'})")
+        self.assertEqual(str(rows[0]['p']),
+                         "(:Person {name: 'Bob'})<-[:KNOWS {since: 2000}]-"
+                         "(:Person {name: 'Alice'})")
+
+    def test_chunk_sizes(self):
+        data = encode(RESPONSE)
+        expected = self.decode(data, len(data))
+
+        for size in (1, 2, 7, 64):
+            rows = self.decode(data, size)
+            self.assertEqual([list(r.values) for r in rows],
+                             [list(r.values) for r in expected])
+
+    def test_multibyte_characters_split_across_chunks(self):
+        data = encode({'results': [{'columns': ['s'],
+                                    'data': [{'row': ['é中']}]}],
+                       'errors': []})
+
+        rows = self.decode(data, 1)
+        self.assertEqual(rows[0]['s'], 'é中')
+
+    def test_rows_are_yielded_as_they_complete(self):
+        data = encode(RESPONSE)
+        end = data.index(b'"Eve"')
+        decoder = ResponseDecoder()
+
+        self.assertEqual(len(decoder.feed(data[:end])), 1)
+        self.assertEqual(len(decoder.feed(data[end:], final=True)), 1)
+
+    def test_interns_keys(self):
+        rows = self.decode(encode(RESPONSE), 65536)
+
+        self.assertIs(rows[0]['a'].labels, rows[1]['a'].labels)
+
+    def test_error(self):
+        data = encode({'results': [], 'errors': [
+            {'code': 'Neo.ClientError.Statement.SyntaxError',
+             'message': 'invalid'}]})
+
+        with self.assertRaises(CypherError) as cm:
+            list(iter_rows(io.BytesIO(data), 5))
+
+        self.assertEqual(cm.exception.code,
+                         'Neo.ClientError.Statement.SyntaxError')
+
+    def test_incomplete_response(self):
+        data = encode(RESPONSE)
+        decoder = ResponseDecoder()
+        decoder.feed(data[:len(data) // 2])
+
+        with self.assertRaises(ClientError):
+            decoder.close()
+
+        with self.assertRaises(ClientError):
+            decoder.feed(b'', final=True)
+
+    def test_iter_rows(self):
+        rows = list(iter_rows(io.BytesIO(encode(RESPONSE)), 16))
+
+        self.assertEqual([row['n'] for row in rows], [1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
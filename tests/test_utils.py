@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals, absolute_import
+
+import unittest
+
+from cypher import Value
+from cypher.utils import quote_string
+
+
+class QuoteStringTestCase(unittest.TestCase):
+    def test_plain(self):
+        self.assertEqual(quote_string('Alice Smith'), "'Alice Smith'")
+        self.assertEqual(quote_string(''), "''")
+
+    def test_quotes(self):
+        self.assertEqual(quote_string("O'Brien"), "'O\\'Brien'")
+        self.assertEqual(quote_string('say "hi"'), "'say \"hi\"'")
+
+    def test_backslashes(self):
+        self.assertEqual(quote_string('a\\b'), "'a\\\\b'")
+        self.assertEqual(quote_string("\\'"), "'\\\\\\''")
+
+    def test_control_characters(self):
+        self.assertEqual(quote_string('a\nb\r\tc'), "'a\\nb\\r\\tc'")
+        self.assertEqual(quote_string('\b\f'), "'\\b\\f'")
+        self.assertEqual(quote_string('a\x00b\x1f'), "'a\\u0000b\\u001f'")
+        self.assertEqual(quote_string("it's\n\x01"), "'it\\'s\\n\\u0001'")
+
+    def test_non_ascii(self):
+        self.assertEqual(quote_string('Zoë 中文'), "'Zoë 中文'")
+        self.assertEqual(quote_string('é\n中\x02'), "'é\\n中\\u0002'")
+
+        # Printable but not ASCII, such as a non-breaking space
+        self.assertEqual(quote_string('a\xa0b'), "'a\xa0b'")
+
+    def test_bytes(self):
+        self.assertEqual(quote_string(b'Alice'), "'Alice'")
+        self.assertEqual(quote_string('Zoë\n'.encode('utf8')), "'Zoë\\n'")
+        self.assertEqual(quote_string(b"it's"), "'it\\'s'")
+
+    def test_long_text(self):
+        text = 'lorem ipsum ' * 100
+
+        self.assertEqual(quote_string(text), "'" + text + "'")
+        self.assertEqual(quote_string(text + '\x01'),
+                         "'" + text + "\\u0001'")
+        self.assertEqual(quote_string(text + '\n'), "'" + text + "\\n'")
+        self.assertEqual(quote_string(text.encode('utf8') + b'\x01'),
+                         "'" + text + "\\u0001'")
+        self.assertEqual(quote_string('é' + text + '\t'),
+                         "'é" + text + "\\t'")
+
+    def test_value(self):
+        self.assertEqual(str(Value("O'Brien\n")), "'O\\'Brien\\n'")
+        self.assertEqual(str(Value(b'abc')), "'abc'")
+
+
+if __name__ == '__main__':
+    unittest.main()